@@ -1,9 +1,14 @@
 from fastapi import APIRouter, HTTPException, Depends
-from typing import Annotated, Any
+from datetime import date
+from typing import Annotated, Any, Optional
 import logging
 from dto.http_response import ErrorResponse, SuccessResponse
 from dto.trading_profit_dto import CalculateProfitRequest
-from dependencies import get_trading_profit_service
+from dependencies import (
+    get_trading_profit_service,
+    get_profit_recalculation_service,
+    get_portfolio_series_service,
+)
 
 router = APIRouter(prefix="/trading-profit", tags=["거래 수익률"])
 logger = logging.getLogger(__name__)
@@ -68,3 +73,123 @@ async def calculate_profit(
             ).dict(),
         )
 
+
+@router.post("/recalculate-all", summary="전체 사용자 수익률 재계산 (관리자)")
+async def recalculate_all_profit(
+    profit_recalculation_service: Annotated[
+        Any, Depends(get_profit_recalculation_service)
+    ],
+    workers: Optional[int] = None,
+    resume: bool = True,
+):
+    """
+    모든 사용자/거래소의 수익률을 process pool에서 전체 재계산 (백그라운드 실행)
+
+    - resume=True: 이전 실행이 중단되었거나 실패가 있었으면 그 실행에서 완료된 사용자는 건너뜀
+    - 진행 상황은 GET /trading-profit/recalculate-all로 확인
+    """
+    try:
+        started = profit_recalculation_service.start_in_background(
+            workers=workers, resume=resume
+        )
+        if not started:
+            raise HTTPException(
+                status_code=409,
+                detail=ErrorResponse(
+                    status_code=409,
+                    error_code="RECALCULATION_IN_PROGRESS",
+                    message="전체 수익률 재계산이 이미 진행 중입니다",
+                    details="GET /trading-profit/recalculate-all로 상태를 확인해주세요",
+                ).dict(),
+            )
+
+        return SuccessResponse(
+            data=profit_recalculation_service.get_status(),
+            message="전체 수익률 재계산을 시작했습니다",
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"전체 수익률 재계산 시작 중 예상치 못한 에러: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=ErrorResponse(
+                status_code=500,
+                error_code="INTERNAL_SERVER_ERROR",
+                message="서버 내부 오류가 발생했습니다",
+                details=str(e),
+            ).dict(),
+        )
+
+
+@router.get("/recalculate-all", summary="전체 사용자 수익률 재계산 상태 (관리자)")
+async def get_recalculate_all_status(
+    profit_recalculation_service: Annotated[
+        Any, Depends(get_profit_recalculation_service)
+    ],
+):
+    return SuccessResponse(
+        data=profit_recalculation_service.get_status(),
+        message="전체 수익률 재계산 상태 조회 완료",
+    )
+
+
+@router.get("/portfolio-series/{user_id}", summary="일별 포트폴리오 평가액 시계열")
+async def get_portfolio_series(
+    user_id: str,
+    portfolio_series_service: Annotated[Any, Depends(get_portfolio_series_service)],
+    exchange_code: int = 1,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+):
+    """
+    거래내역과 일봉 종가로 계산한 일별 평가액, 원가, 미실현 손익
+
+    - 날짜는 UTC 일봉 기준이며 해당 날짜 마감 시점의 보유 수량과 종가로 평가
+    - 금액은 마켓의 기준 통화(KRW, BTC, USDT)별로 currencies에 따로 합산 (통화 간 환산 없음)
+    - start/end를 생략하면 첫 거래일부터 오늘까지
+    """
+    try:
+        if exchange_code not in [1, 2, 3, 4]:
+            raise HTTPException(
+                status_code=400,
+                detail=ErrorResponse(
+                    status_code=400,
+                    error_code="INVALID_EXCHANGE_CODE",
+                    message="잘못된 거래소 코드입니다",
+                    details="거래소 코드는 1(Upbit), 2(Bithumb), 3(Binance), 4(OKX) 중 하나여야 합니다",
+                ).dict(),
+            )
+
+        result = portfolio_series_service.get_series(user_id, exchange_code, start, end)
+
+        return SuccessResponse(
+            data=result,
+            message=f"포트폴리오 시계열 조회 완료: {len(result['dates'])}일",
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning(f"포트폴리오 시계열 조회 검증 에러: {e}")
+        raise HTTPException(
+            status_code=400,
+            detail=ErrorResponse(
+                status_code=400,
+                error_code="VALIDATION_ERROR",
+                message=str(e),
+                details="조회 기간을 확인해주세요",
+            ).dict(),
+        )
+    except Exception as e:
+        logger.error(f"포트폴리오 시계열 조회 중 예상치 못한 에러: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=ErrorResponse(
+                status_code=500,
+                error_code="INTERNAL_SERVER_ERROR",
+                message="서버 내부 오류가 발생했습니다",
+                details=str(e),
+            ).dict(),
+        )
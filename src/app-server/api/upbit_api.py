@@ -2,13 +2,15 @@ import os
 from fastapi import APIRouter, HTTPException
 from dotenv import load_dotenv
 import logging
-from typing import Annotated, Any
+from typing import Annotated, Any, Optional
 from fastapi import Depends
 from dependencies import (
     get_upbit_service,
     get_coin_service,
     get_exchange_credentials_service,
     get_assets_service,
+    get_balance_sync_scheduler,
+    get_candle_ingestion_service,
 )
 from dto.http_response import ErrorResponse, SuccessResponse
 from dto.exchange_credentials_dto import ExchangeProvider
@@ -54,13 +56,34 @@ async def fetch_trading_history(
 async def fetch_and_save_all_coin_list(
     upbit_service: Annotated[Any, Depends(get_upbit_service)],
     coin_service: Annotated[Any, Depends(get_coin_service)],
+    force: bool = False,
 ):
     try:
-        fetched_data_list = upbit_service.fetch_all_coin_list()
-        saved_coin_list = coin_service.save_all_coin_list(fetched_data_list)
+        coin_master = upbit_service.fetch_coin_master(force=force)
+
+        # 마지막으로 반영한 목록과 내용이 같으면 DB 저장 생략
+        if not coin_master.changed:
+            return SuccessResponse(
+                data={
+                    "changed": False,
+                    "not_modified": coin_master.not_modified,
+                    "new": 0,
+                    "updated": 0,
+                    "deactivated": 0,
+                },
+                message="코인 리스트 변경 사항이 없습니다",
+            )
+
+        saved_coin_list = coin_service.save_all_coin_list(coin_master.data)
+        upbit_service.mark_coin_master_applied(coin_master.content_hash)
 
         return SuccessResponse(
-            data=saved_coin_list, message="모든 코인 리스트 조회가 완료되었습니다"
+            data={
+                "changed": True,
+                "not_modified": coin_master.not_modified,
+                **saved_coin_list,
+            },
+            message="모든 코인 리스트 조회가 완료되었습니다",
         )
     except Exception as e:
         logger.error(f"예상치 못한 에러: {e}")
@@ -113,8 +136,8 @@ async def fetch_accounts(
                 ).dict(),
             )
 
-        # Upbit API로 계정 잔고 조회
-        accounts = upbit_service.fetch_accounts(
+        # Upbit API로 계정 잔고 조회 (이벤트 루프를 막지 않도록 async 클라이언트 사용)
+        accounts = await upbit_service.fetch_accounts_async(
             credentials.access_key, credentials.secret_key
         )
 
@@ -177,12 +200,12 @@ async def sync_accounts(
                 ).dict(),
             )
 
-        # Assets Service로 자산 동기화
-        result = assets_service.sync_upbit_assets(user_id)
+        # Assets Service로 자산 동기화 (이미 복호화한 자격증명 재사용)
+        result = assets_service.sync_upbit_assets(user_id, credentials=credentials)
 
         return SuccessResponse(
             data=result,
-            message=f"자산 동기화가 완료되었습니다. 저장: {result['saved_count']}개, 삭제: {result['deleted_count']}개",
+            message=f"자산 동기화가 완료되었습니다. 변경: {result['changed_count']}개, 변경 없음: {result['unchanged_count']}개, 삭제: {result['deleted_count']}개",
         )
 
     except HTTPException:
@@ -209,3 +232,110 @@ async def sync_accounts(
                 details=str(e),
             ).dict(),
         )
+
+
+@router.post("/accountsSync", summary="전체 사용자 잔고 동기화 (관리자)")
+async def sync_all_accounts(
+    balance_sync_scheduler: Annotated[Any, Depends(get_balance_sync_scheduler)],
+):
+    """
+    자격증명이 등록된 모든 사용자의 Upbit 잔고를 1회 동기화 (백그라운드 실행)
+
+    - 진행 상황과 직전 주기 요약은 GET /upbit/accountsSync로 확인
+    """
+    try:
+        started = balance_sync_scheduler.start_cycle_in_background()
+        if not started:
+            raise HTTPException(
+                status_code=409,
+                detail=ErrorResponse(
+                    status_code=409,
+                    error_code="BALANCE_SYNC_IN_PROGRESS",
+                    message="잔고 동기화가 이미 진행 중입니다",
+                    details="GET /upbit/accountsSync로 상태를 확인해주세요",
+                ).dict(),
+            )
+
+        return SuccessResponse(
+            data=balance_sync_scheduler.get_status(),
+            message="전체 사용자 잔고 동기화를 시작했습니다",
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"전체 잔고 동기화 시작 중 예상치 못한 에러: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=ErrorResponse(
+                status_code=500,
+                error_code="INTERNAL_SERVER_ERROR",
+                message="서버 내부 오류가 발생했습니다",
+                details=str(e),
+            ).dict(),
+        )
+
+
+@router.get("/accountsSync", summary="전체 사용자 잔고 동기화 상태 (관리자)")
+async def get_sync_all_accounts_status(
+    balance_sync_scheduler: Annotated[Any, Depends(get_balance_sync_scheduler)],
+):
+    return SuccessResponse(
+        data=balance_sync_scheduler.get_status(),
+        message="전체 사용자 잔고 동기화 상태 조회 완료",
+    )
+
+
+@router.post("/candles/days", summary="활성 코인 일봉 수집 (관리자)")
+async def ingest_daily_candles(
+    candle_ingestion_service: Annotated[Any, Depends(get_candle_ingestion_service)],
+    max_pages: Optional[int] = None,
+):
+    """
+    활성 코인 일봉을 coin_prices_day에 수집 (백그라운드 실행)
+
+    - 처음 수집하는 마켓은 상장일까지 백필, 이후에는 마지막 저장 캔들 이후만 조회
+    - max_pages: 마켓별 최대 조회 페이지 수 (페이지당 200일)
+    - 진행 상황은 GET /upbit/candles/days로 확인
+    """
+    try:
+        started = candle_ingestion_service.start_in_background(max_pages=max_pages)
+        if not started:
+            raise HTTPException(
+                status_code=409,
+                detail=ErrorResponse(
+                    status_code=409,
+                    error_code="CANDLE_INGESTION_IN_PROGRESS",
+                    message="일봉 수집이 이미 진행 중입니다",
+                    details="GET /upbit/candles/days로 상태를 확인해주세요",
+                ).dict(),
+            )
+
+        return SuccessResponse(
+            data=candle_ingestion_service.get_status(),
+            message="일봉 수집을 시작했습니다",
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"일봉 수집 시작 중 예상치 못한 에러: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=ErrorResponse(
+                status_code=500,
+                error_code="INTERNAL_SERVER_ERROR",
+                message="서버 내부 오류가 발생했습니다",
+                details=str(e),
+            ).dict(),
+        )
+
+
+@router.get("/candles/days", summary="일봉 수집 상태 (관리자)")
+async def get_ingest_daily_candles_status(
+    candle_ingestion_service: Annotated[Any, Depends(get_candle_ingestion_service)],
+):
+    return SuccessResponse(
+        data=candle_ingestion_service.get_status(),
+        message="일봉 수집 상태 조회 완료",
+    )
@@ -1,10 +1,16 @@
 import os
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
 import logging
-from typing import Annotated, Any
+from datetime import datetime
+from typing import Annotated, Any, Optional
 from fastapi import Depends
-from dependencies import get_user_service, get_trading_histories_service, get_trading_profit_service
+from dependencies import (
+    get_user_service,
+    get_trading_histories_service,
+    get_sync_job_service,
+)
 from dto.http_response import ErrorResponse, SuccessResponse
 from dto.user_dto import (
     SignupRequest,
@@ -164,12 +170,159 @@ async def get_trading_history(
         )
 
 
+@router.get("/getTradingHistoryPage/{user_id}")
+async def get_trading_history_page(
+    user_id: str,
+    trading_histories_service: Annotated[Any, Depends(get_trading_histories_service)],
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    exchange_provider_str: Optional[str] = None,
+    coin_id: Optional[int] = None,
+    trade_type: Optional[int] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+):
+    """
+    사용자 거래내역 페이지 조회 (최신순)
+
+    - limit: 페이지 크기 (서버에서 최대 200으로 제한)
+    - cursor: 이전 응답의 next_cursor (없으면 첫 페이지)
+    - exchange_provider_str / coin_id / trade_type(0: 매수, 1: 매도) / start_time~end_time: 필터
+    """
+    try:
+        exchange_code = None
+        if exchange_provider_str:
+            try:
+                exchange_code = ExchangeProvider[exchange_provider_str.upper()].value
+            except KeyError:
+                raise HTTPException(
+                    status_code=400,
+                    detail={
+                        "status_code": 400,
+                        "error_code": "INVALID_EXCHANGE_PROVIDER",
+                        "message": "잘못된 거래소명입니다",
+                        "details": "UPBIT, BITHUMB, BINANCE, OKX 중 하나를 입력해주세요",
+                    },
+                )
+
+        page = trading_histories_service.get_trading_histories_page(
+            user_id,
+            limit=limit,
+            cursor=cursor,
+            exchange_code=exchange_code,
+            coin_id=coin_id,
+            trade_type=trade_type,
+            start_time=start_time,
+            end_time=end_time,
+        )
+
+        return SuccessResponse(
+            data=page,
+            message=f"거래내역 조회 완료 ({len(page['trading_histories'])}개)",
+        )
+    except HTTPException as e:
+        raise e
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status_code": 400,
+                "error_code": "INVALID_CURSOR",
+                "message": str(e),
+                "details": "이전 응답의 next_cursor 값을 그대로 전달해주세요",
+            },
+        )
+    except Exception as e:
+        logger.error(f"거래내역 페이지 조회 중 시스템 에러: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "status_code": 500,
+                "error_code": "INTERNAL_SERVER_ERROR",
+                "message": "거래내역 조회 중 오류가 발생했습니다",
+                "details": str(e),
+            },
+        )
+
+
+@router.get("/exportTradingHistory/{user_id}")
+async def export_trading_history(
+    user_id: str,
+    trading_histories_service: Annotated[Any, Depends(get_trading_histories_service)],
+    format: str = "ndjson",
+    exchange_provider_str: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+):
+    """
+    사용자 거래내역 전체 내보내기 (NDJSON 또는 CSV 스트리밍, 오래된 순)
+
+    - format: ndjson | csv
+    - 가격/수량/수익률(profit_loss_rate)/평균 구매 단가(avg_buy_price)는 정밀도 보존을 위해 문자열로 출력
+    """
+    try:
+        exchange_code = None
+        if exchange_provider_str:
+            try:
+                exchange_code = ExchangeProvider[exchange_provider_str.upper()].value
+            except KeyError:
+                raise HTTPException(
+                    status_code=400,
+                    detail={
+                        "status_code": 400,
+                        "error_code": "INVALID_EXCHANGE_PROVIDER",
+                        "message": "잘못된 거래소명입니다",
+                        "details": "UPBIT, BITHUMB, BINANCE, OKX 중 하나를 입력해주세요",
+                    },
+                )
+
+        export_format = format.lower()
+        chunks = trading_histories_service.export_trading_histories(
+            user_id,
+            export_format=export_format,
+            exchange_code=exchange_code,
+            start_time=start_time,
+            end_time=end_time,
+        )
+
+        media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+        extension = "csv" if export_format == "csv" else "ndjson"
+        return StreamingResponse(
+            chunks,
+            media_type=f"{media_type}; charset=utf-8",
+            headers={
+                "Content-Disposition": f'attachment; filename="trading_histories_{user_id}.{extension}"'
+            },
+        )
+    except HTTPException as e:
+        raise e
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status_code": 400,
+                "error_code": "INVALID_EXPORT_FORMAT",
+                "message": str(e),
+                "details": "ndjson, csv 중 하나를 입력해주세요",
+            },
+        )
+    except Exception as e:
+        logger.error(f"거래내역 내보내기 중 시스템 에러: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "status_code": 500,
+                "error_code": "INTERNAL_SERVER_ERROR",
+                "message": "거래내역 내보내기 중 오류가 발생했습니다",
+                "details": str(e),
+            },
+        )
+
+
 @router.post("/updateTradingHistory")
 async def update_trading_history(
     request: UpdateTradingHistoryRequest,
-    trading_histories_service: Annotated[Any, Depends(get_trading_histories_service)],
-    user_service: Annotated[Any, Depends(get_user_service)],
-    trading_profit_service: Annotated[Any, Depends(get_trading_profit_service)],
+    sync_job_service: Annotated[Any, Depends(get_sync_job_service)],
 ):
     try:
         try:
@@ -185,80 +338,49 @@ async def update_trading_history(
                 },
             )
 
-        # 사용자의 마지막 거래내역 업데이트 시간 조회
-        user = user_service.user_repository.find_by_id(request.user_id)
-        start_time = user.last_trading_history_update_at if user else None
-        
-        # 최초 동기화 여부 판단 (start_time이 None이면 최초)
-        is_initial = start_time is None
-
-        trading_histies = trading_histories_service.get_trading_histories(
-            request.user_id, request.exchange_provider_str, start_time
+        # 같은 사용자/거래소의 동기화가 진행 중이면 기존 작업을 반환
+        job, created = sync_job_service.submit_sync(
+            request.user_id, exchange_provider.name
         )
-        
-        processed_trading_histies = trading_histories_service.process_trading_histories(
-            request.user_id, request.exchange_provider_str, trading_histies
-        )
-
-        saved_trading_histories = trading_histories_service.save_trading_histories(
-            processed_trading_histies
-        )
-
-        # 거래 내역이 저장된 경우에만 수익률 계산 수행
-        profit_calculation_result = None
-        if saved_trading_histories:
-            try:
-                profit_calculation_result = trading_profit_service.calculate_and_update_profit_loss(
-                    user_id=request.user_id,
-                    exchange_code=exchange_provider.value,
-                    is_initial=is_initial,
-                )
-                logger.info(
-                    f"수익률 계산 완료: user_id={request.user_id}, "
-                    f"exchange_code={exchange_provider.value}, "
-                    f"is_initial={is_initial}, "
-                    f"result={profit_calculation_result}"
-                )
-            except Exception as e:
-                # 수익률 계산 실패해도 거래 내역 저장은 성공했으므로 로그만 남기고 계속 진행
-                logger.error(
-                    f"수익률 계산 중 에러 발생 (거래 내역은 저장됨): user_id={request.user_id}, "
-                    f"exchange_code={exchange_provider.value}, error={e}"
-                )
-
-        all_trading_histories_data = (
-            trading_histories_service.get_all_trading_histories_by_user_formatted(
-                request.user_id
-            )
-        )
-
-        # 매매내역 업데이트가 성공적으로 완료되었으므로 업데이트 시간 갱신
-        # (저장된 거래내역이 없어도 업데이트 시간은 갱신)
-        user_service.update_user_trading_history_updated_at(request.user_id)
-
-        response_data = {
-            "saved_count": len(saved_trading_histories),
-            **all_trading_histories_data,
-        }
-        
-        # 수익률 계산 결과가 있으면 응답에 포함
-        if profit_calculation_result:
-            response_data["profit_calculation"] = profit_calculation_result
 
         return SuccessResponse(
-            data=response_data,
-            message=f"{exchange_provider.name} 거래내역 업데이트 완료 (저장: {len(saved_trading_histories)}개, 전체: {all_trading_histories_data['total_count']}개)",
+            data=job.to_dict(),
+            message=(
+                f"{exchange_provider.name} 거래내역 업데이트 작업이 등록되었습니다"
+                if created
+                else f"{exchange_provider.name} 거래내역 업데이트 작업이 이미 진행 중입니다"
+            ),
         )
     except HTTPException as e:
         raise e
     except Exception as e:
-        logger.error(f"거래내역 업데이트 중 시스템 에러: {e}")
+        logger.error(f"거래내역 업데이트 작업 등록 중 시스템 에러: {e}")
         raise HTTPException(
             status_code=500,
             detail={
                 "status_code": 500,
                 "error_code": "INTERNAL_SERVER_ERROR",
-                "message": "거래내역 업데이트 중 오류가 발생했습니다",
+                "message": "거래내역 업데이트 작업 등록 중 오류가 발생했습니다",
                 "details": str(e),
             },
         )
+
+
+@router.get("/updateTradingHistory/{job_id}")
+async def get_update_trading_history_status(
+    job_id: str,
+    sync_job_service: Annotated[Any, Depends(get_sync_job_service)],
+):
+    job = sync_job_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "status_code": 404,
+                "error_code": "SYNC_JOB_NOT_FOUND",
+                "message": "거래내역 업데이트 작업을 찾을 수 없습니다",
+                "details": f"job_id={job_id}",
+            },
+        )
+
+    return SuccessResponse(data=job.to_dict(), message=f"작업 상태: {job.state}")
@@ -46,6 +46,7 @@ class DatabaseConnection:
         import model.Assets
         import model.CoinHoldingsPast
         import model.CoinPricesDay
+        import model.ProfitCalculationMarks
 
         self.Base.metadata.create_all(bind=self.engine)
 
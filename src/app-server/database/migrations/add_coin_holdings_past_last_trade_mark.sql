@@ -0,0 +1,10 @@
+-- coin_holdings_past 테이블에 수익률 증분 계산 기준점 칼럼 추가
+-- 마지막으로 반영된 거래 이후의 거래내역만 불러와 저장된 평단에 적용합니다.
+-- 기존 행은 NULL이므로 다음 동기화 때 한 번 전체 재계산됩니다.
+
+ALTER TABLE coin_holdings_past
+ADD COLUMN IF NOT EXISTS last_trade_id INTEGER,
+ADD COLUMN IF NOT EXISTS last_trade_time TIMESTAMP;
+
+COMMENT ON COLUMN coin_holdings_past.last_trade_id IS '수익률 계산에 마지막으로 반영된 trading_histories.id';
+COMMENT ON COLUMN coin_holdings_past.last_trade_time IS '수익률 계산에 마지막으로 반영된 거래의 trade_time';
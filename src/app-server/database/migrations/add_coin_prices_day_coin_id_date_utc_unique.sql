@@ -0,0 +1,15 @@
+-- coin_prices_day 테이블에 (coin_id, candle_date_time_utc) 유니크 제약조건 추가
+-- 일봉 수집 시 INSERT ... ON CONFLICT (coin_id, candle_date_time_utc) DO UPDATE의 충돌 기준으로 사용합니다.
+-- 같은 칼럼의 일반 인덱스는 유니크 인덱스와 중복되므로 삭제합니다.
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'uk_coin_prices_day_coin_id_date_utc'
+    ) THEN
+        ALTER TABLE coin_prices_day
+        ADD CONSTRAINT uk_coin_prices_day_coin_id_date_utc UNIQUE (coin_id, candle_date_time_utc);
+    END IF;
+END $$;
+
+DROP INDEX IF EXISTS idx_coin_prices_day_coin_id_date_utc;
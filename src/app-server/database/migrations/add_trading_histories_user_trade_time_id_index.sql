@@ -0,0 +1,6 @@
+-- trading_histories 페이지 조회용 인덱스 추가
+-- (trade_time, id) 커서 기반 페이지네이션을 사용자별로 인덱스 범위 스캔만으로 처리합니다.
+-- 운영 중인 테이블이므로 CONCURRENTLY로 생성 (트랜잭션 블록 밖에서 실행)
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trading_histories_user_trade_time_id
+ON trading_histories (user_id, trade_time DESC, id DESC);
@@ -0,0 +1,10 @@
+-- users 테이블에 거래소 계정 첫 활동 시점 칼럼 추가
+-- 최초 거래내역 동기화 시 2017-11-01부터 조회하지 않고 이 시점부터 조회합니다.
+
+ALTER TABLE users
+ADD COLUMN IF NOT EXISTS first_trading_activity_at TIMESTAMP;
+
+COMMENT ON COLUMN users.first_trading_activity_at IS '거래소 계정 첫 활동 시점 (최초 거래내역 동기화 시작점)';
+
+-- 다시 조회하도록 초기화할 경우
+-- UPDATE users SET first_trading_activity_at = NULL WHERE id = '<user_id>';
@@ -0,0 +1,23 @@
+-- 수익률 증분 계산 기준점을 coin_holdings_past 행에서 별도 테이블로 이동
+-- 보유 종목이 모두 매도되어 스냅샷이 비어도 기준점이 사라지지 않도록 사용자/거래소별 한 행으로 저장합니다.
+-- 기존 coin_holdings_past의 기준점은 id 기준이 아니라 최신 trade_time 거래의 id였으므로 옮기지 않고,
+-- 다음 동기화 때 한 번 전체 재계산하여 새 기준점을 저장합니다.
+
+CREATE TABLE IF NOT EXISTS profit_calculation_marks (
+    id SERIAL PRIMARY KEY,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    exchange_code SMALLINT NOT NULL,
+    last_trade_id INTEGER NOT NULL,
+    last_trade_time TIMESTAMP NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW(),
+    CONSTRAINT uk_profit_calculation_marks_user_exchange UNIQUE (user_id, exchange_code),
+    CONSTRAINT chk_profit_calculation_marks_exchange_code CHECK (exchange_code IN (1, 2, 3, 4))
+);
+
+COMMENT ON COLUMN profit_calculation_marks.last_trade_id IS '수익률 계산에 반영된 가장 큰 trading_histories.id';
+COMMENT ON COLUMN profit_calculation_marks.last_trade_time IS '수익률 계산에 반영된 가장 늦은 trade_time';
+
+ALTER TABLE coin_holdings_past
+DROP COLUMN IF EXISTS last_trade_id,
+DROP COLUMN IF EXISTS last_trade_time;
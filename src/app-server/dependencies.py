@@ -7,12 +7,19 @@ from repository.user_repository import UserRepository
 _upbit_service_instance = None
 _coin_service_instance = None
 _coin_repository_instance = None
+_coin_catalog_instance = None
 _user_service_instance = None
 _user_repository_instance = None
 _trading_histories_service_instance = None
 _exchange_credentials_service_instance = None
 _assets_service_instance = None
 _trading_profit_service_instance = None
+_sync_job_service_instance = None
+_profit_recalculation_service_instance = None
+_balance_sync_scheduler_instance = None
+_candle_ingestion_service_instance = None
+_price_history_store_instance = None
+_portfolio_series_service_instance = None
 
 
 # 의존성 주입 함수들
@@ -57,6 +64,15 @@ def get_coin_repository() -> CoinRepository:
     return _coin_repository_instance
 
 
+def get_coin_catalog() -> Any:
+    global _coin_catalog_instance
+    if _coin_catalog_instance is None:
+        from service.coin_catalog import CoinCatalog
+
+        _coin_catalog_instance = CoinCatalog(get_coin_repository())
+    return _coin_catalog_instance
+
+
 def get_trading_histories_service() -> Any:
     global _trading_histories_service_instance
     if _trading_histories_service_instance is None:
@@ -91,3 +107,58 @@ def get_trading_profit_service() -> Any:
 
         _trading_profit_service_instance = TradingProfitService()
     return _trading_profit_service_instance
+
+
+def get_sync_job_service() -> Any:
+    global _sync_job_service_instance
+    if _sync_job_service_instance is None:
+        from service.sync_job_service import SyncJobService
+
+        _sync_job_service_instance = SyncJobService()
+    return _sync_job_service_instance
+
+
+def get_profit_recalculation_service() -> Any:
+    global _profit_recalculation_service_instance
+    if _profit_recalculation_service_instance is None:
+        from service.profit_recalculation_service import ProfitRecalculationService
+
+        _profit_recalculation_service_instance = ProfitRecalculationService()
+    return _profit_recalculation_service_instance
+
+
+def get_balance_sync_scheduler() -> Any:
+    global _balance_sync_scheduler_instance
+    if _balance_sync_scheduler_instance is None:
+        from service.balance_sync_scheduler import BalanceSyncScheduler
+
+        _balance_sync_scheduler_instance = BalanceSyncScheduler()
+    return _balance_sync_scheduler_instance
+
+
+def get_candle_ingestion_service() -> Any:
+    global _candle_ingestion_service_instance
+    if _candle_ingestion_service_instance is None:
+        from service.candle_ingestion_service import CandleIngestionService
+
+        _candle_ingestion_service_instance = CandleIngestionService()
+    return _candle_ingestion_service_instance
+
+
+def get_price_history_store() -> Any:
+    global _price_history_store_instance
+    if _price_history_store_instance is None:
+        from service.price_history_store import PriceHistoryStore
+
+        # API 프로세스는 조회만 하고, 쓰기는 일봉 수집 작업(CandleIngestionService)에서만 함
+        _price_history_store_instance = PriceHistoryStore(readonly=True)
+    return _price_history_store_instance
+
+
+def get_portfolio_series_service() -> Any:
+    global _portfolio_series_service_instance
+    if _portfolio_series_service_instance is None:
+        from service.portfolio_series_service import PortfolioSeriesService
+
+        _portfolio_series_service_instance = PortfolioSeriesService()
+    return _portfolio_series_service_instance
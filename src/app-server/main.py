@@ -31,6 +31,17 @@ async def lifespan(app: FastAPI):
             # 테이블 생성
             db.create_tables()
             logger.info("✅ 데이터베이스 테이블 생성 완료")
+
+            # 코인 카탈로그 캐시 로드
+            from dependencies import get_coin_catalog
+
+            get_coin_catalog().load()
+            logger.info("✅ 코인 카탈로그 로드 완료")
+
+            # 가격 저장소가 비어 있으면 coin_prices_day에서 채움 (백그라운드)
+            from dependencies import get_candle_ingestion_service
+
+            get_candle_ingestion_service().bootstrap_price_store_in_background()
         else:
             logger.error("❌ 데이터베이스 연결 실패")
             raise Exception("데이터베이스 연결에 실패했습니다")
@@ -39,6 +50,12 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ 애플리케이션 초기화 실패: {e}")
         raise
 
+    # 전체 사용자 잔고 주기 동기화
+    if os.getenv("BALANCE_SYNC_ENABLED", "false").lower() == "true":
+        from dependencies import get_balance_sync_scheduler
+
+        get_balance_sync_scheduler().start()
+
     logger.info("✅ 애플리케이션 시작 완료")
 
     yield
@@ -46,6 +63,21 @@ async def lifespan(app: FastAPI):
     # 종료 시
     logger.info("🛑 애플리케이션 종료 중...")
 
+    # Upbit async 클라이언트 커넥션 풀 종료
+    from dependencies import get_upbit_service
+
+    await get_upbit_service().async_upbit_http_client.aclose()
+
+    # 거래내역 동기화 worker pool 종료 (진행 중인 작업은 기다리지 않음)
+    from dependencies import get_sync_job_service
+
+    get_sync_job_service().shutdown(wait=False)
+
+    # 잔고 동기화 스케줄러 종료
+    from dependencies import get_balance_sync_scheduler
+
+    get_balance_sync_scheduler().stop()
+
 
 app = FastAPI(
     title="BIT Diary API",
@@ -6,6 +6,7 @@ from sqlalchemy import (
     TIMESTAMP,
     BigInteger,
     ForeignKey,
+    UniqueConstraint,
     func,
 )
 from sqlalchemy.orm import relationship
@@ -39,6 +40,13 @@ class CoinPricesDay(db.Base):
     # 관계 설정
     coin = relationship("Coins", back_populates="coin_prices_day")
 
+    # 제약조건 (일봉 upsert 충돌 기준)
+    __table_args__ = (
+        UniqueConstraint(
+            "coin_id", "candle_date_time_utc", name="uk_coin_prices_day_coin_id_date_utc"
+        ),
+    )
+
     def __repr__(self):
         return f"<CoinPricesDay(id={self.id}, coin_id={self.coin_id}, market_code={self.market_code}, date={self.candle_date_time_utc})>"
 
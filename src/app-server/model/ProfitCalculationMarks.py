@@ -0,0 +1,44 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    SmallInteger,
+    TIMESTAMP,
+    func,
+    ForeignKey,
+    UniqueConstraint,
+    CheckConstraint,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from database.database_connection import db
+
+
+class ProfitCalculationMarks(db.Base):
+    """
+    사용자/거래소별 수익률 증분 계산 기준점
+
+    보유 종목 스냅샷(coin_holdings_past)이 비어도 유지되도록 별도 테이블에 저장합니다.
+    """
+
+    __tablename__ = "profit_calculation_marks"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    exchange_code = Column(SmallInteger, nullable=False)  # 1:Upbit, 2:Bithumb, 3:Binance, 4:OKX
+    # 수익률 계산에 반영된 거래 중 가장 큰 trading_histories.id (다음 계산은 이 id보다 큰 거래만 조회)
+    last_trade_id = Column(Integer, nullable=False)
+    # 수익률 계산에 반영된 거래 중 가장 늦은 trade_time (이보다 과거 거래가 새로 들어오면 전체 재계산)
+    last_trade_time = Column(TIMESTAMP, nullable=False)
+    created_at = Column(TIMESTAMP, default=func.now())
+    updated_at = Column(TIMESTAMP, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "exchange_code", name="uk_profit_calculation_marks_user_exchange"
+        ),
+        CheckConstraint("exchange_code IN (1, 2, 3, 4)", name="chk_profit_calculation_marks_exchange_code"),
+    )
+
+    def __repr__(self):
+        return f"<ProfitCalculationMarks(user_id={self.user_id}, exchange_code={self.exchange_code}, last_trade_id={self.last_trade_id})>"
@@ -9,6 +9,7 @@ from sqlalchemy import (
     ForeignKey,
     UniqueConstraint,
     CheckConstraint,
+    Index,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -59,6 +60,13 @@ class TradingHistories(db.Base):
         ),
         CheckConstraint("exchange_code IN (1, 2, 3, 4)", name="chk_exchange_code"),
         CheckConstraint("trade_type IN (0, 1)", name="chk_trade_type"),
+        # 거래내역 페이지 조회 (user_id, trade_time DESC, id DESC keyset)
+        Index(
+            "ix_trading_histories_user_trade_time_id",
+            "user_id",
+            trade_time.desc(),
+            id.desc(),
+        ),
     )
 
     def __repr__(self):
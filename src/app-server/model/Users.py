@@ -22,6 +22,7 @@ class Users(db.Base):
     created_at = Column(TIMESTAMP, default=func.now())
     last_login_at = Column(TIMESTAMP)
     last_trading_history_update_at = Column(TIMESTAMP)  # 거래내역 마지막 업데이트
+    first_trading_activity_at = Column(TIMESTAMP)  # 거래소 계정 첫 활동 시점 (최초 동기화 시작점)
 
     is_active = Column(Boolean, default=True)  # 휴면 계정, 탈퇴계정 여부
     is_connect_exchange = Column(
@@ -1,84 +1,92 @@
 import logging
 import uuid
-from typing import List, Set, Tuple
+from typing import Any, Dict, List
+from sqlalchemy import delete, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from database.database_connection import db
 from model.Assets import Assets
 
+# 잔고 동기화 시 다시 쓰는 컬럼 (updated_at은 DB 트리거로 자동 업데이트됨)
+UPSERT_COLUMNS = (
+    "coin_id",
+    "quantity",
+    "locked_quantity",
+    "avg_buy_price",
+    "avg_buy_price_modified",
+)
+
 
 class AssetsRepository:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def save_or_update_assets(
+    def sync_assets(
         self, user_id: str, exchange_code: int, assets: List[Assets]
-    ) -> List[Assets]:
-        """자산 목록 저장/업데이트"""
+    ) -> Dict[str, Any]:
+        """
+        사용자/거래소 자산을 잔고 목록과 일치하도록 한 트랜잭션에서 동기화
+
+        INSERT ... ON CONFLICT DO UPDATE 한 번으로 새 자산은 추가하고 값이 바뀐 자산만 다시 쓰며,
+        DELETE 한 번으로 잔고 목록에 없는 자산을 삭제합니다. 잔고 수와 관계없이 왕복 횟수는 일정합니다.
+
+        Args:
+            user_id: 사용자 UUID
+            exchange_code: 거래소 코드
+            assets: 거래소 잔고 전체 목록
+
+        Returns:
+            {
+                "changed_count": 추가/변경된 자산 수,
+                "unchanged_count": 변경 없는 자산 수,
+                "deleted_count": 삭제된 자산 수,
+                "assets": 동기화 후 자산 목록
+            }
+        """
         try:
             session = db.get_session()
 
             # user_id를 UUID로 변환
             user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
 
-            saved_assets = []
-
-            for asset in assets:
-                # 기존 자산 확인 (user_id, exchange_code, symbol, trade_by_symbol)
-                existing = (
-                    session.query(Assets)
-                    .filter(
-                        Assets.user_id == user_uuid,
-                        Assets.exchange_code == exchange_code,
-                        Assets.symbol == asset.symbol,
-                        Assets.trade_by_symbol == asset.trade_by_symbol,
+            # 같은 (symbol, trade_by_symbol)이 두 번 있으면 한 INSERT 문에서 충돌하므로 마지막 값만 사용
+            rows = list(
+                {
+                    (asset.symbol, asset.trade_by_symbol): self._to_upsert_row(
+                        user_uuid, exchange_code, asset
                     )
-                    .first()
-                )
-
-                if existing:
-                    # 기존 자산 업데이트
-                    existing.quantity = asset.quantity
-                    existing.locked_quantity = asset.locked_quantity
-                    existing.avg_buy_price = asset.avg_buy_price
-                    existing.avg_buy_price_modified = asset.avg_buy_price_modified
-                    existing.coin_id = asset.coin_id
-                    # updated_at은 DB 트리거로 자동 업데이트됨
-                    saved_assets.append(existing)
-                else:
-                    # 새로운 자산 저장
-                    asset.user_id = user_uuid
-                    asset.exchange_code = exchange_code
-                    session.add(asset)
-                    saved_assets.append(asset)
-
-            session.commit()
-
-            for asset in saved_assets:
-                session.refresh(asset)
-
-            self.logger.info(
-                f"자산 저장/업데이트 완료: user_id={user_id}, exchange_code={exchange_code}, count={len(saved_assets)}"
+                    for asset in assets
+                }.values()
             )
-            return saved_assets
-
-        except Exception as e:
-            self.logger.error(f"자산 저장/업데이트 중 에러 발생: {e}")
-            session.rollback()
-            raise e
-        finally:
-            session.close()
 
-    def delete_assets_not_in_list(
-        self, user_id: str, exchange_code: int, symbol_trade_by_pairs: Set[Tuple[str, str]]
-    ) -> int:
-        """특정 자산 목록에 없는 자산 삭제"""
-        try:
-            session = db.get_session()
-
-            # user_id를 UUID로 변환
-            user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
+            changed_count = 0
+            if rows:
+                stmt = insert(Assets).values(rows)
+                stmt = stmt.on_conflict_do_update(
+                    constraint="uk_assets_user_exchange_symbol",
+                    set_={name: stmt.excluded[name] for name in UPSERT_COLUMNS},
+                    where=or_(
+                        *(
+                            Assets.__table__.c[name].is_distinct_from(stmt.excluded[name])
+                            for name in UPSERT_COLUMNS
+                        )
+                    ),
+                ).returning(Assets.id)
+                # 값이 같아 건너뛴 행은 반환되지 않음
+                changed_count = len(session.execute(stmt).scalars().all())
+
+            delete_stmt = delete(Assets).where(
+                Assets.user_id == user_uuid,
+                Assets.exchange_code == exchange_code,
+            )
+            if rows:
+                delete_stmt = delete_stmt.where(
+                    tuple_(Assets.symbol, Assets.trade_by_symbol).notin_(
+                        [(row["symbol"], row["trade_by_symbol"]) for row in rows]
+                    )
+                )
+            deleted_count = session.execute(delete_stmt).rowcount
 
-            # 해당 사용자의 해당 거래소의 모든 자산 조회
-            all_assets = (
+            synced_assets = (
                 session.query(Assets)
                 .filter(
                     Assets.user_id == user_uuid,
@@ -87,33 +95,40 @@ class AssetsRepository:
                 .all()
             )
 
-            # 삭제할 자산 목록 생성
-            assets_to_delete = []
-            for asset in all_assets:
-                pair = (asset.symbol, asset.trade_by_symbol)
-                if pair not in symbol_trade_by_pairs:
-                    assets_to_delete.append(asset)
-
-            # 삭제 실행
-            deleted_count = 0
-            for asset in assets_to_delete:
-                session.delete(asset)
-                deleted_count += 1
-
             session.commit()
 
             self.logger.info(
-                f"자산 삭제 완료: user_id={user_id}, exchange_code={exchange_code}, count={deleted_count}"
+                f"자산 동기화 완료: user_id={user_id}, exchange_code={exchange_code}, "
+                f"changed={changed_count}, unchanged={len(rows) - changed_count}, deleted={deleted_count}"
             )
-            return deleted_count
+            return {
+                "changed_count": changed_count,
+                "unchanged_count": len(rows) - changed_count,
+                "deleted_count": deleted_count,
+                "assets": synced_assets,
+            }
 
         except Exception as e:
-            self.logger.error(f"자산 삭제 중 에러 발생: {e}")
+            self.logger.error(f"자산 동기화 중 에러 발생: {e}")
             session.rollback()
             raise e
         finally:
             session.close()
 
+    @staticmethod
+    def _to_upsert_row(user_uuid, exchange_code: int, asset: Assets) -> Dict[str, Any]:
+        return {
+            "user_id": user_uuid,
+            "exchange_code": exchange_code,
+            "symbol": asset.symbol,
+            "trade_by_symbol": asset.trade_by_symbol,
+            "coin_id": asset.coin_id,
+            "quantity": asset.quantity,
+            "locked_quantity": asset.locked_quantity,
+            "avg_buy_price": asset.avg_buy_price,
+            "avg_buy_price_modified": bool(asset.avg_buy_price_modified),
+        }
+
     def find_by_user_and_exchange(
         self, user_id: str, exchange_code: int
     ) -> List[Assets]:
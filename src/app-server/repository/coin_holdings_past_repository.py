@@ -1,140 +1,127 @@
 import logging
 import uuid
-from typing import List, Dict, Optional
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
 from database.database_connection import db
 from model.CoinHoldingsPast import CoinHoldingsPast
+from model.ProfitCalculationMarks import ProfitCalculationMarks
+
+# 스냅샷 교체 시 다시 쓰는 컬럼
+UPSERT_COLUMNS = (
+    "symbol",
+    "avg_buy_price",
+    "remaining_quantity",
+)
 
 
 class CoinHoldingsPastRepository:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def save_or_update_holdings(
-        self, user_id: str, exchange_code: int, holdings: Dict[int, Dict]
-    ) -> List[CoinHoldingsPast]:
+    def replace_holdings(
+        self,
+        user_id: str,
+        exchange_code: int,
+        holdings: Dict[int, Dict],
+        last_trade_id: Optional[int] = None,
+        last_trade_time: Optional[datetime] = None,
+        session: Optional[Session] = None,
+    ) -> Dict[str, int]:
         """
-        보유 종목 평단 저장/업데이트
-        
+        보유 종목 평단 스냅샷 교체
+
+        보유 수량이 남은 종목은 uk_coin_holdings_past_user_coin_exchange 기준 INSERT ... ON CONFLICT DO UPDATE
+        한 번으로 저장하고, 나머지 종목은 DELETE 한 번으로 삭제합니다.
+        증분 계산 기준점은 보유 종목이 없어도 남도록 profit_calculation_marks에 같은 트랜잭션으로 저장합니다.
+
         Args:
             user_id: 사용자 UUID
             exchange_code: 거래소 코드
             holdings: {coin_id: {"symbol": str, "avg_buy_price": Decimal, "remaining_quantity": Decimal}}
-        
+            last_trade_id: 수익률 계산에 반영된 가장 큰 거래 id (지정하면 기준점 저장)
+            last_trade_time: 수익률 계산에 반영된 가장 늦은 거래 시각
+            session: 지정하면 이 세션에서 실행하고 commit은 호출 측에서 수행
+
         Returns:
-            저장/업데이트된 보유 종목 목록
+            {"saved_count": 저장된 보유 종목 수, "deleted_count": 삭제된 보유 종목 수}
         """
+        owns_session = session is None
         try:
-            session = db.get_session()
+            if owns_session:
+                session = db.get_session()
 
             # user_id를 UUID로 변환
             user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
 
-            saved_holdings = []
-
-            for coin_id, holding_data in holdings.items():
-                # 기존 보유 종목 확인
-                existing = (
-                    session.query(CoinHoldingsPast)
-                    .filter(
-                        CoinHoldingsPast.user_id == user_uuid,
-                        CoinHoldingsPast.coin_id == coin_id,
-                        CoinHoldingsPast.exchange_code == exchange_code,
-                    )
-                    .first()
-                )
-
-                if existing:
-                    # 기존 보유 종목 업데이트
-                    existing.avg_buy_price = holding_data["avg_buy_price"]
-                    existing.remaining_quantity = holding_data["remaining_quantity"]
-                    existing.symbol = holding_data["symbol"]
+            rows = [
+                {
+                    "user_id": user_uuid,
+                    "coin_id": coin_id,
+                    "exchange_code": exchange_code,
+                    "symbol": holding_data["symbol"],
+                    "avg_buy_price": holding_data["avg_buy_price"],
+                    "remaining_quantity": holding_data["remaining_quantity"],
+                }
+                for coin_id, holding_data in holdings.items()
+                if holding_data["remaining_quantity"] > 0
+            ]
+
+            if rows:
+                stmt = insert(CoinHoldingsPast).values(rows)
+                stmt = stmt.on_conflict_do_update(
+                    constraint="uk_coin_holdings_past_user_coin_exchange",
                     # updated_at은 DB 트리거로 자동 업데이트됨
-                    saved_holdings.append(existing)
-                else:
-                    # 새로운 보유 종목 저장
-                    new_holding = CoinHoldingsPast(
-                        user_id=user_uuid,
-                        coin_id=coin_id,
-                        exchange_code=exchange_code,
-                        symbol=holding_data["symbol"],
-                        avg_buy_price=holding_data["avg_buy_price"],
-                        remaining_quantity=holding_data["remaining_quantity"],
-                    )
-                    session.add(new_holding)
-                    saved_holdings.append(new_holding)
-
-            session.commit()
-
-            for holding in saved_holdings:
-                session.refresh(holding)
+                    set_={name: stmt.excluded[name] for name in UPSERT_COLUMNS},
+                )
+                session.execute(stmt)
 
-            self.logger.info(
-                f"보유 종목 평단 저장/업데이트 완료: user_id={user_id}, exchange_code={exchange_code}, count={len(saved_holdings)}"
+            delete_stmt = delete(CoinHoldingsPast).where(
+                CoinHoldingsPast.user_id == user_uuid,
+                CoinHoldingsPast.exchange_code == exchange_code,
             )
-            return saved_holdings
-
-        except Exception as e:
-            self.logger.error(f"보유 종목 평단 저장/업데이트 중 에러 발생: {e}")
-            session.rollback()
-            raise e
-        finally:
-            session.close()
-
-    def delete_holdings_not_in_list(
-        self, user_id: str, exchange_code: int, coin_ids: set
-    ) -> int:
-        """
-        특정 코인 목록에 없는 보유 종목 삭제
-        
-        Args:
-            user_id: 사용자 UUID
-            exchange_code: 거래소 코드
-            coin_ids: 유지할 coin_id 집합
-        
-        Returns:
-            삭제된 보유 종목 수
-        """
-        try:
-            session = db.get_session()
-
-            # user_id를 UUID로 변환
-            user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
-
-            # 해당 사용자의 해당 거래소의 모든 보유 종목 조회
-            all_holdings = (
-                session.query(CoinHoldingsPast)
-                .filter(
-                    CoinHoldingsPast.user_id == user_uuid,
-                    CoinHoldingsPast.exchange_code == exchange_code,
+            if rows:
+                delete_stmt = delete_stmt.where(
+                    CoinHoldingsPast.coin_id.notin_([row["coin_id"] for row in rows])
                 )
-                .all()
-            )
-
-            # 삭제할 보유 종목 목록 생성
-            holdings_to_delete = []
-            for holding in all_holdings:
-                if holding.coin_id not in coin_ids:
-                    holdings_to_delete.append(holding)
-
-            # 삭제 실행
-            deleted_count = 0
-            for holding in holdings_to_delete:
-                session.delete(holding)
-                deleted_count += 1
+            deleted_count = session.execute(delete_stmt).rowcount
+
+            if last_trade_id is not None:
+                mark_stmt = insert(ProfitCalculationMarks).values(
+                    user_id=user_uuid,
+                    exchange_code=exchange_code,
+                    last_trade_id=last_trade_id,
+                    last_trade_time=last_trade_time,
+                )
+                mark_stmt = mark_stmt.on_conflict_do_update(
+                    constraint="uk_profit_calculation_marks_user_exchange",
+                    set_={
+                        "last_trade_id": mark_stmt.excluded.last_trade_id,
+                        "last_trade_time": mark_stmt.excluded.last_trade_time,
+                        "updated_at": func.now(),
+                    },
+                )
+                session.execute(mark_stmt)
 
-            session.commit()
+            if owns_session:
+                session.commit()
 
             self.logger.info(
-                f"보유 종목 평단 삭제 완료: user_id={user_id}, exchange_code={exchange_code}, count={deleted_count}"
+                f"보유 종목 평단 스냅샷 교체 완료: user_id={user_id}, exchange_code={exchange_code}, "
+                f"saved={len(rows)}, deleted={deleted_count}"
             )
-            return deleted_count
+            return {"saved_count": len(rows), "deleted_count": deleted_count}
 
         except Exception as e:
-            self.logger.error(f"보유 종목 평단 삭제 중 에러 발생: {e}")
-            session.rollback()
+            self.logger.error(f"보유 종목 평단 스냅샷 교체 중 에러 발생: {e}")
+            if owns_session and session is not None:
+                session.rollback()
             raise e
         finally:
-            session.close()
+            if owns_session and session is not None:
+                session.close()
 
     def find_by_user_and_exchange(
         self, user_id: str, exchange_code: int
@@ -197,3 +184,31 @@ class CoinHoldingsPastRepository:
             self.logger.error(f"보유 종목 평단 딕셔너리 조회 중 에러 발생: {e}")
             raise e
 
+    def get_high_water_mark(
+        self, user_id: str, exchange_code: int
+    ) -> Tuple[Optional[int], Optional[datetime]]:
+        """
+        증분 계산 기준점 (last_trade_id, last_trade_time) 조회, 없으면 (None, None)
+        """
+        try:
+            session = db.get_session()
+
+            user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
+
+            mark = session.execute(
+                select(
+                    ProfitCalculationMarks.last_trade_id,
+                    ProfitCalculationMarks.last_trade_time,
+                ).where(
+                    ProfitCalculationMarks.user_id == user_uuid,
+                    ProfitCalculationMarks.exchange_code == exchange_code,
+                )
+            ).first()
+            if mark is None:
+                return None, None
+            return mark.last_trade_id, mark.last_trade_time
+        except Exception as e:
+            self.logger.error(f"증분 계산 기준점 조회 중 에러 발생: {e}")
+            raise e
+        finally:
+            session.close()
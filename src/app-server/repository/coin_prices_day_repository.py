@@ -0,0 +1,128 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import Float, Row, cast, func, select
+from sqlalchemy.dialects.postgresql import insert
+from database.database_connection import db
+from model.CoinPricesDay import CoinPricesDay
+
+# 일봉 upsert 시 다시 쓰는 컬럼 (당일 캔들은 장중에 계속 바뀜)
+UPSERT_COLUMNS = (
+    "market_code",
+    "candle_date_time_kst",
+    "opening_price",
+    "high_price",
+    "low_price",
+    "trade_price",
+    "timestamp",
+    "candle_acc_trade_price",
+    "candle_acc_trade_volume",
+    "prev_closing_price",
+    "change_price",
+    "change_rate",
+    "converted_trade_price",
+)
+
+
+class CoinPricesDayRepository:
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def upsert_candles(self, candles: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+        """
+        일봉 캔들 일괄 저장
+
+        (coin_id, candle_date_time_utc)가 이미 있으면 값이 바뀐 경우에만 업데이트합니다.
+
+        Args:
+            candles: coin_prices_day 칼럼명을 키로 하는 캔들 딕셔너리 목록
+            batch_size: INSERT 문 하나에 담을 최대 행 수
+
+        Returns:
+            추가/변경된 행 수
+        """
+        if not candles:
+            return 0
+        try:
+            session = db.get_session()
+
+            written_count = 0
+            for offset in range(0, len(candles), batch_size):
+                stmt = insert(CoinPricesDay).values(candles[offset : offset + batch_size])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[CoinPricesDay.coin_id, CoinPricesDay.candle_date_time_utc],
+                    set_={
+                        **{name: stmt.excluded[name] for name in UPSERT_COLUMNS},
+                        "updated_at": func.now(),
+                    },
+                    # 체결이 없어 마지막 틱 시각이 같으면 캔들 값도 같음
+                    where=CoinPricesDay.__table__.c.timestamp.is_distinct_from(
+                        stmt.excluded.timestamp
+                    ),
+                ).returning(CoinPricesDay.id)
+                written_count += len(session.execute(stmt).scalars().all())
+
+            session.commit()
+            return written_count
+
+        except Exception as e:
+            self.logger.error(f"일봉 캔들 저장 중 에러 발생: {e}")
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    def find_latest_candle_times(self) -> Dict[int, datetime]:
+        """코인별 마지막으로 저장된 일봉 시각 (candle_date_time_utc) 조회"""
+        try:
+            session = db.get_session()
+            rows = (
+                session.query(
+                    CoinPricesDay.coin_id, func.max(CoinPricesDay.candle_date_time_utc)
+                )
+                .group_by(CoinPricesDay.coin_id)
+                .all()
+            )
+            return {coin_id: latest for coin_id, latest in rows}
+        except Exception as e:
+            self.logger.error(f"코인별 마지막 일봉 시각 조회 중 에러 발생: {e}")
+            raise e
+        finally:
+            session.close()
+
+    def stream_price_columns(
+        self, updated_after: Optional[datetime] = None, batch_size: int = 10000
+    ) -> Iterator[List[Row]]:
+        """
+        가격 저장소 동기화용 일봉 칼럼을 서버 측 커서로 batch_size개씩 묶어 반환
+
+        Numeric 칼럼은 DB에서 float로 변환해 Decimal 객체를 만들지 않습니다.
+
+        Args:
+            updated_after: 지정하면 updated_at이 이 시각 이상인 행만 조회 (증분 동기화)
+
+        Returns:
+            (coin_id, candle_date_time_utc, close, high, low, volume, updated_at) Row 목록의 iterator
+        """
+        session = db.get_session()
+        try:
+            stmt = select(
+                CoinPricesDay.coin_id,
+                CoinPricesDay.candle_date_time_utc,
+                cast(CoinPricesDay.trade_price, Float).label("close"),
+                cast(CoinPricesDay.high_price, Float).label("high"),
+                cast(CoinPricesDay.low_price, Float).label("low"),
+                cast(CoinPricesDay.candle_acc_trade_volume, Float).label("volume"),
+                CoinPricesDay.updated_at,
+            )
+            if updated_after is not None:
+                stmt = stmt.where(CoinPricesDay.updated_at >= updated_after)
+            stmt = stmt.execution_options(stream_results=True, yield_per=batch_size)
+
+            for partition in session.execute(stmt).partitions():
+                yield partition
+        except Exception as e:
+            self.logger.error(f"일봉 가격 칼럼 스트리밍 조회 중 에러 발생: {e}")
+            raise e
+        finally:
+            session.close()
@@ -1,53 +1,105 @@
 import logging
 from typing import List, Dict, Any
+from sqlalchemy import literal_column, or_
+from sqlalchemy.dialects.postgresql import insert
 from database.database_connection import db
 from model.Coins import Coins
 
+# 종목 목록 갱신 시 다시 쓰는 컬럼 (market_code는 충돌 기준)
+UPSERT_COLUMNS = (
+    "symbol",
+    "quote_currency",
+    "korean_name",
+    "english_name",
+    "img_url",
+    "exchange",
+    "is_active",
+)
+
 
 class CoinRepository:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
-    def save_coin_list(self, coin_list: List[Coins]):
+    def save_coin_list(self, coin_list: List[Coins], batch_size: int = 1000):
         """
-        코인 목록을 저장 (신규 종목만 추가, 기존 종목은 업데이트하지 않음)
-        
+        코인 목록을 일괄 저장 (거래소 전체 목록 기준 갱신)
+
+        market_code 기준 INSERT ... ON CONFLICT DO UPDATE로 신규 종목은 추가하고,
+        이름/활성 여부 등이 바뀐 종목만 다시 씁니다.
+        전달된 목록에 없는 같은 거래소의 종목은 상장 폐지로 보고 비활성화합니다.
+        같은 목록으로 다시 호출하면 아무 행도 바뀌지 않습니다.
+
         Args:
-            coin_list: 저장할 코인 목록
-            
+            coin_list: 거래소의 전체 코인 목록
+            batch_size: INSERT 문 하나에 담을 최대 행 수
+
         Returns:
-            (새로 추가된 개수, 건너뛴 개수) 딕셔너리
+            {"new": 추가, "updated": 변경, "deactivated": 비활성화, "unchanged": 변경 없음} 개수 딕셔너리
         """
         session = None
         try:
             session = db.get_session()
 
-            # 기존 코인 목록 조회 (market_code 기준)
-            existing_coins = {
-                coin.market_code: coin 
-                for coin in session.query(Coins).all()
-            }
-            
+            # 같은 market_code가 두 번 있으면 한 INSERT 문에서 충돌하므로 마지막 값만 사용
+            rows = list(
+                {
+                    coin.market_code: self._to_upsert_row(coin)
+                    for coin in coin_list
+                    if coin.market_code
+                }.values()
+            )
+
             new_count = 0
-            skipped_count = 0
-            
-            for coin in coin_list:
-                if coin.market_code in existing_coins:
-                    # 기존 코인은 건너뛰기 (업데이트하지 않음)
-                    skipped_count += 1
-                else:
-                    # 새로운 코인만 추가
-                    session.add(coin)
-                    new_count += 1
-            
+            updated_count = 0
+            for offset in range(0, len(rows), batch_size):
+                stmt = insert(Coins).values(rows[offset : offset + batch_size])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Coins.market_code],
+                    set_={name: stmt.excluded[name] for name in UPSERT_COLUMNS},
+                    where=or_(
+                        *(
+                            Coins.__table__.c[name].is_distinct_from(stmt.excluded[name])
+                            for name in UPSERT_COLUMNS
+                        )
+                    ),
+                ).returning(literal_column("xmax = 0").label("inserted"))
+
+                # INSERT된 행은 xmax가 0, UPDATE된 행은 0이 아님 (값이 같아 건너뛴 행은 반환되지 않음)
+                for inserted in session.execute(stmt).scalars():
+                    if inserted:
+                        new_count += 1
+                    else:
+                        updated_count += 1
+
+            deactivated_count = 0
+            exchanges = {row["exchange"] for row in rows}
+            if rows:
+                deactivated_count = (
+                    session.query(Coins)
+                    .filter(
+                        Coins.exchange.in_(exchanges),
+                        Coins.market_code.notin_([row["market_code"] for row in rows]),
+                        Coins.is_active.isnot(False),
+                    )
+                    .update({Coins.is_active: False}, synchronize_session=False)
+                )
+
             session.commit()
 
+            result = {
+                "new": new_count,
+                "updated": updated_count,
+                "deactivated": deactivated_count,
+                "unchanged": len(rows) - new_count - updated_count,
+            }
             self.logger.info(
-                f"코인 목록 저장 완료: 새로 추가 {new_count}개, 건너뛰기 {skipped_count}개"
+                f"코인 목록 저장 완료: 새로 추가 {new_count}개, 변경 {updated_count}개, "
+                f"비활성화 {deactivated_count}개, 변경 없음 {result['unchanged']}개"
             )
-            
-            return {"new": new_count, "skipped": skipped_count}
-            
+
+            return result
+
         except Exception as e:
             self.logger.error(f"코인 목록 저장 중 에러 발생: {e}")
             if session:
@@ -57,6 +109,19 @@ class CoinRepository:
             if session:
                 session.close()
 
+    @staticmethod
+    def _to_upsert_row(coin: Coins) -> Dict[str, Any]:
+        return {
+            "market_code": coin.market_code,
+            "symbol": coin.symbol,
+            "quote_currency": coin.quote_currency,
+            "korean_name": coin.korean_name,
+            "english_name": coin.english_name,
+            "img_url": coin.img_url,
+            "exchange": coin.exchange or "upbit",
+            "is_active": True if coin.is_active is None else coin.is_active,
+        }
+
     def get_all_coins(self):
         session = None
         try:
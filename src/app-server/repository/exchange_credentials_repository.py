@@ -93,6 +93,24 @@ class ExchangeCredentialsRepository:
         finally:
             session.close()
 
+    def find_all_by_provider(
+        self, exchange_provider: ExchangeProvider
+    ) -> list[ExchangeCredentials]:
+        """거래소 제공자의 모든 사용자 자격증명 조회"""
+        try:
+            session = db.get_session()
+            credentials = (
+                session.query(ExchangeCredentials)
+                .filter(ExchangeCredentials.exchange_provider == exchange_provider)
+                .all()
+            )
+            return credentials
+        except Exception as e:
+            self.logger.error(f"거래소 전체 자격증명 조회 중 에러 발생: {e}")
+            raise e
+        finally:
+            session.close()
+
     def delete_credentials(
         self, user_id: str, exchange_provider: ExchangeProvider
     ) -> bool:
@@ -1,48 +1,86 @@
 import logging
-from typing import List
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from psycopg2.extras import execute_values
+from sqlalchemy import Row, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
 from database.database_connection import db
+from model.Coins import Coins
 from model.TradingHistories import TradingHistories
 
+# 거래내역 내보내기 칼럼 (순서대로 CSV 헤더가 됨)
+EXPORT_COLUMNS = (
+    TradingHistories.id,
+    TradingHistories.exchange_code,
+    TradingHistories.coin_id,
+    Coins.symbol,
+    Coins.market_code,
+    TradingHistories.trade_uuid,
+    TradingHistories.trade_type,
+    TradingHistories.price,
+    TradingHistories.quantity,
+    TradingHistories.total_price,
+    TradingHistories.fee,
+    TradingHistories.trade_time,
+    TradingHistories.profit_loss_rate,
+    TradingHistories.avg_buy_price,
+)
+
+# 값이 바뀐 행만 업데이트 (IS DISTINCT FROM은 NULL 비교까지 처리)
+UPDATE_PROFIT_LOSS_SQL = """
+    UPDATE trading_histories AS t
+    SET profit_loss_rate = v.profit_loss_rate,
+        avg_buy_price = v.avg_buy_price
+    FROM (VALUES %s) AS v(id, profit_loss_rate, avg_buy_price)
+    WHERE t.id = v.id
+      AND (
+        t.profit_loss_rate IS DISTINCT FROM v.profit_loss_rate
+        OR t.avg_buy_price IS DISTINCT FROM v.avg_buy_price
+      )
+    RETURNING t.id
+"""
+
 
 class TradingHistoriesRepository:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
 
     def save_trading_histories(
-        self, trading_histories: List[TradingHistories]
-    ) -> List[TradingHistories]:
-        """거래내역 목록 저장"""
+        self, trading_histories: List[TradingHistories], batch_size: int = 1000
+    ) -> List[int]:
+        """
+        거래내역 목록 일괄 저장
+
+        (user_id, exchange_code, trade_uuid)가 이미 있는 거래내역은
+        uq_user_exchange_trade_uuid 제약조건의 ON CONFLICT DO NOTHING으로 건너뜁니다.
+
+        Args:
+            trading_histories: 저장할 거래내역 목록
+            batch_size: INSERT 문 하나에 담을 최대 행 수
+
+        Returns:
+            새로 저장된 거래내역 id 목록
+        """
         try:
             session = db.get_session()
 
-            # 기존 거래내역과 중복 체크 (trade_uuid 기준)
-            saved_histories = []
-
-            for history in trading_histories:
-                # 기존 거래내역 확인
-                existing = (
-                    session.query(TradingHistories)
-                    .filter(
-                        TradingHistories.user_id == history.user_id,
-                        TradingHistories.exchange_code == history.exchange_code,
-                        TradingHistories.trade_uuid == history.trade_uuid,
-                    )
-                    .first()
-                )
-
-                if existing:
-                    continue
+            inserted_ids = []
+            rows = [self._to_insert_row(history) for history in trading_histories]
 
-                session.add(history)
-                saved_histories.append(history)
+            for offset in range(0, len(rows), batch_size):
+                stmt = (
+                    insert(TradingHistories)
+                    .values(rows[offset : offset + batch_size])
+                    .on_conflict_do_nothing(constraint="uq_user_exchange_trade_uuid")
+                    .returning(TradingHistories.id)
+                )
+                inserted_ids.extend(session.execute(stmt).scalars().all())
 
             session.commit()
 
-            for history in saved_histories:
-                session.refresh(history)
-
-            self.logger.info(f"거래내역 저장 완료: {len(saved_histories)}개")
-            return saved_histories
+            self.logger.info(f"거래내역 저장 완료: {len(inserted_ids)}개")
+            return inserted_ids
 
         except Exception as e:
             self.logger.error(f"거래내역 저장 중 에러 발생: {e}")
@@ -51,6 +89,23 @@ class TradingHistoriesRepository:
         finally:
             session.close()
 
+    @staticmethod
+    def _to_insert_row(history: TradingHistories) -> Dict[str, Any]:
+        return {
+            "user_id": history.user_id,
+            "coin_id": history.coin_id,
+            "exchange_code": history.exchange_code,
+            "trade_uuid": history.trade_uuid,
+            "trade_type": history.trade_type,
+            "price": history.price,
+            "quantity": history.quantity,
+            "total_price": history.total_price,
+            "fee": history.fee if history.fee is not None else 0,
+            "trade_time": history.trade_time,
+            "profit_loss_rate": history.profit_loss_rate,
+            "avg_buy_price": history.avg_buy_price,
+        }
+
     def find_by_user_and_exchange(
         self, user_id: str, exchange_code: int
     ) -> List[TradingHistories]:
@@ -73,6 +128,228 @@ class TradingHistoriesRepository:
         finally:
             session.close()
 
+    def find_for_profit_calculation(
+        self, user_id: str, exchange_code: int, after_trade_id: Optional[int] = None
+    ) -> List[TradingHistories]:
+        """
+        수익률 계산용 거래내역 조회 (trade_time, id 오름차순)
+
+        Args:
+            user_id: 사용자 UUID
+            exchange_code: 거래소 코드
+            after_trade_id: 지정하면 이 id보다 큰(이후 저장된) 거래내역만 조회
+        """
+        try:
+            session = db.get_session()
+            query = session.query(TradingHistories).filter(
+                TradingHistories.user_id == user_id,
+                TradingHistories.exchange_code == exchange_code,
+            )
+            if after_trade_id is not None:
+                query = query.filter(TradingHistories.id > after_trade_id)
+            return query.order_by(
+                TradingHistories.trade_time.asc(), TradingHistories.id.asc()
+            ).all()
+        except Exception as e:
+            self.logger.error(f"수익률 계산용 거래내역 조회 중 에러 발생: {e}")
+            raise e
+        finally:
+            session.close()
+
+    def find_page_by_user(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        exchange_code: Optional[int] = None,
+        coin_id: Optional[int] = None,
+        trade_type: Optional[int] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> List[TradingHistories]:
+        """
+        사용자 거래내역 페이지 조회 (trade_time, id 내림차순 keyset)
+
+        Args:
+            user_id: 사용자 UUID
+            limit: 조회할 최대 행 수
+            cursor: 직전 페이지 마지막 행의 (trade_time, id), 이 행 다음부터 조회
+            exchange_code, coin_id, trade_type: 필터
+            start_time, end_time: trade_time 범위 필터 (start_time 이상, end_time 미만)
+        """
+        try:
+            session = db.get_session()
+            query = session.query(TradingHistories).filter(
+                TradingHistories.user_id == user_id
+            )
+            if exchange_code is not None:
+                query = query.filter(TradingHistories.exchange_code == exchange_code)
+            if coin_id is not None:
+                query = query.filter(TradingHistories.coin_id == coin_id)
+            if trade_type is not None:
+                query = query.filter(TradingHistories.trade_type == trade_type)
+            if start_time is not None:
+                query = query.filter(TradingHistories.trade_time >= start_time)
+            if end_time is not None:
+                query = query.filter(TradingHistories.trade_time < end_time)
+            if cursor is not None:
+                query = query.filter(
+                    tuple_(TradingHistories.trade_time, TradingHistories.id)
+                    < tuple_(cursor[0], cursor[1])
+                )
+
+            return (
+                query.order_by(
+                    TradingHistories.trade_time.desc(), TradingHistories.id.desc()
+                )
+                .limit(limit)
+                .all()
+            )
+        except Exception as e:
+            self.logger.error(f"거래내역 페이지 조회 중 에러 발생: {e}")
+            raise e
+        finally:
+            session.close()
+
+    def stream_by_user(
+        self,
+        user_id: str,
+        exchange_code: Optional[int] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Row]:
+        """
+        사용자 거래내역을 서버 측 커서로 batch_size개씩 읽어 한 행씩 반환 (trade_time, id 오름차순)
+
+        ORM 객체 대신 내보내기에 필요한 칼럼만 Row로 읽으므로 행 수와 관계없이 메모리 사용량이 일정합니다.
+        """
+        session = db.get_session()
+        try:
+            stmt = (
+                select(*EXPORT_COLUMNS)
+                .outerjoin(Coins, Coins.id == TradingHistories.coin_id)
+                .where(TradingHistories.user_id == user_id)
+            )
+            if exchange_code is not None:
+                stmt = stmt.where(TradingHistories.exchange_code == exchange_code)
+            if start_time is not None:
+                stmt = stmt.where(TradingHistories.trade_time >= start_time)
+            if end_time is not None:
+                stmt = stmt.where(TradingHistories.trade_time < end_time)
+            stmt = stmt.order_by(
+                TradingHistories.trade_time.asc(), TradingHistories.id.asc()
+            ).execution_options(stream_results=True, yield_per=batch_size)
+
+            for row in session.execute(stmt):
+                yield row
+        except Exception as e:
+            self.logger.error(f"거래내역 스트리밍 조회 중 에러 발생: {e}")
+            raise e
+        finally:
+            session.close()
+
+    def find_by_ids(self, ids: List[int]) -> List[TradingHistories]:
+        """id 목록으로 거래내역 조회 (trade_time, id 내림차순)"""
+        if not ids:
+            return []
+        try:
+            session = db.get_session()
+            return (
+                session.query(TradingHistories)
+                .filter(TradingHistories.id.in_(ids))
+                .order_by(
+                    TradingHistories.trade_time.desc(), TradingHistories.id.desc()
+                )
+                .all()
+            )
+        except Exception as e:
+            self.logger.error(f"id 목록 거래내역 조회 중 에러 발생: {e}")
+            raise e
+        finally:
+            session.close()
+
+    def count_by_user(self, user_id: str) -> int:
+        """사용자 거래내역 수 조회"""
+        try:
+            session = db.get_session()
+            return (
+                session.query(func.count(TradingHistories.id))
+                .filter(TradingHistories.user_id == user_id)
+                .scalar()
+            )
+        except Exception as e:
+            self.logger.error(f"사용자 거래내역 수 조회 중 에러 발생: {e}")
+            raise e
+        finally:
+            session.close()
+
+    def find_position_columns(self, user_id: str, exchange_code: int) -> List[Row]:
+        """
+        포트폴리오 시계열 계산용 거래내역 칼럼 조회 (trade_time, id 오름차순)
+
+        Returns:
+            (id, coin_id, trade_type, price, quantity, trade_time) Row 목록
+        """
+        try:
+            session = db.get_session()
+            stmt = (
+                select(
+                    TradingHistories.id,
+                    TradingHistories.coin_id,
+                    TradingHistories.trade_type,
+                    TradingHistories.price,
+                    TradingHistories.quantity,
+                    TradingHistories.trade_time,
+                )
+                .where(
+                    TradingHistories.user_id == user_id,
+                    TradingHistories.exchange_code == exchange_code,
+                )
+                .order_by(TradingHistories.trade_time.asc(), TradingHistories.id.asc())
+            )
+            return session.execute(stmt).all()
+        except Exception as e:
+            self.logger.error(f"포트폴리오 계산용 거래내역 조회 중 에러 발생: {e}")
+            raise e
+        finally:
+            session.close()
+
+    def find_last_trade_id(self, user_id: str, exchange_code: int) -> Optional[int]:
+        """사용자/거래소의 가장 최근에 저장된 거래내역 id (없으면 None)"""
+        try:
+            session = db.get_session()
+            return (
+                session.query(func.max(TradingHistories.id))
+                .filter(
+                    TradingHistories.user_id == user_id,
+                    TradingHistories.exchange_code == exchange_code,
+                )
+                .scalar()
+            )
+        except Exception as e:
+            self.logger.error(f"마지막 거래내역 id 조회 중 에러 발생: {e}")
+            raise e
+        finally:
+            session.close()
+
+    def find_user_exchange_pairs(self) -> List[Tuple[str, int]]:
+        """거래내역이 있는 (user_id, exchange_code) 목록 조회 (user_id, exchange_code 순)"""
+        try:
+            session = db.get_session()
+            rows = (
+                session.query(TradingHistories.user_id, TradingHistories.exchange_code)
+                .distinct()
+                .order_by(TradingHistories.user_id, TradingHistories.exchange_code)
+                .all()
+            )
+            return [(str(user_id), exchange_code) for user_id, exchange_code in rows]
+        except Exception as e:
+            self.logger.error(f"거래내역 사용자/거래소 목록 조회 중 에러 발생: {e}")
+            raise e
+        finally:
+            session.close()
+
     def find_by_user_id(self, user_id: str) -> List[TradingHistories]:
         """사용자 ID로 모든 거래내역 조회"""
         try:
@@ -114,47 +391,64 @@ class TradingHistoriesRepository:
             session.close()
 
     def update_profit_loss(
-        self, trading_histories: List[TradingHistories]
-    ) -> List[TradingHistories]:
+        self,
+        trading_histories: List[TradingHistories],
+        batch_size: int = 1000,
+        session: Optional[Session] = None,
+    ) -> List[int]:
         """
-        거래내역의 수익률 및 평균 구매 단가 업데이트
-        
+        거래내역의 수익률 및 평균 구매 단가 일괄 업데이트
+
+        UPDATE ... FROM (VALUES ...)로 batch_size개씩 업데이트하며,
+        profit_loss_rate/avg_buy_price가 실제로 바뀐 행만 씁니다.
+
         Args:
             trading_histories: 업데이트할 거래내역 목록
-        
+            batch_size: UPDATE 문 하나에 담을 최대 행 수
+            session: 지정하면 이 세션에서 실행하고 commit은 호출 측에서 수행
+
         Returns:
-            업데이트된 거래내역 목록
+            실제로 업데이트된 거래내역 id 목록
         """
+        owns_session = session is None
         try:
-            session = db.get_session()
+            if owns_session:
+                session = db.get_session()
 
-            updated_histories = []
+            rows = [
+                (history.id, history.profit_loss_rate, history.avg_buy_price)
+                for history in trading_histories
+                if history.id is not None
+            ]
 
-            for history in trading_histories:
-                # 기존 거래내역 확인
-                existing = (
-                    session.query(TradingHistories)
-                    .filter(TradingHistories.id == history.id)
-                    .first()
-                )
-
-                if existing:
-                    # 수익률 및 평균 구매 단가 업데이트
-                    existing.profit_loss_rate = history.profit_loss_rate
-                    existing.avg_buy_price = history.avg_buy_price
-                    updated_histories.append(existing)
-
-            session.commit()
+            updated_ids = []
+            if rows:
+                cursor = session.connection().connection.cursor()
+                try:
+                    updated_ids = execute_values(
+                        cursor,
+                        UPDATE_PROFIT_LOSS_SQL,
+                        rows,
+                        template="(%s::integer, %s::numeric(5, 2), %s::numeric(20, 8))",
+                        page_size=batch_size,
+                        fetch=True,
+                    )
+                finally:
+                    cursor.close()
 
-            for history in updated_histories:
-                session.refresh(history)
+            if owns_session:
+                session.commit()
 
-            self.logger.info(f"거래내역 수익률 업데이트 완료: {len(updated_histories)}개")
-            return updated_histories
+            self.logger.info(
+                f"거래내역 수익률 업데이트 완료: {len(updated_ids)}개 (대상 {len(rows)}개)"
+            )
+            return [row[0] for row in updated_ids]
 
         except Exception as e:
             self.logger.error(f"거래내역 수익률 업데이트 중 에러 발생: {e}")
-            session.rollback()
+            if owns_session and session is not None:
+                session.rollback()
             raise e
         finally:
-            session.close()
+            if owns_session and session is not None:
+                session.close()
@@ -0,0 +1,44 @@
+"""
+활성 코인 일봉 수집 CLI (cron 등에서 주기 실행)
+
+사용법 (src/app-server에서):
+    python -m scripts.ingest_daily_candles
+    python -m scripts.ingest_daily_candles --markets KRW-BTC KRW-ETH --max-pages 1
+"""
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+# app-server 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from service.candle_ingestion_service import CandleIngestionService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="활성 코인 일봉 수집")
+    parser.add_argument("--workers", type=int, default=None, help="동시 처리 마켓 수")
+    parser.add_argument("--markets", nargs="*", default=None, help="수집할 마켓 코드")
+    parser.add_argument(
+        "--max-pages", type=int, default=None, help="마켓별 최대 조회 페이지 수 (페이지당 200일)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    summary = CandleIngestionService(max_workers=args.workers).ingest_daily_candles(
+        market_codes=args.markets, max_pages=args.max_pages
+    )
+
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
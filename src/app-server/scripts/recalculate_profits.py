@@ -0,0 +1,52 @@
+"""
+전체 사용자 수익률 재계산 CLI
+
+사용법 (src/app-server에서):
+    python -m scripts.recalculate_profits --workers 8
+    python -m scripts.recalculate_profits --no-resume   # checkpoint를 지우고 처음부터
+"""
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+# app-server 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from service.profit_recalculation_service import ProfitRecalculationService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전체 사용자 수익률 재계산")
+    parser.add_argument("--workers", type=int, default=None, help="worker 프로세스 수")
+    parser.add_argument("--checkpoint", default=None, help="완료 항목 기록 파일 경로")
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="checkpoint를 무시하고 처음부터 다시 계산",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    # 거래 단위 로그는 숨기고 진행 요약만 출력
+    logging.getLogger("service.trading_profit_service").setLevel(logging.WARNING)
+    logging.getLogger("service.trading_profit_calculator").setLevel(logging.WARNING)
+    logging.getLogger("repository").setLevel(logging.WARNING)
+
+    summary = ProfitRecalculationService().recalculate_all(
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        resume=not args.no_resume,
+    )
+
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,24 @@
+import hashlib
+import json
 import logging
-from typing import List, Dict, Any, Set, Tuple
+from typing import List, Dict, Any, Optional
 from model.Assets import Assets
-from dto.exchange_credentials_dto import ExchangeProvider
+from dto.exchange_credentials_dto import ExchangeCredentialsResponse, ExchangeProvider
+
+
+def accounts_payload_hash(accounts: List[Dict[str, Any]]) -> str:
+    """계정 잔고 응답의 내용 해시 (응답 순서와 무관)"""
+    normalized = sorted(
+        (json.dumps(account, sort_keys=True) for account in accounts or [])
+    )
+    return hashlib.sha256("\n".join(normalized).encode("utf-8")).hexdigest()
 
 
 class AssetsService:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self._assets_repository = None
-        self._coin_repository = None
+        self._coin_catalog = None
         self._upbit_service = None
         self._exchange_credentials_service = None
 
@@ -21,12 +31,12 @@ class AssetsService:
         return self._assets_repository
 
     @property
-    def coin_repository(self):
-        if self._coin_repository is None:
-            from dependencies import get_coin_repository
+    def coin_catalog(self):
+        if self._coin_catalog is None:
+            from dependencies import get_coin_catalog
 
-            self._coin_repository = get_coin_repository()
-        return self._coin_repository
+            self._coin_catalog = get_coin_catalog()
+        return self._coin_catalog
 
     @property
     def upbit_service(self):
@@ -47,19 +57,15 @@ class AssetsService:
     def _get_coin_id(self, symbol: str, trade_by_symbol: str) -> int | None:
         """symbol과 trade_by_symbol로 coin_id 조회"""
         try:
-            coins = self.coin_repository.get_all_coins()
-
-            # market_code 형식: BTC/KRW
-            market_code = f"{symbol}/{trade_by_symbol}"
-
-            for coin in coins:
-                if coin.market_code == market_code:
-                    return coin.id
+            # market_code 형식: KRW-BTC
+            coin = self.coin_catalog.get_by_market_code(f"{trade_by_symbol}-{symbol}")
 
             # market_code로 찾지 못하면 symbol과 quote_currency로 찾기
-            for coin in coins:
-                if coin.symbol == symbol and coin.quote_currency == trade_by_symbol:
-                    return coin.id
+            if coin is None:
+                coin = self.coin_catalog.get_by_symbol(symbol, trade_by_symbol)
+
+            if coin is not None:
+                return coin.id
 
             self.logger.warning(
                 f"coin_id를 찾을 수 없습니다: symbol={symbol}, trade_by_symbol={trade_by_symbol}"
@@ -101,13 +107,24 @@ class AssetsService:
             self.logger.error(f"Upbit 계정 잔고 변환 중 에러 발생: {e}")
             raise e
 
-    def sync_upbit_assets(self, user_id: str) -> Dict[str, Any]:
-        """Upbit 잔고를 가져와서 assets 테이블에 동기화"""
+    def sync_upbit_assets(
+        self,
+        user_id: str,
+        credentials: Optional[ExchangeCredentialsResponse] = None,
+    ) -> Dict[str, Any]:
+        """
+        Upbit 잔고를 가져와서 assets 테이블에 동기화
+
+        Args:
+            user_id: 사용자 UUID
+            credentials: 이미 복호화한 자격증명 (없으면 DB에서 조회 후 복호화)
+        """
         try:
             # 1. 자격증명 조회
-            credentials = self.exchange_credentials_service.get_credentials(
-                user_id, ExchangeProvider.UPBIT
-            )
+            if credentials is None:
+                credentials = self.exchange_credentials_service.get_credentials(
+                    user_id, ExchangeProvider.UPBIT
+                )
 
             if not credentials:
                 raise ValueError("Upbit 자격증명을 찾을 수 없습니다")
@@ -120,45 +137,42 @@ class AssetsService:
                 credentials.access_key, credentials.secret_key
             )
 
+            return self.apply_upbit_accounts(user_id, accounts)
+
+        except Exception as e:
+            self.logger.error(f"Upbit 자산 동기화 중 에러 발생: {e}")
+            raise e
+
+    def apply_upbit_accounts(
+        self, user_id: str, accounts: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """조회한 Upbit 계정 잔고를 assets 테이블에 반영"""
+        try:
             if not accounts:
-                self.logger.warning(f"Upbit 계정 잔고가 비어있습니다: user_id={user_id}")
                 # 잔고가 없으면 모든 자산 삭제
-                deleted_count = self.assets_repository.delete_assets_not_in_list(
-                    user_id, ExchangeProvider.UPBIT.value, set()
-                )
-                return {
-                    "saved_count": 0,
-                    "deleted_count": deleted_count,
-                    "assets": [],
-                }
+                self.logger.warning(f"Upbit 계정 잔고가 비어있습니다: user_id={user_id}")
 
             # 3. Upbit 응답을 Assets 모델로 변환
-            assets = []
-            symbol_trade_by_pairs: Set[Tuple[str, str]] = set()
-
-            for account in accounts:
-                # 잔고가 0이고 locked도 0인 경우는 제외하지 않음 (보유 이력 유지)
-                asset = self._convert_upbit_account_to_asset(account)
-                assets.append(asset)
-                symbol_trade_by_pairs.add((asset.symbol, asset.trade_by_symbol))
+            # 잔고가 0이고 locked도 0인 경우는 제외하지 않음 (보유 이력 유지)
+            assets = [
+                self._convert_upbit_account_to_asset(account) for account in accounts or []
+            ]
 
-            # 4. 자산 저장/업데이트
-            saved_assets = self.assets_repository.save_or_update_assets(
+            # 4. 자산 추가/변경 + 잔고에 없는 자산 삭제 (한 트랜잭션)
+            result = self.assets_repository.sync_assets(
                 user_id, ExchangeProvider.UPBIT.value, assets
             )
 
-            # 5. 잔고에 없는 자산 삭제
-            deleted_count = self.assets_repository.delete_assets_not_in_list(
-                user_id, ExchangeProvider.UPBIT.value, symbol_trade_by_pairs
-            )
-
             self.logger.info(
-                f"Upbit 자산 동기화 완료: user_id={user_id}, saved={len(saved_assets)}, deleted={deleted_count}"
+                f"Upbit 자산 동기화 완료: user_id={user_id}, changed={result['changed_count']}, "
+                f"unchanged={result['unchanged_count']}, deleted={result['deleted_count']}"
             )
 
             return {
-                "saved_count": len(saved_assets),
-                "deleted_count": deleted_count,
+                "saved_count": result["changed_count"] + result["unchanged_count"],
+                "changed_count": result["changed_count"],
+                "unchanged_count": result["unchanged_count"],
+                "deleted_count": result["deleted_count"],
                 "assets": [
                     {
                         "id": asset.id,
@@ -168,11 +182,11 @@ class AssetsService:
                         "locked_quantity": float(asset.locked_quantity),
                         "avg_buy_price": float(asset.avg_buy_price),
                     }
-                    for asset in saved_assets
+                    for asset in result["assets"]
                 ],
             }
 
         except Exception as e:
-            self.logger.error(f"Upbit 자산 동기화 중 에러 발생: {e}")
+            self.logger.error(f"Upbit 자산 반영 중 에러 발생: {e}")
             raise e
 
@@ -0,0 +1,227 @@
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+from dto.exchange_credentials_dto import ExchangeCredentialsResponse, ExchangeProvider
+from service.assets_service import accounts_payload_hash
+
+SYNCED = "synced"
+UNCHANGED = "unchanged"
+FAILED = "failed"
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> Optional[float]:
+    """정렬된 값 목록의 nearest-rank 백분위수"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class BalanceSyncScheduler:
+    """
+    전체 사용자 Upbit 잔고 주기 동기화
+
+    주기마다 자격증명을 한 번씩만 복호화하고, 제한된 worker pool에서 사용자별 잔고를 조회합니다.
+    요청 속도는 UpbitHttpClient의 access key별 rate limiter가 제한합니다.
+    잔고 응답 해시가 직전 주기와 같은 사용자는 DB 쓰기를 건너뜁니다.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: Optional[float] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.logger = logging.getLogger(__name__)
+        if interval_seconds is None:
+            interval_seconds = float(os.getenv("BALANCE_SYNC_INTERVAL_SECONDS", "300"))
+        if max_workers is None:
+            max_workers = int(os.getenv("BALANCE_SYNC_WORKERS", "8"))
+        self.interval_seconds = interval_seconds
+        self.max_workers = max(1, max_workers)
+        self._payload_hashes: Dict[str, str] = {}
+        self._cycle_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_summary: Optional[Dict[str, Any]] = None
+        self._assets_service = None
+        self._upbit_service = None
+        self._exchange_credentials_service = None
+
+    @property
+    def assets_service(self):
+        if self._assets_service is None:
+            from dependencies import get_assets_service
+
+            self._assets_service = get_assets_service()
+        return self._assets_service
+
+    @property
+    def upbit_service(self):
+        if self._upbit_service is None:
+            from dependencies import get_upbit_service
+
+            self._upbit_service = get_upbit_service()
+        return self._upbit_service
+
+    @property
+    def exchange_credentials_service(self):
+        if self._exchange_credentials_service is None:
+            from dependencies import get_exchange_credentials_service
+
+            self._exchange_credentials_service = get_exchange_credentials_service()
+        return self._exchange_credentials_service
+
+    @property
+    def running(self) -> bool:
+        return self._cycle_lock.locked()
+
+    def run_cycle(self) -> Dict[str, Any]:
+        """
+        전체 사용자 잔고 동기화 1회 실행
+
+        Returns:
+            주기 요약 (사용자 수, 결과별 개수, 소요 시간, 사용자별 지연 백분위수)
+        """
+        if not self._cycle_lock.acquire(blocking=False):
+            raise ValueError("잔고 동기화가 이미 진행 중입니다")
+        try:
+            started_at = time.perf_counter()
+
+            # 주기마다 자격증명을 한 번씩만 복호화
+            credentials_list = self.exchange_credentials_service.get_all_decrypted_credentials(
+                ExchangeProvider.UPBIT
+            )
+
+            outcomes: List[Dict[str, Any]] = []
+            if credentials_list:
+                with ThreadPoolExecutor(
+                    max_workers=min(self.max_workers, len(credentials_list)),
+                    thread_name_prefix="balance-sync",
+                ) as executor:
+                    outcomes = list(executor.map(self._sync_user, credentials_list))
+
+            # 연결이 끊긴 사용자의 해시는 제거
+            active_user_ids = {credentials.user_id for credentials in credentials_list}
+            for user_id in list(self._payload_hashes):
+                if user_id not in active_user_ids:
+                    del self._payload_hashes[user_id]
+
+            summary = self._summarize(outcomes, time.perf_counter() - started_at)
+            self.last_summary = summary
+            self.logger.info(
+                f"잔고 동기화 주기 완료: users={summary['user_count']}, synced={summary['synced_count']}, "
+                f"unchanged={summary['unchanged_count']}, failed={summary['failed_count']}, "
+                f"{summary['cycle_seconds']}초, p95={summary['latency_ms']['p95']}ms"
+            )
+            return summary
+        finally:
+            self._cycle_lock.release()
+
+    def _sync_user(self, credentials: ExchangeCredentialsResponse) -> Dict[str, Any]:
+        user_id = credentials.user_id
+        started_at = time.perf_counter()
+        outcome: Dict[str, Any] = {"user_id": user_id}
+        try:
+            accounts = self.upbit_service.fetch_accounts(
+                credentials.access_key, credentials.secret_key
+            )
+            payload_hash = accounts_payload_hash(accounts)
+
+            if self._payload_hashes.get(user_id) == payload_hash:
+                outcome["status"] = UNCHANGED
+            else:
+                self.assets_service.apply_upbit_accounts(user_id, accounts)
+                self._payload_hashes[user_id] = payload_hash
+                outcome["status"] = SYNCED
+        except Exception as e:
+            self.logger.error(f"사용자 잔고 동기화 실패: user_id={user_id}, error={e}")
+            outcome["status"] = FAILED
+            outcome["error"] = str(e)
+        outcome["elapsed"] = time.perf_counter() - started_at
+        return outcome
+
+    @staticmethod
+    def _summarize(outcomes: List[Dict[str, Any]], cycle_seconds: float) -> Dict[str, Any]:
+        latencies = sorted(outcome["elapsed"] * 1000 for outcome in outcomes)
+
+        def latency(percent: float) -> Optional[float]:
+            value = percentile(latencies, percent)
+            return round(value, 1) if value is not None else None
+
+        return {
+            "user_count": len(outcomes),
+            "synced_count": sum(1 for outcome in outcomes if outcome["status"] == SYNCED),
+            "unchanged_count": sum(
+                1 for outcome in outcomes if outcome["status"] == UNCHANGED
+            ),
+            "failed_count": sum(1 for outcome in outcomes if outcome["status"] == FAILED),
+            "failed": [
+                {"user_id": outcome["user_id"], "error": outcome["error"]}
+                for outcome in outcomes
+                if outcome["status"] == FAILED
+            ],
+            "cycle_seconds": round(cycle_seconds, 3),
+            "latency_ms": {
+                "p50": latency(50),
+                "p95": latency(95),
+                "p99": latency(99),
+                "max": round(latencies[-1], 1) if latencies else None,
+            },
+            "finished_at": time.time(),
+        }
+
+    def start(self):
+        """interval_seconds 간격으로 동기화하는 백그라운드 스레드 시작"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="balance-sync-scheduler", daemon=True
+        )
+        self._thread.start()
+        self.logger.info(f"잔고 동기화 스케줄러 시작: interval={self.interval_seconds}초")
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            try:
+                self.run_cycle()
+            except Exception as e:
+                self.logger.error(f"잔고 동기화 주기 실패: {e}")
+            self._stop_event.wait(self.interval_seconds)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def start_cycle_in_background(self) -> bool:
+        """
+        동기화 1회를 백그라운드 스레드에서 실행 (관리자 API용)
+
+        Returns:
+            새로 시작했으면 True, 이미 진행 중이면 False
+        """
+        if self.running:
+            return False
+
+        def run():
+            try:
+                self.run_cycle()
+            except ValueError:
+                # 그 사이 다른 주기가 시작된 경우
+                pass
+            except Exception as e:
+                self.logger.error(f"잔고 동기화 주기 실패: {e}")
+
+        threading.Thread(target=run, name="balance-sync-once", daemon=True).start()
+        return True
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "scheduled": self._thread is not None and self._thread.is_alive(),
+            "interval_seconds": self.interval_seconds,
+            "last_summary": self.last_summary,
+        }
@@ -0,0 +1,276 @@
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from model.TradingHistories import TradingHistories
+from utils.fixed_point import (
+    PRICE_TO_AVG,
+    avg_from_cost,
+    avg_to_decimal,
+    avg_to_fixed,
+    avg_to_float,
+    hundredths_to_float,
+    profit_loss_hundredths,
+    to_fixed,
+    value_to_decimal,
+)
+
+BUY = 0
+SELL = 1
+
+
+@dataclass
+class BatchProfitResult:
+    """
+    BatchProfitCalculator 계산 결과 (profit_loss_rate/avg_buy_price는 입력 순서 기준)
+
+    holdings: {(user_id, coin_id): {"avg_buy_price": Decimal, "remaining_quantity": Decimal}}
+    """
+
+    profit_loss_rate: List[Optional[float]]
+    avg_buy_price: List[Optional[float]]
+    holdings: Dict[Tuple[Any, int], Dict[str, Decimal]] = field(default_factory=dict)
+
+
+class BatchProfitCalculator:
+    """
+    여러 사용자의 거래 내역을 열(column) 단위로 한 번에 계산하는 수익률 계산기
+
+    정렬과 (user_id, coin_id) 그룹 분할, 그룹별 매수 누적합은 NumPy로 처리하고,
+    평단 재귀식은 매도 시점에서만 고정소수점 정수로 계산합니다.
+    평단은 TradingProfitCalculator와 같이 매도 시점의 누적 원가 / 보유량을 소수점 20자리로 한 번만
+    반올림하므로 Decimal 모드와 같은 결과를 냅니다.
+    매도 수량이 보유량보다 많으면 건너뛰는 등 조건부 분기가 있어 평단 자체는 누적합으로 풀리지 않습니다.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def calculate(
+        self,
+        user_ids: Sequence[Any],
+        coin_ids: Sequence[int],
+        trade_times: Sequence[Any],
+        trade_types: Sequence[int],
+        prices: Sequence[Any],
+        quantities: Sequence[Any],
+        initial_holdings: Optional[Dict[Tuple[Any, int], Dict]] = None,
+    ) -> BatchProfitResult:
+        """
+        Args:
+            user_ids, coin_ids, trade_times, trade_types, prices, quantities: 같은 길이의 거래 내역 열
+            initial_holdings: 이어서 계산할 기존 보유 종목 평단
+                {(user_id, coin_id): {"avg_buy_price", "remaining_quantity"}}
+
+        Returns:
+            BatchProfitResult
+        """
+        try:
+            total = len(coin_ids)
+            profit_loss_rate: List[Optional[float]] = [None] * total
+            avg_buy_price: List[Optional[float]] = [None] * total
+            result = BatchProfitResult(profit_loss_rate, avg_buy_price)
+            initial_holdings = initial_holdings or {}
+            calculated_keys = set()
+
+            if total:
+                # (user_id, coin_id, trade_time) 순 안정 정렬 → 그룹 경계 계산
+                _, user_codes = np.unique(
+                    np.asarray(user_ids, dtype=object).astype(str), return_inverse=True
+                )
+                _, time_codes = np.unique(
+                    np.asarray(trade_times, dtype=object), return_inverse=True
+                )
+                coins = np.asarray(coin_ids, dtype=np.int64)
+                order = np.lexsort((time_codes, coins, user_codes))
+
+                sorted_users = user_codes[order]
+                sorted_coins = coins[order]
+                boundaries = np.flatnonzero(
+                    (np.diff(sorted_users) != 0) | (np.diff(sorted_coins) != 0)
+                ) + 1
+                starts = np.concatenate(([0], boundaries))
+                ends = np.concatenate((boundaries, [total]))
+
+                sides = np.asarray(trade_types, dtype=np.int8)[order]
+                fixed_prices = np.array([to_fixed(p) for p in prices], dtype=object)[order]
+                fixed_quantities = np.array(
+                    [to_fixed(q) for q in quantities], dtype=object
+                )[order]
+
+                is_buy = sides == BUY
+                buy_costs = np.where(is_buy, fixed_prices * fixed_quantities, 0)
+                buy_quantities = np.where(is_buy, fixed_quantities, 0)
+
+                for start, end in zip(starts.tolist(), ends.tolist()):
+                    first = order[start]
+                    key = (user_ids[first], coin_ids[first])
+                    calculated_keys.add(key)
+                    position = self._initial_position(initial_holdings.get(key))
+                    position = self._replay_group(
+                        order[start:end],
+                        sides[start:end],
+                        fixed_prices[start:end],
+                        fixed_quantities[start:end],
+                        np.cumsum(buy_costs[start:end]),
+                        np.cumsum(buy_quantities[start:end]),
+                        position,
+                        result,
+                    )
+                    if position is not None and position[1] > 0:
+                        result.holdings[key] = self._holding(position)
+
+            # 이번 배치에 거래가 없는 기존 보유 종목은 그대로 유지
+            for key, data in initial_holdings.items():
+                if key not in calculated_keys:
+                    position = self._initial_position(data)
+                    if position[1] > 0:
+                        result.holdings[key] = self._holding(position)
+
+            self.logger.info(
+                f"배치 수익률 계산 완료: 총 {total}개 거래 내역, 보유 종목 {len(result.holdings)}개"
+            )
+            return result
+
+        except Exception as e:
+            self.logger.error(f"배치 수익률 계산 중 에러 발생: {e}")
+            raise e
+
+    def calculate_profit_loss_with_holdings(
+        self,
+        trading_histories: List[TradingHistories],
+        initial_holdings: Optional[Dict[int, Dict]] = None,
+        coin_symbols: Optional[Dict[int, str]] = None,
+    ) -> Tuple[List[TradingHistories], Dict[int, Dict]]:
+        """
+        TradingProfitCalculator.calculate_profit_loss_with_holdings와 같은 형태의 단일 사용자 계산
+        (TradingProfitService의 계산기 백엔드로 사용)
+        """
+        sorted_histories = sorted(trading_histories, key=lambda x: x.trade_time)
+        symbols: Dict[int, str] = dict(coin_symbols or {})
+        for coin_id, data in (initial_holdings or {}).items():
+            if data.get("symbol"):
+                symbols[coin_id] = data["symbol"]
+
+        result = self.calculate(
+            [0] * len(sorted_histories),
+            [history.coin_id for history in sorted_histories],
+            [history.trade_time for history in sorted_histories],
+            [history.trade_type for history in sorted_histories],
+            [history.price for history in sorted_histories],
+            [history.quantity for history in sorted_histories],
+            initial_holdings={
+                (0, coin_id): data for coin_id, data in (initial_holdings or {}).items()
+            },
+        )
+
+        for index, history in enumerate(sorted_histories):
+            history.profit_loss_rate = result.profit_loss_rate[index]
+            history.avg_buy_price = result.avg_buy_price[index]
+
+        final_holdings = {
+            coin_id: {"symbol": symbols.get(coin_id, "UNKNOWN"), **data}
+            for (_, coin_id), data in result.holdings.items()
+        }
+        return sorted_histories, final_holdings
+
+    def calculate_from_json_data(self, json_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        TradingProfitCalculator.calculate_from_json_data와 같은 형식으로 계산 (테스트용)
+        """
+        if not json_data.get("success") or "data" not in json_data:
+            raise ValueError("유효하지 않은 JSON 데이터 형식입니다")
+
+        items = json_data["data"]
+        result = self.calculate(
+            [item.get("userId") for item in items],
+            [item["coinId"] for item in items],
+            [item["tradeTime"] for item in items],
+            [item["tradeType"] for item in items],
+            [item["price"] for item in items],
+            [item["quantity"] for item in items],
+        )
+        for index, item in enumerate(items):
+            item["profitLossRate"] = result.profit_loss_rate[index]
+            item["avgBuyPrice"] = result.avg_buy_price[index]
+        return items
+
+    @staticmethod
+    def _replay_group(
+        indices: np.ndarray,
+        sides: np.ndarray,
+        prices: np.ndarray,
+        quantities: np.ndarray,
+        cum_buy_cost: np.ndarray,
+        cum_buy_quantity: np.ndarray,
+        position: Optional[List[int]],
+        result: BatchProfitResult,
+    ) -> Optional[List[int]]:
+        """
+        (user_id, coin_id) 그룹 하나를 계산
+
+        position: [평단(AVG_SCALE) | None, 보유량(VALUE_SCALE), 원가(AVG_SCALE × VALUE_SCALE)]
+            또는 None (미보유). 평단은 직전 매도 이후 매수가 있었으면 None입니다.
+        매수 구간은 누적합 차이로 원가에 한 번에 더하고 매도 시점에서만 평단을 계산합니다.
+        """
+        sell_positions = np.flatnonzero(sides == SELL).tolist()
+        previous_cost, previous_quantity, previous_index = 0, 0, -1
+
+        for sell_index in sell_positions + [len(sides)]:
+            # 직전 매도 이후 ~ 이번 매도 전까지의 매수 구간
+            last_buy = sell_index - 1
+            if last_buy > previous_index:
+                segment_cost = cum_buy_cost[last_buy] - previous_cost
+                segment_quantity = cum_buy_quantity[last_buy] - previous_quantity
+                previous_cost = cum_buy_cost[last_buy]
+                previous_quantity = cum_buy_quantity[last_buy]
+
+                if position is None:
+                    position = [None, 0, 0]
+                position = [
+                    None,
+                    position[1] + segment_quantity,
+                    position[2] + segment_cost * PRICE_TO_AVG,
+                ]
+
+            if sell_index == len(sides):
+                break
+
+            previous_index = sell_index
+            sell_quantity = quantities[sell_index]
+            if position is None or position[1] <= 0 or position[1] < sell_quantity:
+                # 보유량이 없거나 매도 수량보다 적은 경우
+                continue
+
+            avg = position[0]
+            if avg is None:
+                avg = avg_from_cost(position[2], position[1])
+            output_index = int(indices[sell_index])
+            result.profit_loss_rate[output_index] = hundredths_to_float(
+                profit_loss_hundredths(prices[sell_index], avg)
+            )
+            result.avg_buy_price[output_index] = avg_to_float(avg)
+
+            remaining = position[1] - sell_quantity
+            position = None if remaining <= 0 else [avg, remaining, avg * remaining]
+
+        return position
+
+    @staticmethod
+    def _initial_position(data: Optional[Dict]) -> Optional[List[int]]:
+        if not data:
+            return None
+        avg = avg_to_fixed(data["avg_buy_price"])
+        quantity = to_fixed(data["remaining_quantity"])
+        return [avg, quantity, avg * quantity]
+
+    @staticmethod
+    def _holding(position: List[int]) -> Dict[str, Decimal]:
+        avg = position[0]
+        if avg is None:
+            avg = avg_from_cost(position[2], position[1])
+        return {
+            "avg_buy_price": avg_to_decimal(avg),
+            "remaining_quantity": value_to_decimal(position[1]),
+        }
@@ -0,0 +1,267 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from service.upbit_service import DAY_CANDLES_PAGE_LIMIT
+from utils.concurrent_fetcher import call_with_retry, fetch_concurrently
+
+# 캔들 응답 필드 중 coin_prices_day에 그대로 저장하는 칼럼
+CANDLE_VALUE_FIELDS = (
+    "opening_price",
+    "high_price",
+    "low_price",
+    "trade_price",
+    "timestamp",
+    "candle_acc_trade_price",
+    "candle_acc_trade_volume",
+    "prev_closing_price",
+    "change_price",
+    "change_rate",
+)
+
+
+def parse_candle_time(value: str) -> datetime:
+    """캔들 시각 문자열(2024-01-01T00:00:00) 파싱"""
+    return datetime.fromisoformat(value.rstrip("Z"))
+
+
+def to_candle_row(coin_id: int, candle: Dict[str, Any]) -> Dict[str, Any]:
+    """/v1/candles/days 응답 1건을 coin_prices_day 행으로 변환"""
+    return {
+        "coin_id": coin_id,
+        "market_code": candle["market"],
+        "candle_date_time_utc": parse_candle_time(candle["candle_date_time_utc"]),
+        "candle_date_time_kst": parse_candle_time(candle["candle_date_time_kst"]),
+        **{field: candle[field] for field in CANDLE_VALUE_FIELDS},
+        "converted_trade_price": candle.get("converted_trade_price"),
+    }
+
+
+class CandleIngestionService:
+    """
+    활성 코인 일봉 수집
+
+    마켓별로 최신 캔들부터 200개씩 과거로 페이지를 넘기며 조회하고,
+    이미 저장된 마지막 캔들에 도달하면 멈춥니다 (처음에는 상장일까지 전체 백필, 이후에는 증분).
+    마지막으로 저장된 캔들은 장중에 값이 바뀌므로 다시 받아 덮어씁니다.
+    마켓들은 bounded worker pool에서 동시에 처리되며, 요청 속도는 UpbitHttpClient의
+    시세 API(candle 그룹) rate limiter가 전체 worker에 걸쳐 제한합니다.
+    """
+
+    def __init__(
+        self, max_workers: Optional[int] = None, page_size: int = DAY_CANDLES_PAGE_LIMIT
+    ):
+        self.logger = logging.getLogger(__name__)
+        if max_workers is None:
+            max_workers = int(os.getenv("CANDLE_INGESTION_WORKERS", "4"))
+        self.max_workers = max(1, max_workers)
+        self.page_size = page_size
+        self.max_retries = int(os.getenv("CANDLE_INGESTION_MAX_RETRIES", "3"))
+        self._coin_prices_day_repository = None
+        self._coin_catalog = None
+        self._upbit_service = None
+        self._price_history_store = None
+        self._lock = threading.Lock()
+        self._running = False
+        self.last_summary: Optional[Dict[str, Any]] = None
+
+    @property
+    def coin_prices_day_repository(self):
+        if self._coin_prices_day_repository is None:
+            from repository.coin_prices_day_repository import CoinPricesDayRepository
+
+            self._coin_prices_day_repository = CoinPricesDayRepository()
+        return self._coin_prices_day_repository
+
+    @property
+    def coin_catalog(self):
+        if self._coin_catalog is None:
+            from dependencies import get_coin_catalog
+
+            self._coin_catalog = get_coin_catalog()
+        return self._coin_catalog
+
+    @property
+    def upbit_service(self):
+        if self._upbit_service is None:
+            from dependencies import get_upbit_service
+
+            self._upbit_service = get_upbit_service()
+        return self._upbit_service
+
+    @property
+    def price_history_store(self):
+        if self._price_history_store is None:
+            from service.price_history_store import PriceHistoryStore
+
+            # 가격 저장소 writer (API 조회용 readonly 저장소와 별도 인스턴스)
+            self._price_history_store = PriceHistoryStore()
+        return self._price_history_store
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def ingest_daily_candles(
+        self,
+        market_codes: Optional[List[str]] = None,
+        max_pages: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        활성 코인 일봉 수집
+
+        Args:
+            market_codes: 수집할 마켓 코드 목록 (없으면 활성 코인 전체)
+            max_pages: 마켓별 최대 조회 페이지 수 (없으면 상장일 또는 저장된 마지막 캔들까지)
+
+        Returns:
+            실행 요약 (마켓 수, 저장 행 수, 요청 수, 실패 마켓, 소요 시간)
+        """
+        if not self._try_start():
+            raise ValueError("일봉 수집이 이미 진행 중입니다")
+        return self._ingest(market_codes, max_pages)
+
+    def _try_start(self) -> bool:
+        with self._lock:
+            if self._running:
+                return False
+            self._running = True
+            return True
+
+    def _ingest(
+        self, market_codes: Optional[List[str]], max_pages: Optional[int]
+    ) -> Dict[str, Any]:
+        try:
+            started_at = time.perf_counter()
+
+            coins = [coin for coin in self.coin_catalog.all() if coin.is_active]
+            if market_codes is not None:
+                wanted = set(market_codes)
+                coins = [coin for coin in coins if coin.market_code in wanted]
+
+            latest_times = self.coin_prices_day_repository.find_latest_candle_times()
+
+            outcomes = fetch_concurrently(
+                coins,
+                lambda coin: self._ingest_market(coin, latest_times.get(coin.id), max_pages),
+                max_workers=self.max_workers,
+                # 페이지 단위로 재시도하므로 마켓 단위 재시도는 하지 않음
+                max_retries=0,
+            )
+
+            summary = {
+                "market_count": len(coins),
+                "backfill_count": sum(1 for coin in coins if coin.id not in latest_times),
+                "written_count": sum(outcome["written_count"] for outcome in outcomes),
+                "request_count": sum(outcome["request_count"] for outcome in outcomes),
+                "failed": [
+                    {"market_code": outcome["market_code"], "error": outcome["error"]}
+                    for outcome in outcomes
+                    if outcome.get("error")
+                ],
+                "elapsed": round(time.perf_counter() - started_at, 3),
+            }
+            if summary["written_count"]:
+                summary["price_store"] = self._sync_price_store()
+            self.last_summary = summary
+
+            self.logger.info(
+                f"일봉 수집 완료: 마켓 {summary['market_count']}개 (백필 {summary['backfill_count']}개), "
+                f"저장 {summary['written_count']}개, 요청 {summary['request_count']}회, "
+                f"실패 {len(summary['failed'])}개, {summary['elapsed']}초"
+            )
+            return summary
+
+        except Exception as e:
+            self.logger.error(f"일봉 수집 중 에러 발생: {e}")
+            raise e
+        finally:
+            with self._lock:
+                self._running = False
+
+    def _ingest_market(
+        self, coin, latest_time: Optional[datetime], max_pages: Optional[int]
+    ) -> Dict[str, Any]:
+        """마켓 1개 수집 (실패해도 다른 마켓은 계속 진행하도록 결과에 에러만 기록)"""
+        outcome = {"market_code": coin.market_code, "written_count": 0, "request_count": 0}
+        try:
+            rows = []
+            to = None
+            while max_pages is None or outcome["request_count"] < max_pages:
+                candles = call_with_retry(
+                    lambda: self.upbit_service.fetch_day_candles(
+                        coin.market_code, to=to, count=self.page_size
+                    ),
+                    max_retries=self.max_retries,
+                )
+                outcome["request_count"] += 1
+                if not candles:
+                    break
+
+                reached_stored = False
+                for candle in candles:
+                    row = to_candle_row(coin.id, candle)
+                    if latest_time is not None and row["candle_date_time_utc"] < latest_time:
+                        reached_stored = True
+                        break
+                    rows.append(row)
+
+                if reached_stored or len(candles) < self.page_size:
+                    break
+                # to는 미포함이므로 이번 페이지의 가장 오래된 캔들 시각부터 이어서 조회
+                to = parse_candle_time(candles[-1]["candle_date_time_utc"])
+
+            outcome["written_count"] = self.coin_prices_day_repository.upsert_candles(rows)
+        except Exception as e:
+            self.logger.error(f"일봉 수집 실패: market={coin.market_code}, error={e}")
+            outcome["error"] = str(e)
+        return outcome
+
+    def _sync_price_store(self) -> Optional[Dict[str, Any]]:
+        """새로 저장된 일봉을 가격 저장소에 반영 (실패해도 수집 결과는 유지)"""
+        try:
+            return self.price_history_store.sync_from_db()
+        except Exception as e:
+            self.logger.error(f"가격 저장소 동기화 실패: {e}")
+            return {"error": str(e)}
+
+    def bootstrap_price_store_in_background(self):
+        """가격 저장소가 비어 있으면 (새 배포) 백그라운드에서 coin_prices_day 전체를 읽어 채움"""
+
+        def run():
+            try:
+                result = self.price_history_store.sync_if_empty()
+                if result is not None:
+                    self.logger.info(f"가격 저장소 초기 동기화 완료: {result['row_count']}개")
+            except Exception as e:
+                self.logger.error(f"가격 저장소 초기 동기화 실패: {e}")
+
+        threading.Thread(target=run, name="price-store-bootstrap", daemon=True).start()
+
+    def start_in_background(
+        self,
+        market_codes: Optional[List[str]] = None,
+        max_pages: Optional[int] = None,
+    ) -> bool:
+        """
+        일봉 수집을 백그라운드 스레드에서 시작 (관리자 API용)
+
+        Returns:
+            새로 시작했으면 True, 이미 진행 중이면 False
+        """
+        if not self._try_start():
+            return False
+
+        def run():
+            try:
+                self._ingest(market_codes, max_pages)
+            except Exception as e:
+                self.last_summary = {"error": str(e)}
+
+        threading.Thread(target=run, name="candle-ingestion", daemon=True).start()
+        return True
+
+    def get_status(self) -> Dict[str, Any]:
+        return {"running": self._running, "last_summary": self.last_summary}
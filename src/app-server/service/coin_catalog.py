@@ -0,0 +1,166 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class CatalogCoin:
+    """카탈로그에 보관하는 코인 정보 (세션과 무관한 읽기 전용 스냅샷)"""
+
+    id: int
+    symbol: str
+    quote_currency: str
+    market_code: Optional[str]
+    korean_name: Optional[str]
+    english_name: Optional[str]
+    img_url: Optional[str]
+    exchange: Optional[str]
+    is_active: Optional[bool]
+
+    @classmethod
+    def from_model(cls, coin) -> "CatalogCoin":
+        return cls(
+            id=coin.id,
+            symbol=coin.symbol,
+            quote_currency=coin.quote_currency,
+            market_code=coin.market_code,
+            korean_name=coin.korean_name,
+            english_name=coin.english_name,
+            img_url=coin.img_url,
+            exchange=coin.exchange,
+            is_active=coin.is_active,
+        )
+
+
+@dataclass(frozen=True)
+class _CatalogIndex:
+    by_id: Dict[int, CatalogCoin]
+    by_market_code: Dict[str, CatalogCoin]
+    by_symbol: Dict[Tuple[str, str], CatalogCoin]
+    loaded_at: float
+
+
+class CoinCatalog:
+    """
+    프로세스 전역 코인 목록 캐시
+
+    coins 테이블을 한 번 읽어 id, market_code, (symbol, quote_currency) 인덱스를 만들고
+    조회는 딕셔너리 조회 한 번으로 끝냅니다.
+    TTL이 지나면 다음 조회 시 다시 읽고, 없는 코인을 조회하면 최소 간격을 두고 한 번 다시 읽습니다 (신규 상장).
+    인덱스는 통째로 교체하므로 조회 측은 lock 없이 읽습니다.
+    """
+
+    def __init__(
+        self,
+        coin_repository=None,
+        ttl_seconds: Optional[float] = None,
+        miss_refresh_interval: Optional[float] = None,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self._coin_repository = coin_repository
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("COIN_CATALOG_TTL_SECONDS", "600"))
+        if miss_refresh_interval is None:
+            miss_refresh_interval = float(
+                os.getenv("COIN_CATALOG_MISS_REFRESH_SECONDS", "30")
+            )
+        self.ttl_seconds = ttl_seconds
+        self.miss_refresh_interval = miss_refresh_interval
+        self._index: Optional[_CatalogIndex] = None
+        self._lock = threading.Lock()
+
+    @property
+    def coin_repository(self):
+        if self._coin_repository is None:
+            from dependencies import get_coin_repository
+
+            self._coin_repository = get_coin_repository()
+        return self._coin_repository
+
+    def load(self) -> int:
+        """
+        coins 테이블을 다시 읽어 인덱스 교체
+
+        Returns:
+            로드된 코인 수
+        """
+        with self._lock:
+            return self._load()
+
+    def _load(self) -> int:
+        # 호출 측에서 self._lock을 잡은 상태여야 함
+        coins = [CatalogCoin.from_model(coin) for coin in self.coin_repository.get_all_coins()]
+
+        by_market_code = {}
+        by_symbol = {}
+        for coin in coins:
+            if coin.market_code:
+                by_market_code[coin.market_code] = coin
+            # 같은 (symbol, quote_currency)가 여럿이면 먼저 읽힌 코인을 사용 (기존 선형 탐색과 동일)
+            by_symbol.setdefault((coin.symbol, coin.quote_currency), coin)
+
+        self._index = _CatalogIndex(
+            by_id={coin.id: coin for coin in coins},
+            by_market_code=by_market_code,
+            by_symbol=by_symbol,
+            loaded_at=time.monotonic(),
+        )
+        self.logger.info(f"코인 카탈로그 로드 완료: {len(coins)}개")
+        return len(coins)
+
+    def invalidate(self):
+        """다음 조회 시 다시 읽도록 캐시 무효화"""
+        with self._lock:
+            self._index = None
+
+    def _current(self) -> _CatalogIndex:
+        index = self._index
+        if index is not None and time.monotonic() - index.loaded_at < self.ttl_seconds:
+            return index
+
+        with self._lock:
+            # 다른 스레드가 먼저 다시 읽었으면 그 결과 사용
+            index = self._index
+            if index is None or time.monotonic() - index.loaded_at >= self.ttl_seconds:
+                self._load()
+            return self._index
+
+    def _refresh_on_miss(self) -> _CatalogIndex:
+        """조회 실패 시 마지막 로드 후 miss_refresh_interval이 지났으면 다시 읽기"""
+        with self._lock:
+            index = self._index
+            if index is None or time.monotonic() - index.loaded_at >= self.miss_refresh_interval:
+                self._load()
+            return self._index
+
+    def _lookup(self, index_name: str, key) -> Optional[CatalogCoin]:
+        coin = getattr(self._current(), index_name).get(key)
+        if coin is None:
+            coin = getattr(self._refresh_on_miss(), index_name).get(key)
+        return coin
+
+    def get_by_id(self, coin_id: int) -> Optional[CatalogCoin]:
+        return self._lookup("by_id", coin_id)
+
+    def get_by_market_code(self, market_code: str) -> Optional[CatalogCoin]:
+        """market_code(KRW-BTC)로 코인 조회"""
+        return self._lookup("by_market_code", market_code)
+
+    def get_by_symbol(self, symbol: str, quote_currency: str) -> Optional[CatalogCoin]:
+        """(symbol, quote_currency)로 코인 조회"""
+        return self._lookup("by_symbol", (symbol, quote_currency))
+
+    def get_symbols(self, coin_ids: Iterable[int]) -> Dict[int, str]:
+        """coin_id → symbol 딕셔너리 (카탈로그에 없는 coin_id는 제외)"""
+        symbols = {}
+        for coin_id in coin_ids:
+            coin = self.get_by_id(coin_id)
+            if coin is not None:
+                symbols[coin_id] = coin.symbol
+        return symbols
+
+    def all(self) -> List[CatalogCoin]:
+        return list(self._current().by_id.values())
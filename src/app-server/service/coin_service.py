@@ -34,6 +34,16 @@ class CoinService:
 
             saved_coin_list = self.coin_repository.save_coin_list(coin_list)
 
+            # 추가/변경/비활성화된 코인이 있으면 카탈로그 캐시 갱신
+            if (
+                saved_coin_list["new"]
+                or saved_coin_list["updated"]
+                or saved_coin_list["deactivated"]
+            ):
+                from dependencies import get_coin_catalog
+
+                get_coin_catalog().load()
+
             return saved_coin_list
         except Exception as e:
             self.logger.error(f"코인 목록 저장 중 에러 발생: {e}")
@@ -107,36 +107,68 @@ class ExchangeCredentialsService:
             if not credentials:
                 return None
 
-            # 복호화된 키를 포함한 응답 생성
-            decrypted_access_key = self.credentials_repository.decrypt_key(
-                str(credentials.encrypted_access_key)  # str() 변환 추가
-            )
-            decrypted_secret_key = self.credentials_repository.decrypt_key(
-                str(credentials.encrypted_secret_key)  # str() 변환 추가
-            )
+            return self._to_decrypted_response(credentials)
+
+        except Exception as e:
+            self.logger.error(f"거래소 자격증명 조회 실패: {e}")
+            raise
 
-            return ExchangeCredentialsResponse(
-                user_id=str(credentials.user_id),
-                exchange_provider=DTOExchangeProvider(credentials.exchange_provider),
-                provider_name=credentials.provider_name,
-                created_at=(
-                    credentials.created_at.isoformat()
-                    if credentials.created_at is not None  # None 체크 수정
-                    else "2024-01-01T00:00:00"
-                ),
-                last_updated_at=(
-                    credentials.last_updated_at.isoformat()
-                    if credentials.last_updated_at is not None  # None 체크 수정
-                    else None
-                ),
-                access_key=decrypted_access_key,  # 복호화된 키
-                secret_key=decrypted_secret_key,  # 복호화된 키
+    def get_all_decrypted_credentials(
+        self, exchange_provider: DTOExchangeProvider
+    ) -> List[ExchangeCredentialsResponse]:
+        """
+        거래소의 모든 사용자 자격증명 조회 (복호화된 키 포함, 전체 잔고 동기화용)
+        복호화에 실패한 자격증명은 로그만 남기고 제외합니다.
+        """
+        try:
+            model_provider = ModelExchangeProvider(exchange_provider)
+            credentials_list = self.credentials_repository.find_all_by_provider(
+                model_provider
             )
 
+            responses = []
+            for credentials in credentials_list:
+                try:
+                    responses.append(self._to_decrypted_response(credentials))
+                except Exception as e:
+                    self.logger.error(
+                        f"거래소 자격증명 복호화 실패: user_id={credentials.user_id}, error={e}"
+                    )
+            return responses
+
         except Exception as e:
-            self.logger.error(f"거래소 자격증명 조회 실패: {e}")
+            self.logger.error(f"거래소 전체 자격증명 조회 실패: {e}")
             raise
 
+    def _to_decrypted_response(
+        self, credentials: ExchangeCredentials
+    ) -> ExchangeCredentialsResponse:
+        """복호화된 키를 포함한 응답 생성"""
+        decrypted_access_key = self.credentials_repository.decrypt_key(
+            str(credentials.encrypted_access_key)  # str() 변환 추가
+        )
+        decrypted_secret_key = self.credentials_repository.decrypt_key(
+            str(credentials.encrypted_secret_key)  # str() 변환 추가
+        )
+
+        return ExchangeCredentialsResponse(
+            user_id=str(credentials.user_id),
+            exchange_provider=DTOExchangeProvider(credentials.exchange_provider),
+            provider_name=credentials.provider_name,
+            created_at=(
+                credentials.created_at.isoformat()
+                if credentials.created_at is not None  # None 체크 수정
+                else "2024-01-01T00:00:00"
+            ),
+            last_updated_at=(
+                credentials.last_updated_at.isoformat()
+                if credentials.last_updated_at is not None  # None 체크 수정
+                else None
+            ),
+            access_key=decrypted_access_key,  # 복호화된 키
+            secret_key=decrypted_secret_key,  # 복호화된 키
+        )
+
     def get_all_credentials(self, user_id: str) -> List[ExchangeCredentialsResponse]:
         """사용자의 모든 거래소 자격증명 조회"""
         try:
@@ -0,0 +1,302 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional, Tuple
+import numpy as np
+
+# trade_time은 KST 기준 naive TIMESTAMP로 저장됨 (Upbit created_at의 현지 시각)
+TRADE_TIME_UTC_OFFSET = timedelta(hours=9)
+
+
+@dataclass(frozen=True)
+class PositionSteps:
+    """
+    거래내역에서 만든 코인별 일별 보유 상태 (일 마감 기준 step function)
+
+    quantity/cost_basis는 (코인, first_day부터 last_day까지의 일수) 행렬이며
+    last_day 이후에는 마지막 열 값이 그대로 유지됩니다.
+    """
+
+    coin_ids: np.ndarray
+    first_day: int
+    quantity: np.ndarray
+    cost_basis: np.ndarray
+
+    @property
+    def last_day(self) -> int:
+        return self.first_day + self.quantity.shape[1] - 1
+
+    def window(self, start_ordinal: int, end_ordinal: int) -> Tuple[np.ndarray, np.ndarray]:
+        """[start, end] 기간의 (보유 수량, 원가) 행렬 (첫 거래 이전은 0, 마지막 거래 이후는 마지막 상태)"""
+        columns = np.arange(start_ordinal, end_ordinal + 1) - self.first_day
+        before_first = columns < 0
+        columns = np.clip(columns, 0, self.quantity.shape[1] - 1)
+        quantity = self.quantity[:, columns]
+        cost_basis = self.cost_basis[:, columns]
+        quantity[:, before_first] = 0
+        cost_basis[:, before_first] = 0
+        return quantity, cost_basis
+
+
+def trade_day_ordinal(trade_time: datetime) -> int:
+    """체결 시각이 속한 UTC 일봉 날짜의 ordinal (Upbit 일봉은 UTC 0시(KST 9시) 기준)"""
+    if trade_time.tzinfo is not None:
+        return trade_time.astimezone(timezone.utc).toordinal()
+    return (trade_time - TRADE_TIME_UTC_OFFSET).toordinal()
+
+
+def build_position_steps(trades: Iterable[Any]) -> Optional[PositionSteps]:
+    """
+    거래내역을 코인별 일 마감 보유 수량/원가 step function으로 변환
+
+    평균 단가 방식은 TradingProfitCalculator와 같습니다
+    (매수는 가중 평균, 매도는 평단 유지, 보유량보다 많은 매도는 무시).
+    거래마다 체결 후 상태를 한 번 계산한 뒤, 날짜별 마지막 상태를 행렬에 놓고
+    열 방향으로 앞 값을 채워(forward fill) 일별 벡터를 만듭니다.
+
+    Args:
+        trades: trade_time 순으로 정렬된 (coin_id, trade_type, price, quantity, trade_time) 행
+
+    Returns:
+        PositionSteps, 거래내역이 없으면 None
+    """
+    holdings: Dict[int, list] = {}
+    coin_rows: Dict[int, int] = {}
+    rows, days, quantities, costs = [], [], [], []
+
+    for trade in trades:
+        coin_id = trade.coin_id
+        price = Decimal(str(trade.price))
+        quantity = Decimal(str(trade.quantity))
+        avg_price, held = holdings.get(coin_id, (Decimal(0), Decimal(0)))
+
+        if trade.trade_type == 0:  # 매수
+            total_quantity = held + quantity
+            if total_quantity > 0:
+                avg_price = (avg_price * held + price * quantity) / total_quantity
+            held = total_quantity
+        elif trade.trade_type == 1 and 0 < held and quantity <= held:  # 매도
+            held -= quantity
+            if held <= 0:
+                avg_price, held = Decimal(0), Decimal(0)
+        holdings[coin_id] = (avg_price, held)
+
+        rows.append(coin_rows.setdefault(coin_id, len(coin_rows)))
+        days.append(trade_day_ordinal(trade.trade_time))
+        quantities.append(float(held))
+        costs.append(float(avg_price * held))
+
+    if not rows:
+        return None
+
+    rows = np.array(rows, dtype=np.int64)
+    days = np.array(days, dtype=np.int64)
+    first_day = int(days.min())
+    columns = days - first_day
+    shape = (len(coin_rows), int(columns.max()) + 1)
+
+    # 같은 (코인, 날짜)의 거래 중 마지막 거래만 사용
+    keys = rows * shape[1] + columns
+    _, reversed_first = np.unique(keys[::-1], return_index=True)
+    last = len(keys) - 1 - reversed_first
+
+    source = np.full(shape, -1, dtype=np.int64)
+    source[rows[last], columns[last]] = last
+    # 거래가 없는 날은 직전 거래일 상태를 사용 (이전 거래가 없으면 -1)
+    filled = np.where(source >= 0, np.arange(shape[1]), -1)
+    np.maximum.accumulate(filled, axis=1, out=filled)
+    trade_index = np.where(
+        filled >= 0, np.take_along_axis(source, np.maximum(filled, 0), axis=1), -1
+    )
+
+    quantity = np.where(trade_index >= 0, np.asarray(quantities)[trade_index], 0.0)
+    cost_basis = np.where(trade_index >= 0, np.asarray(costs)[trade_index], 0.0)
+
+    coin_ids = np.empty(len(coin_rows), dtype=np.int64)
+    coin_ids[list(coin_rows.values())] = list(coin_rows.keys())
+    return PositionSteps(coin_ids, first_day, quantity, cost_basis)
+
+
+class PortfolioSeriesService:
+    """
+    사용자 포트폴리오 일별 평가액 시계열
+
+    거래내역에서 만든 코인별 보유 수량/원가 행렬(PositionSteps)에
+    가격 저장소의 일봉 종가 행렬을 한 번에 곱해 일별 평가액, 원가, 미실현 손익을 계산합니다.
+    coin_id는 마켓(KRW-BTC, BTC-ETH, USDT-XRP 등)이고 가격과 원가는 그 마켓의 기준 통화 단위이므로
+    시계열은 기준 통화(quote_currency)별로 따로 합산합니다.
+    PositionSteps는 거래내역에만 의존하므로 (user_id, exchange_code, last_trade_id)별로 캐시하고,
+    종가는 매일 바뀌므로 요청마다 가격 저장소에서 다시 읽습니다.
+    """
+
+    def __init__(self, cache_size: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        if cache_size is None:
+            cache_size = int(os.getenv("PORTFOLIO_SERIES_CACHE_SIZE", "256"))
+        self.cache_size = max(1, cache_size)
+        self._cache: "OrderedDict[Tuple[str, int, int], Optional[PositionSteps]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._trading_histories_repository = None
+        self._price_history_store = None
+        self._coin_catalog = None
+
+    @property
+    def trading_histories_repository(self):
+        if self._trading_histories_repository is None:
+            from repository.trading_histories_repository import TradingHistoriesRepository
+
+            self._trading_histories_repository = TradingHistoriesRepository()
+        return self._trading_histories_repository
+
+    @property
+    def price_history_store(self):
+        if self._price_history_store is None:
+            from dependencies import get_price_history_store
+
+            self._price_history_store = get_price_history_store()
+        return self._price_history_store
+
+    @property
+    def coin_catalog(self):
+        if self._coin_catalog is None:
+            from dependencies import get_coin_catalog
+
+            self._coin_catalog = get_coin_catalog()
+        return self._coin_catalog
+
+    def get_series(
+        self,
+        user_id: str,
+        exchange_code: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        """
+        일별 포트폴리오 시계열 조회
+
+        Args:
+            user_id: 사용자 UUID
+            exchange_code: 거래소 코드
+            start: 시작일 (UTC 일봉 기준, 없으면 첫 거래일)
+            end: 종료일 (포함, 없으면 오늘 UTC)
+
+        Returns:
+            dates와 기준 통화별 {"value", "cost_basis", "unrealized_profit_loss"} 일별 목록(currencies),
+            종가가 없어 평가에서 제외된 보유 코인 id 목록(unpriced_coin_ids)
+        """
+        if start is not None and end is not None and start > end:
+            raise ValueError("시작일은 종료일보다 늦을 수 없습니다")
+
+        last_trade_id = self.trading_histories_repository.find_last_trade_id(
+            user_id, exchange_code
+        )
+        steps, cached = self._get_position_steps(user_id, exchange_code, last_trade_id)
+
+        result = {
+            "user_id": user_id,
+            "exchange_code": exchange_code,
+            "last_trade_id": last_trade_id,
+            "cached": cached,
+            "dates": [],
+            "currencies": {},
+            "unpriced_coin_ids": [],
+        }
+        if steps is None:
+            return result
+
+        start_ordinal = start.toordinal() if start else steps.first_day
+        end_ordinal = end.toordinal() if end else datetime.now(timezone.utc).toordinal()
+        if start_ordinal > end_ordinal:
+            return result
+
+        quantity, cost_basis = steps.window(start_ordinal, end_ordinal)
+        dates, closes = self.price_history_store.matrix(
+            steps.coin_ids.tolist(),
+            date.fromordinal(start_ordinal),
+            date.fromordinal(end_ordinal + 1),
+        )
+        closes = _forward_fill(closes)
+
+        held = quantity > 0
+        priced = held & ~np.isnan(closes)
+        values = np.where(priced, quantity * np.nan_to_num(closes), 0.0)
+        # 종가가 없는 코인은 평가액과 손익 모두에서 제외 (원가 합계에는 포함)
+        priced_costs = np.where(priced, cost_basis, 0.0)
+
+        quotes = np.array([self._quote_currency(coin_id) for coin_id in steps.coin_ids.tolist()])
+        currencies = {}
+        for quote in sorted(set(quotes.tolist())):
+            rows = quotes == quote
+            value = values[rows].sum(axis=0)
+            currencies[quote] = {
+                "value": value.tolist(),
+                "cost_basis": cost_basis[rows].sum(axis=0).tolist(),
+                "unrealized_profit_loss": (value - priced_costs[rows].sum(axis=0)).tolist(),
+            }
+
+        result.update(
+            {
+                "dates": [str(day) for day in dates],
+                "currencies": currencies,
+                "unpriced_coin_ids": steps.coin_ids[(held & ~priced).any(axis=1)].tolist(),
+            }
+        )
+        return result
+
+    def _quote_currency(self, coin_id: int) -> str:
+        coin = self.coin_catalog.get_by_id(coin_id)
+        return coin.quote_currency if coin is not None else "UNKNOWN"
+
+    def _get_position_steps(
+        self, user_id: str, exchange_code: int, last_trade_id: Optional[int]
+    ) -> Tuple[Optional[PositionSteps], bool]:
+        if last_trade_id is None:
+            return None, False
+
+        key = (str(user_id), exchange_code, last_trade_id)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key], True
+
+        trades = self.trading_histories_repository.find_position_columns(
+            user_id, exchange_code
+        )
+        steps = build_position_steps(trades)
+
+        with self._lock:
+            # 같은 사용자/거래소의 이전 last_trade_id 결과는 더 쓰이지 않으므로 제거
+            for stale in [k for k in self._cache if k[:2] == key[:2]]:
+                del self._cache[stale]
+            self._cache[key] = steps
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        self.logger.info(
+            f"포트폴리오 보유 상태 계산: user_id={user_id}, exchange_code={exchange_code}, "
+            f"거래 {len(trades)}개, last_trade_id={last_trade_id}"
+        )
+        return steps, False
+
+    def invalidate(self, user_id: Optional[str] = None):
+        """캐시 비우기 (user_id를 지정하면 해당 사용자만)"""
+        with self._lock:
+            if user_id is None:
+                self._cache.clear()
+                return
+            for key in [k for k in self._cache if k[0] == str(user_id)]:
+                del self._cache[key]
+
+
+def _forward_fill(values: np.ndarray) -> np.ndarray:
+    """행마다 NaN을 직전 값으로 채움 (아직 수집되지 않은 당일 종가 등)"""
+    valid = ~np.isnan(values)
+    index = np.where(valid, np.arange(values.shape[1]), -1)
+    np.maximum.accumulate(index, axis=1, out=index)
+    filled = np.take_along_axis(values, np.maximum(index, 0), axis=1)
+    filled[index < 0] = np.nan
+    return filled
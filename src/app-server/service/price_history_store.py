@@ -0,0 +1,439 @@
+import fcntl
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+import numpy as np
+
+FIELDS = ("close", "high", "low", "volume")
+
+# 열(day) 인덱스 0에 해당하는 날짜 (Upbit 원화 마켓 이전)
+BASE_DATE = date(2017, 1, 1)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# 용량이 부족할 때 늘리는 단위
+DAY_CAPACITY_STEP = 366
+COIN_CAPACITY_STEP = 64
+
+META_FILE = "meta.json"
+LOCK_FILE = ".writer.lock"
+
+# readonly 저장소가 meta.json을 읽은 직후 writer가 이전 버전 파일을 지운 경우 재시도 횟수
+_OPEN_RETRIES = 3
+
+
+def _to_ordinal(value) -> int:
+    if isinstance(value, (date, datetime)):
+        return value.toordinal()
+    return int(value)
+
+
+class PriceHistoryStore:
+    """
+    일봉 가격 열(column) 저장소
+
+    필드(close/high/low/volume)마다 (코인 행, 날짜 열) float64 2차원 배열 하나를 .npy 파일로 저장하고
+    memory-map으로 열어 여러 worker 프로세스가 같은 페이지를 공유합니다.
+    코인 한 개의 가격은 한 행에 날짜순으로 연속 저장되므로 특정 날짜 조회는 인덱스 계산 한 번,
+    기간 조회는 배열 slice(복사 없음)입니다. 값이 없는 날은 NaN입니다.
+
+    조회만 하는 프로세스(API)는 readonly=True로 엽니다. 쓰기(readonly=False)는 일봉 수집 작업에서만 하며,
+    API 백그라운드 수집과 CLI처럼 writer가 여럿이어도 디렉터리의 파일 lock으로 한 번에 하나만 쓰고
+    쓰기 전에 meta.json을 다시 읽어 다른 writer의 코인 행 배정과 버전 변경을 반영합니다.
+    용량을 늘릴 때는 새 버전 파일을 만든 뒤 meta.json을 교체하며,
+    readonly 저장소는 meta.json이 바뀐 것을 보고 다시 엽니다.
+    coin_prices_day와는 updated_at 기준 증분 동기화(sync_from_db)로 맞춥니다.
+    """
+
+    def __init__(self, directory: Optional[str] = None, readonly: bool = False):
+        self.logger = logging.getLogger(__name__)
+        self.directory = directory or os.getenv("PRICE_STORE_DIR", "data/price_store")
+        self.readonly = readonly
+        self._lock = threading.RLock()
+        self._meta: Optional[Dict[str, Any]] = None
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._coin_rows: Dict[int, int] = {}
+        self._meta_mtime: Optional[int] = None
+        self._lock_file = None
+        self._lock_depth = 0
+        self._coin_prices_day_repository = None
+        if readonly:
+            self._open()
+        else:
+            # 디렉터리가 비어 있으면 lock을 잡은 writer 하나만 파일을 만듦
+            with self._writing():
+                pass
+
+    @property
+    def coin_prices_day_repository(self):
+        if self._coin_prices_day_repository is None:
+            from repository.coin_prices_day_repository import CoinPricesDayRepository
+
+            self._coin_prices_day_repository = CoinPricesDayRepository()
+        return self._coin_prices_day_repository
+
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.directory, META_FILE)
+
+    def _array_path(self, field: str, version: int) -> str:
+        return os.path.join(self.directory, f"{field}.v{version}.npy")
+
+    # ------------------------------------------------------------------
+    # 열기 / 용량 관리
+    # ------------------------------------------------------------------
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.meta_path):
+            return None
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _open(self):
+        with self._lock:
+            for attempt in range(_OPEN_RETRIES):
+                meta = self._read_meta()
+                if meta is None:
+                    self._meta, self._arrays, self._coin_rows = None, {}, {}
+                    self._meta_mtime = None
+                    return
+                try:
+                    self._open_version(meta)
+                    return
+                except FileNotFoundError:
+                    # 그 사이 writer가 용량을 늘려 버전이 바뀜
+                    if attempt == _OPEN_RETRIES - 1:
+                        raise
+
+    def _open_version(self, meta: Dict[str, Any]):
+        mode = "r" if self.readonly else "r+"
+        self._arrays = {
+            field: np.load(self._array_path(field, meta["version"]), mmap_mode=mode)
+            for field in FIELDS
+        }
+        self._meta = meta
+        self._coin_rows = {int(coin_id): row for coin_id, row in meta["coin_rows"].items()}
+        self._meta_mtime = os.stat(self.meta_path).st_mtime_ns
+
+    @contextmanager
+    def _writing(self):
+        """
+        writer 프로세스 간 배타 lock (재진입 가능)
+
+        처음 잡을 때 meta.json을 다시 읽어 다른 writer가 바꾼 내용이 있으면 다시 열고,
+        저장소가 비어 있으면 새로 만듭니다.
+        """
+        if self.readonly:
+            raise ValueError("readonly 가격 저장소에는 쓸 수 없습니다")
+        with self._lock:
+            if self._lock_depth == 0:
+                os.makedirs(self.directory, exist_ok=True)
+                self._lock_file = open(os.path.join(self.directory, LOCK_FILE), "a")
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+                try:
+                    self._reload_for_write()
+                except Exception:
+                    self._release_file_lock()
+                    raise
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    self._release_file_lock()
+
+    def _release_file_lock(self):
+        fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+        self._lock_file.close()
+        self._lock_file = None
+
+    def _reload_for_write(self):
+        # 호출 측에서 파일 lock을 잡은 상태여야 함
+        meta = self._read_meta()
+        if meta is None:
+            day_capacity = (
+                date.today().toordinal() - BASE_DATE.toordinal() + DAY_CAPACITY_STEP
+            )
+            self._create(COIN_CAPACITY_STEP, day_capacity)
+        elif meta != self._meta:
+            self._open_version(meta)
+
+    def _create(self, coin_capacity: int, day_capacity: int):
+        os.makedirs(self.directory, exist_ok=True)
+        meta = {
+            "version": 1,
+            "base_ordinal": BASE_DATE.toordinal(),
+            "coin_capacity": coin_capacity,
+            "day_capacity": day_capacity,
+            "coin_rows": {},
+            "synced_until": None,
+        }
+        self._arrays = self._allocate(meta, previous=None)
+        self._meta = meta
+        self._coin_rows = {}
+        self._save_meta()
+
+    def _allocate(
+        self, meta: Dict[str, Any], previous: Optional[Dict[str, np.ndarray]]
+    ) -> Dict[str, np.ndarray]:
+        arrays = {}
+        shape = (meta["coin_capacity"], meta["day_capacity"])
+        for field in FIELDS:
+            array = np.lib.format.open_memmap(
+                self._array_path(field, meta["version"]),
+                mode="w+",
+                dtype=np.float64,
+                shape=shape,
+            )
+            array[:] = np.nan
+            if previous is not None:
+                old = previous[field]
+                array[: old.shape[0], : old.shape[1]] = old
+            array.flush()
+            arrays[field] = array
+        return arrays
+
+    def _grow(self, coin_capacity: int, day_capacity: int):
+        """용량을 늘린 새 버전 파일로 교체 (기존 파일은 열려 있는 reader의 mapping이 유지되도록 unlink만 함)"""
+        old_version = self._meta["version"]
+        meta = dict(self._meta)
+        meta["version"] = old_version + 1
+        meta["coin_capacity"] = max(coin_capacity, self._meta["coin_capacity"])
+        meta["day_capacity"] = max(day_capacity, self._meta["day_capacity"])
+
+        arrays = self._allocate(meta, previous=self._arrays)
+        self._arrays = arrays
+        self._meta = meta
+        self._save_meta()
+
+        for field in FIELDS:
+            try:
+                os.remove(self._array_path(field, old_version))
+            except FileNotFoundError:
+                pass
+        self.logger.info(
+            f"가격 저장소 용량 확장: coins={meta['coin_capacity']}, days={meta['day_capacity']}"
+        )
+
+    def _save_meta(self):
+        self._meta["coin_rows"] = {
+            str(coin_id): row for coin_id, row in self._coin_rows.items()
+        }
+        temp_path = f"{self.meta_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self._meta, f)
+        os.replace(temp_path, self.meta_path)
+        self._meta_mtime = os.stat(self.meta_path).st_mtime_ns
+
+    def _maybe_reload(self):
+        """readonly 저장소: writer가 meta.json을 바꿨으면 다시 열기"""
+        if not self.readonly:
+            return
+        try:
+            mtime = os.stat(self.meta_path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._meta_mtime:
+            self._open()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def _column(self, day) -> int:
+        return _to_ordinal(day) - self._meta["base_ordinal"]
+
+    def price_on(self, coin_id: int, day, field: str = "close") -> Optional[float]:
+        """특정 날짜(UTC 일봉) 가격, 없으면 None"""
+        self._maybe_reload()
+        row = self._coin_rows.get(coin_id)
+        if row is None:
+            return None
+        column = self._column(day)
+        array = self._arrays[field]
+        if column < 0 or column >= array.shape[1]:
+            return None
+        value = array[row, column]
+        return None if np.isnan(value) else float(value)
+
+    def range(
+        self, coin_id: int, start, end, field: str = "close"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        [start, end) 기간 가격 (값은 저장소 배열의 view)
+
+        Returns:
+            (datetime64[D] 날짜 배열, 가격 배열)
+        """
+        self._maybe_reload()
+        dates = self._dates(start, end)
+        row = self._coin_rows.get(coin_id)
+        if row is None:
+            return dates, np.full(len(dates), np.nan)
+
+        first, last = self._column(start), self._column(end)
+        array = self._arrays[field]
+        if first >= 0 and last <= array.shape[1]:
+            return dates, array[row, first:last]
+
+        # 저장 범위를 벗어나는 부분은 NaN으로 채움
+        values = np.full(len(dates), np.nan)
+        lo, hi = max(first, 0), min(last, array.shape[1])
+        if lo < hi:
+            values[lo - first : hi - first] = array[row, lo:hi]
+        return dates, values
+
+    def matrix(
+        self, coin_ids: Sequence[int], start, end, field: str = "close"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        여러 코인의 [start, end) 기간 가격 행렬
+
+        Returns:
+            (datetime64[D] 날짜 배열, (len(coin_ids), 일수) 가격 행렬, 저장소에 없는 코인은 NaN 행)
+        """
+        self._maybe_reload()
+        dates = self._dates(start, end)
+        result = np.full((len(coin_ids), len(dates)), np.nan)
+        if not self._arrays:
+            return dates, result
+
+        first, last = self._column(start), self._column(end)
+        array = self._arrays[field]
+        lo, hi = max(first, 0), min(last, array.shape[1])
+        rows = np.array([self._coin_rows.get(coin_id, -1) for coin_id in coin_ids], dtype=np.int64)
+        known = rows >= 0
+        if lo < hi and known.any():
+            result[np.flatnonzero(known), lo - first : hi - first] = array[rows[known], lo:hi]
+        return dates, result
+
+    def _dates(self, start, end) -> np.ndarray:
+        return np.arange(
+            _to_ordinal(start) - _EPOCH_ORDINAL, _to_ordinal(end) - _EPOCH_ORDINAL
+        ).astype("datetime64[D]")
+
+    def coin_ids(self) -> Iterable[int]:
+        self._maybe_reload()
+        return list(self._coin_rows.keys())
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+
+    def append(
+        self,
+        coin_ids: Sequence[int],
+        days: Sequence[Any],
+        values: Dict[str, Sequence[float]],
+    ) -> int:
+        """
+        일봉 가격 일괄 기록 (같은 코인/날짜는 덮어씀)
+
+        Args:
+            coin_ids: 코인 id 열
+            days: 날짜(date/datetime 또는 ordinal) 열
+            values: {필드: 값 열}, 빠진 필드는 그대로 둠
+
+        Returns:
+            기록된 행 수 (BASE_DATE 이전 날짜는 제외)
+        """
+        if len(coin_ids) == 0:
+            return 0
+
+        with self._writing():
+            new_coins = False
+            for coin_id in dict.fromkeys(coin_ids):
+                if coin_id not in self._coin_rows:
+                    self._coin_rows[coin_id] = len(self._coin_rows)
+                    new_coins = True
+
+            rows = np.array([self._coin_rows[coin_id] for coin_id in coin_ids], dtype=np.int64)
+            columns = np.fromiter((_to_ordinal(day) for day in days), dtype=np.int64, count=len(days))
+            columns -= self._meta["base_ordinal"]
+
+            needed_coins = len(self._coin_rows)
+            needed_days = int(columns.max()) + 1
+            if needed_coins > self._meta["coin_capacity"] or needed_days > self._meta["day_capacity"]:
+                self._grow(
+                    _round_up(needed_coins, COIN_CAPACITY_STEP),
+                    _round_up(needed_days, DAY_CAPACITY_STEP),
+                )
+
+            valid = columns >= 0
+            rows, columns = rows[valid], columns[valid]
+            for field, field_values in values.items():
+                column_values = np.asarray(field_values, dtype=np.float64)[valid]
+                self._arrays[field][rows, columns] = column_values
+
+            # 다른 writer가 같은 행을 배정하지 않도록 lock을 놓기 전에 코인 행 배정을 저장
+            if new_coins:
+                self._save_meta()
+            return int(valid.sum())
+
+    def flush(self, **meta_updates):
+        """배열 변경 내용을 파일에 반영하고 meta.json 저장"""
+        with self._writing():
+            for array in self._arrays.values():
+                array.flush()
+            self._meta.update(meta_updates)
+            self._save_meta()
+
+    def sync_from_db(self, batch_size: int = 10000) -> Dict[str, Any]:
+        """
+        coin_prices_day에서 마지막 동기화 이후 추가/변경된 일봉만 읽어 기록
+
+        Returns:
+            {"row_count": 기록된 행 수, "synced_until": 새 updated_at 기준점}
+        """
+        with self._writing():
+            synced_until = self._meta.get("synced_until")
+            updated_after = datetime.fromisoformat(synced_until) if synced_until else None
+
+            row_count = 0
+            latest = updated_after
+            for partition in self.coin_prices_day_repository.stream_price_columns(
+                updated_after=updated_after, batch_size=batch_size
+            ):
+                row_count += self.append(
+                    [row.coin_id for row in partition],
+                    [row.candle_date_time_utc for row in partition],
+                    {
+                        field: [
+                            np.nan if getattr(row, field) is None else getattr(row, field)
+                            for row in partition
+                        ]
+                        for field in FIELDS
+                    },
+                )
+                partition_latest = max(
+                    (row.updated_at for row in partition if row.updated_at is not None),
+                    default=None,
+                )
+                if partition_latest is not None and (latest is None or partition_latest > latest):
+                    latest = partition_latest
+
+            # 기준점과 같은 updated_at 행은 다음 동기화에서 다시 읽음 (덮어쓰기라 결과는 같음)
+            self.flush(synced_until=latest.isoformat() if latest else None)
+
+            self.logger.info(f"가격 저장소 동기화 완료: {row_count}개, synced_until={latest}")
+            return {"row_count": row_count, "synced_until": self._meta["synced_until"]}
+
+    def sync_if_empty(self) -> Optional[Dict[str, Any]]:
+        """
+        한 번도 동기화하지 않은 저장소면 coin_prices_day 전체를 읽어 채움 (새 배포 직후용)
+
+        Returns:
+            동기화 결과, 이미 동기화된 저장소면 None
+        """
+        with self._writing():
+            if self._meta.get("synced_until") is not None:
+                return None
+            return self.sync_from_db()
+
+
+def _round_up(value: int, step: int) -> int:
+    return ((value + step - 1) // step) * step
@@ -0,0 +1,262 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+DEFAULT_CHECKPOINT_PATH = os.getenv(
+    "PROFIT_RECALCULATION_CHECKPOINT", "data/profit_recalculation.checkpoint"
+)
+
+# worker 프로세스마다 하나씩 생성되는 수익률 계산 서비스
+_worker_trading_profit_service = None
+
+
+def _init_worker():
+    """
+    worker 프로세스 초기화
+    worker는 spawn으로 시작하므로 모듈을 새로 import해 worker 전용 커넥션 풀을 사용합니다.
+    """
+    global _worker_trading_profit_service
+    from service.trading_profit_service import TradingProfitService
+
+    _worker_trading_profit_service = TradingProfitService()
+
+
+def _recalculate_pair(user_id: str, exchange_code: int) -> Dict[str, Any]:
+    """worker에서 (user_id, exchange_code) 하나를 전체 재계산"""
+    started_at = time.perf_counter()
+    result = _worker_trading_profit_service.calculate_and_update_profit_loss(
+        user_id, exchange_code, force_full=True
+    )
+    return {
+        "pid": os.getpid(),
+        "processed_count": result.get("processed_count", 0),
+        "updated_count": result.get("updated_count", 0),
+        "elapsed": time.perf_counter() - started_at,
+    }
+
+
+def _pair_key(user_id: str, exchange_code: int) -> str:
+    return f"{user_id}:{exchange_code}"
+
+
+class ProfitRecalculationService:
+    """
+    전체 사용자 수익률 재계산
+
+    (user_id, exchange_code)를 ProcessPoolExecutor worker에 나눠 전체 재계산하고,
+    완료된 항목을 checkpoint 파일에 한 줄씩 기록해 중단되면 이어서 실행합니다.
+    실패 없이 끝난 실행의 checkpoint는 지우므로 resume은 중단되거나 실패가 남은 실행에만 적용됩니다.
+    worker는 threaded uvicorn 프로세스를 fork하지 않도록 spawn으로 시작합니다.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._trading_histories_repository = None
+        self._lock = threading.Lock()
+        self._running = False
+        self.last_summary: Optional[Dict[str, Any]] = None
+
+    @property
+    def trading_histories_repository(self):
+        if self._trading_histories_repository is None:
+            from repository.trading_histories_repository import (
+                TradingHistoriesRepository,
+            )
+
+            self._trading_histories_repository = TradingHistoriesRepository()
+        return self._trading_histories_repository
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def recalculate_all(
+        self,
+        workers: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        resume: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        전체 사용자 수익률 재계산
+
+        Args:
+            workers: worker 프로세스 수 (기본: PROFIT_RECALCULATION_WORKERS 또는 CPU 수)
+            checkpoint_path: 완료 항목 기록 파일
+            resume: True면 이전 실행이 중단되었거나 실패가 있었을 때 checkpoint에 기록된 항목은 건너뜀,
+                False면 checkpoint를 지우고 처음부터
+
+        Returns:
+            실행 요약 (전체/완료/건너뜀/실패 수, worker별 처리량)
+        """
+        if not self._try_start():
+            raise ValueError("전체 수익률 재계산이 이미 진행 중입니다")
+        return self._recalculate_all(workers, checkpoint_path, resume)
+
+    def _try_start(self) -> bool:
+        with self._lock:
+            if self._running:
+                return False
+            self._running = True
+            return True
+
+    def _recalculate_all(
+        self,
+        workers: Optional[int],
+        checkpoint_path: Optional[str],
+        resume: bool,
+    ) -> Dict[str, Any]:
+        try:
+            if workers is None:
+                workers = int(
+                    os.getenv("PROFIT_RECALCULATION_WORKERS", str(os.cpu_count() or 1))
+                )
+            checkpoint_path = checkpoint_path or DEFAULT_CHECKPOINT_PATH
+
+            if not resume and os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
+            completed = self._load_checkpoint(checkpoint_path)
+
+            pairs = self.trading_histories_repository.find_user_exchange_pairs()
+            pending = [
+                pair for pair in pairs if _pair_key(*pair) not in completed
+            ]
+
+            self.logger.info(
+                f"전체 수익률 재계산 시작: 대상 {len(pairs)}개, 건너뜀 {len(pairs) - len(pending)}개, workers={workers}"
+            )
+
+            summary = self._run(pending, workers, checkpoint_path)
+            summary.update(
+                {
+                    "total_count": len(pairs),
+                    "skipped_count": len(pairs) - len(pending),
+                }
+            )
+            self.last_summary = summary
+
+            # 모두 성공하면 checkpoint를 지워 다음 실행은 처음부터 재계산
+            # (실패가 남으면 유지해 resume 시 실패 항목만 다시 계산)
+            if not summary["failed"] and os.path.exists(checkpoint_path):
+                os.remove(checkpoint_path)
+
+            self.logger.info(
+                f"전체 수익률 재계산 완료: 완료 {summary['completed_count']}개, "
+                f"실패 {len(summary['failed'])}개, {summary['elapsed']}초"
+            )
+            return summary
+
+        except Exception as e:
+            self.logger.error(f"전체 수익률 재계산 중 에러 발생: {e}")
+            raise e
+        finally:
+            with self._lock:
+                self._running = False
+
+    def _run(
+        self, pairs: List[Tuple[str, int]], workers: int, checkpoint_path: str
+    ) -> Dict[str, Any]:
+        started_at = time.perf_counter()
+        worker_stats: Dict[int, Dict[str, Any]] = {}
+        failed: List[Dict[str, Any]] = []
+        completed_count = 0
+
+        if pairs:
+            checkpoint_dir = os.path.dirname(checkpoint_path)
+            if checkpoint_dir:
+                os.makedirs(checkpoint_dir, exist_ok=True)
+
+            with open(checkpoint_path, "a", encoding="utf-8") as checkpoint, ProcessPoolExecutor(
+                max_workers=max(1, min(workers, len(pairs))),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            ) as executor:
+                futures = {
+                    executor.submit(_recalculate_pair, user_id, exchange_code): (
+                        user_id,
+                        exchange_code,
+                    )
+                    for user_id, exchange_code in pairs
+                }
+
+                for future in as_completed(futures):
+                    user_id, exchange_code = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self.logger.error(
+                            f"수익률 재계산 실패: user_id={user_id}, exchange_code={exchange_code}, error={e}"
+                        )
+                        failed.append(
+                            {
+                                "user_id": user_id,
+                                "exchange_code": exchange_code,
+                                "error": str(e),
+                            }
+                        )
+                        continue
+
+                    # 완료된 항목만 기록 (중단 후 재실행 시 건너뜀)
+                    checkpoint.write(_pair_key(user_id, exchange_code) + "\n")
+                    checkpoint.flush()
+                    completed_count += 1
+
+                    stats = worker_stats.setdefault(
+                        result["pid"], {"pairs": 0, "trades": 0, "busy_seconds": 0.0}
+                    )
+                    stats["pairs"] += 1
+                    stats["trades"] += result["processed_count"]
+                    stats["busy_seconds"] += result["elapsed"]
+
+        for stats in worker_stats.values():
+            stats["busy_seconds"] = round(stats["busy_seconds"], 3)
+            stats["trades_per_second"] = (
+                round(stats["trades"] / stats["busy_seconds"], 1)
+                if stats["busy_seconds"] > 0
+                else None
+            )
+
+        return {
+            "completed_count": completed_count,
+            "failed": failed,
+            "workers": {str(pid): stats for pid, stats in worker_stats.items()},
+            "elapsed": round(time.perf_counter() - started_at, 3),
+        }
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: str) -> Set[str]:
+        if not os.path.exists(checkpoint_path):
+            return set()
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def start_in_background(
+        self,
+        workers: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        resume: bool = True,
+    ) -> bool:
+        """
+        재계산을 백그라운드 스레드에서 시작 (관리자 API용)
+
+        Returns:
+            새로 시작했으면 True, 이미 진행 중이면 False
+        """
+        if not self._try_start():
+            return False
+
+        def run():
+            try:
+                self._recalculate_all(workers, checkpoint_path, resume)
+            except Exception as e:
+                self.last_summary = {"error": str(e)}
+
+        threading.Thread(target=run, name="profit-recalculation", daemon=True).start()
+        return True
+
+    def get_status(self) -> Dict[str, Any]:
+        return {"running": self._running, "last_summary": self.last_summary}
+
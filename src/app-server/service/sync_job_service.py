@@ -0,0 +1,182 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+@dataclass
+class SyncJob:
+    """거래내역 동기화 작업 상태"""
+
+    job_id: str
+    user_id: str
+    exchange_provider: str
+    state: str = QUEUED
+    phase: Optional[str] = None
+    orders_fetched: int = 0
+    rows_saved: int = 0
+    detail_fetched: int = 0
+    detail_total: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _detail_started_at: Optional[float] = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.user_id, self.exchange_provider)
+
+    @property
+    def done(self) -> bool:
+        return self.state in (SUCCEEDED, FAILED)
+
+    def update(self, **fields):
+        """worker 스레드에서 진행 상황 기록"""
+        with self._lock:
+            if "detail_fetched" in fields and self._detail_started_at is None:
+                self._detail_started_at = time.time()
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+    def eta_seconds(self) -> Optional[float]:
+        """주문 상세 조회 속도 기준 남은 시간(초) 추정"""
+        with self._lock:
+            if (
+                self._detail_started_at is None
+                or self.detail_fetched <= 0
+                or self.detail_total <= 0
+            ):
+                return None
+            elapsed = time.time() - self._detail_started_at
+            remaining = self.detail_total - self.detail_fetched
+            return round(elapsed / self.detail_fetched * remaining, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "user_id": self.user_id,
+            "exchange_provider": self.exchange_provider,
+            "state": self.state,
+            "phase": self.phase,
+            "orders_fetched": self.orders_fetched,
+            "rows_saved": self.rows_saved,
+            "detail_fetched": self.detail_fetched,
+            "detail_total": self.detail_total,
+            "eta_seconds": self.eta_seconds() if self.state == RUNNING else None,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class SyncJobService:
+    """
+    거래내역 동기화를 백그라운드 worker pool에서 실행하는 로컬 작업 큐
+
+    같은 (user_id, 거래소)에 대해 진행 중인 작업이 있으면 새 작업을 만들지 않고 기존 작업을 반환합니다.
+    작업 상태는 프로세스 메모리에만 보관되며 max_jobs를 넘으면 오래된 완료 작업부터 제거합니다.
+    """
+
+    def __init__(
+        self, max_workers: Optional[int] = None, max_jobs: Optional[int] = None
+    ):
+        self.logger = logging.getLogger(__name__)
+        if max_workers is None:
+            max_workers = int(os.getenv("SYNC_JOB_WORKERS", "4"))
+        if max_jobs is None:
+            max_jobs = int(os.getenv("SYNC_JOB_MAX_JOBS", "1000"))
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="sync-job"
+        )
+        self._jobs: "OrderedDict[str, SyncJob]" = OrderedDict()
+        self._active: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+        self._trading_histories_service = None
+
+    @property
+    def trading_histories_service(self):
+        if self._trading_histories_service is None:
+            from dependencies import get_trading_histories_service
+
+            self._trading_histories_service = get_trading_histories_service()
+        return self._trading_histories_service
+
+    def submit_sync(self, user_id: str, exchange_provider: str) -> Tuple[SyncJob, bool]:
+        """
+        동기화 작업 등록
+
+        Args:
+            user_id: 사용자 UUID
+            exchange_provider: 거래소명 (UPBIT, BITHUMB, BINANCE, OKX)
+
+        Returns:
+            (작업, 새로 생성 여부)
+        """
+        key = (user_id, exchange_provider.upper())
+        with self._lock:
+            active_job_id = self._active.get(key)
+            if active_job_id is not None:
+                return self._jobs[active_job_id], False
+
+            job = SyncJob(
+                job_id=str(uuid.uuid4()),
+                user_id=user_id,
+                exchange_provider=key[1],
+            )
+            self._jobs[job.job_id] = job
+            self._active[key] = job.job_id
+            self._evict_finished_jobs()
+
+        self._executor.submit(self._run, job)
+        return job, True
+
+    def get_job(self, job_id: str) -> Optional[SyncJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: SyncJob):
+        job.update(state=RUNNING, started_at=time.time())
+        try:
+            result = self.trading_histories_service.sync_trading_histories(
+                job.user_id, job.exchange_provider, progress=job
+            )
+            job.update(state=SUCCEEDED, phase="done", result=result)
+        except Exception as e:
+            self.logger.error(
+                f"거래내역 동기화 작업 실패: job_id={job.job_id}, user_id={job.user_id}, error={e}"
+            )
+            job.update(state=FAILED, error=str(e))
+        finally:
+            job.update(finished_at=time.time())
+            with self._lock:
+                if self._active.get(job.key) == job.job_id:
+                    del self._active[job.key]
+
+    def _evict_finished_jobs(self):
+        # 호출 측에서 self._lock을 잡은 상태여야 함
+        if len(self._jobs) <= self.max_jobs:
+            return
+        for job_id in list(self._jobs.keys()):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[job_id].done:
+                del self._jobs[job_id]
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait)
@@ -1,15 +1,108 @@
+import base64
+import csv
+import io
+import json
 from dotenv import load_dotenv
 import logging
 from datetime import datetime
 import pytz
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple
 from fastapi import HTTPException
 from model.TradingHistories import TradingHistories
 
 load_dotenv()
 
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# 동기화 응답에 포함할 거래내역 최대 개수 (새 거래 / 수익률 변경 거래 각각)
+SYNC_DELTA_LIMIT = 500
+
+
+def safe_float(value, default: Optional[float] = 0.0) -> Optional[float]:
+    """Decimal을 안전하게 float로 변환"""
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def format_trading_history(history: TradingHistories) -> Dict[str, Any]:
+    """거래내역 ORM 객체를 응답용 딕셔너리로 변환"""
+    return {
+        "id": history.id,
+        "coin_id": history.coin_id,
+        "exchange_code": history.exchange_code,
+        "trade_uuid": str(history.trade_uuid),
+        "trade_type": history.trade_type,
+        "price": safe_float(history.price),
+        "quantity": safe_float(history.quantity),
+        "total_price": safe_float(history.total_price),
+        "fee": safe_float(history.fee),
+        "trade_time": (
+            history.trade_time.isoformat() if history.trade_time is not None else None
+        ),
+        "created_at": (
+            history.created_at.isoformat() if history.created_at is not None else None
+        ),
+        # 수익률은 매도 거래에만 있으므로 없으면 None 유지
+        "profit_loss_rate": safe_float(history.profit_loss_rate, None),
+        "avg_buy_price": safe_float(history.avg_buy_price, None),
+    }
+
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_ROWS_PER_CHUNK = 500
+EXPORT_FIELDS = (
+    "id",
+    "exchange_code",
+    "coin_id",
+    "symbol",
+    "market_code",
+    "trade_uuid",
+    "trade_type",
+    "price",
+    "quantity",
+    "total_price",
+    "fee",
+    "trade_time",
+    "profit_loss_rate",
+    "avg_buy_price",
+)
+
+
+def _export_record(row: Any) -> Dict[str, Any]:
+    """내보내기 Row를 직렬화 가능한 딕셔너리로 변환 (Decimal은 문자열로 유지해 정밀도 보존)"""
+    record = dict(row._mapping)
+    for field in ("price", "quantity", "total_price", "fee", "profit_loss_rate", "avg_buy_price"):
+        if record.get(field) is not None:
+            record[field] = str(record[field])
+    if record.get("trade_time") is not None:
+        record["trade_time"] = record["trade_time"].isoformat()
+    return record
+
+
+def encode_cursor(trade_time: datetime, history_id: int) -> str:
+    """페이지 커서 생성 (trade_time, id를 URL-safe 문자열로 인코딩)"""
+    raw = f"{trade_time.isoformat()}|{history_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """페이지 커서 해석, 잘못된 커서면 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        trade_time, history_id = (
+            base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        )
+        return datetime.fromisoformat(trade_time), int(history_id)
+    except Exception as e:
+        raise ValueError(f"잘못된 페이지 커서입니다: {cursor}") from e
+
+
 class TradingHistoriesService:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -17,6 +110,8 @@ class TradingHistoriesService:
         self._coin_repository = None
         self._exchange_credentials_service = None
         self._upbit_service = None
+        self._user_service = None
+        self._trading_profit_service = None
 
     @property
     def trading_repository(self):
@@ -52,12 +147,41 @@ class TradingHistoriesService:
             self._upbit_service = get_upbit_service()
         return self._upbit_service
 
+    @property
+    def user_service(self):
+        if self._user_service is None:
+            from dependencies import get_user_service
+
+            self._user_service = get_user_service()
+        return self._user_service
+
+    @property
+    def trading_profit_service(self):
+        if self._trading_profit_service is None:
+            from dependencies import get_trading_profit_service
+
+            self._trading_profit_service = get_trading_profit_service()
+        return self._trading_profit_service
+
     def get_trading_histories(
         self,
         user_id: str,
         exchange_provider: str,
         start_time: Optional[datetime] = None,
+        listing_first: bool = True,
+        on_progress: Optional[Callable[[int, int], Any]] = None,
     ):
+        """
+        거래소에서 거래내역 조회
+
+        Args:
+            user_id: 사용자 UUID
+            exchange_provider: 거래소명 (UPBIT, ...)
+            start_time: 조회 시작 시간 (None이면 전체 기간)
+            listing_first: True면 종료 주문 목록으로 체결 내역을 만들고
+                평균 체결가를 알 수 없는 주문만 상세 조회
+            on_progress: 주문 상세 조회 진행률 콜백 (완료 개수, 전체 개수)
+        """
         try:
             from dto.exchange_credentials_dto import ExchangeProvider
 
@@ -70,18 +194,179 @@ class TradingHistoriesService:
             access_key = credentials.access_key
             secret_key = credentials.secret_key
 
+            if start_time is None:
+                start_time = self._resolve_first_activity_time(
+                    user_id, access_key, secret_key
+                )
+
+            if listing_first:
+                return self.upbit_service.fetch_trading_histories_listing_first(
+                    access_key, secret_key, start_time, on_progress
+                )
+
             uuids = self.upbit_service.fetch_all_trading_uuids(
                 access_key, secret_key, start_time
             )
 
             trading_histies = self.upbit_service.fetch_all_trading_history(
-                access_key, secret_key, uuids
+                access_key, secret_key, uuids, on_progress
             )
 
             return trading_histies
         except Exception as e:
             raise e
 
+    def sync_trading_histories(
+        self,
+        user_id: str,
+        exchange_provider_str: str,
+        progress: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """
+        거래소 거래내역 동기화 (조회 → 가공 → 저장 → 수익률 계산)
+
+        Args:
+            user_id: 사용자 UUID
+            exchange_provider_str: 거래소명 (UPBIT, BITHUMB, BINANCE, OKX)
+            progress: 진행 상황을 기록할 객체 (update(**fields) 메서드 필요)
+
+        Returns:
+            동기화 결과
+        """
+        try:
+            from dto.exchange_credentials_dto import ExchangeProvider
+
+            exchange_provider = ExchangeProvider[exchange_provider_str.upper()]
+
+            def report(**fields):
+                if progress is not None:
+                    progress.update(**fields)
+
+            # 사용자의 마지막 거래내역 업데이트 시간 조회
+            user = self.user_service.user_repository.find_by_id(user_id)
+            start_time = user.last_trading_history_update_at if user else None
+
+            # 최초 동기화 여부 판단 (start_time이 None이면 최초)
+            is_initial = start_time is None
+
+            report(phase="fetching")
+            trading_histies = self.get_trading_histories(
+                user_id,
+                exchange_provider.name,
+                start_time,
+                on_progress=lambda done, total: report(
+                    detail_fetched=done, detail_total=total
+                ),
+            )
+            report(phase="processing", orders_fetched=len(trading_histies))
+
+            processed_trading_histies = self.process_trading_histories(
+                user_id, exchange_provider.name, trading_histies
+            )
+
+            report(phase="saving")
+            saved_trading_histories = self.save_trading_histories(
+                processed_trading_histies
+            )
+            report(rows_saved=len(saved_trading_histories))
+
+            # 거래 내역이 저장된 경우에만 수익률 계산 수행
+            profit_calculation_result = None
+            updated_trade_ids: List[int] = []
+            if saved_trading_histories:
+                report(phase="calculating")
+                try:
+                    profit_calculation_result = (
+                        self.trading_profit_service.calculate_and_update_profit_loss(
+                            user_id=user_id,
+                            exchange_code=exchange_provider.value,
+                            is_initial=is_initial,
+                            include_updated_ids=True,
+                        )
+                    )
+                    updated_trade_ids = profit_calculation_result.pop(
+                        "updated_trade_ids", []
+                    )
+                except Exception as e:
+                    # 수익률 계산 실패해도 거래 내역 저장은 성공했으므로 로그만 남기고 계속 진행
+                    self.logger.error(
+                        f"수익률 계산 중 에러 발생 (거래 내역은 저장됨): user_id={user_id}, "
+                        f"exchange_code={exchange_provider.value}, error={e}"
+                    )
+
+            # 전체 거래내역을 다시 읽지 않고 이번 동기화로 바뀐 거래내역만 응답에 포함
+            report(phase="summarizing")
+            response_data = self._build_sync_delta(
+                user_id, saved_trading_histories, updated_trade_ids
+            )
+
+            # 매매내역 업데이트가 성공적으로 완료되었으므로 업데이트 시간 갱신
+            # (저장된 거래내역이 없어도 업데이트 시간은 갱신)
+            self.user_service.update_user_trading_history_updated_at(user_id)
+
+            # 수익률 계산 결과가 있으면 응답에 포함
+            if profit_calculation_result:
+                response_data["profit_calculation"] = profit_calculation_result
+
+            return response_data
+        except Exception as e:
+            raise Exception(f"sync_trading_histories: {e}") from e
+
+    def _build_sync_delta(
+        self,
+        user_id: str,
+        saved_ids: List[int],
+        updated_ids: List[int],
+        limit: int = SYNC_DELTA_LIMIT,
+    ) -> Dict[str, Any]:
+        """
+        동기화 결과 응답 생성 (새로 저장된 거래내역, 수익률이 바뀐 기존 거래내역, 전체 개수)
+
+        각 목록은 최대 limit개까지만 포함하고, 넘치면 delta_truncated=True로 표시합니다.
+        나머지는 페이지 조회 API로 가져옵니다.
+        """
+        saved_id_set = set(saved_ids)
+        changed_ids = [
+            history_id for history_id in updated_ids if history_id not in saved_id_set
+        ]
+
+        new_histories = self.trading_repository.find_by_ids(saved_ids[:limit])
+        changed_histories = self.trading_repository.find_by_ids(changed_ids[:limit])
+
+        return {
+            "saved_count": len(saved_ids),
+            "profit_updated_count": len(changed_ids),
+            "total_count": self.trading_repository.count_by_user(user_id),
+            "new_trading_histories": [
+                format_trading_history(history) for history in new_histories
+            ],
+            "updated_trading_histories": [
+                format_trading_history(history) for history in changed_histories
+            ],
+            "delta_truncated": len(saved_ids) > limit or len(changed_ids) > limit,
+        }
+
+    def _resolve_first_activity_time(
+        self, user_id: str, access_key: str, secret_key: str
+    ) -> Optional[datetime]:
+        """최초 동기화 시작 시점 조회 (저장된 값이 없으면 거래소에서 확인 후 저장)"""
+        try:
+            user = self.user_service.user_repository.find_by_id(user_id)
+            if user is not None and user.first_trading_activity_at is not None:
+                return user.first_trading_activity_at
+
+            first_activity_at = self.upbit_service.probe_first_activity(
+                access_key, secret_key
+            )
+            if first_activity_at is not None and user is not None:
+                self.user_service.update_user_first_trading_activity_at(
+                    user_id, first_activity_at
+                )
+
+            return first_activity_at
+        except Exception as e:
+            raise Exception(f"_resolve_first_activity_time: {e}") from e
+
     def process_trading_histories(
         self,
         user_id: str,
@@ -89,13 +374,10 @@ class TradingHistoriesService:
         trading_histies: List[Dict[str, Any]],
     ):
         try:
-            from dependencies import get_coin_repository
+            from dependencies import get_coin_catalog
             from dto.exchange_credentials_dto import ExchangeProvider
 
-            coin_repository = get_coin_repository()
-            coins = coin_repository.get_all_coins()
-
-            coin_map = {str(coin.market_code): coin.id for coin in coins}
+            coin_catalog = get_coin_catalog()
 
             # exchange_provider를 숫자로 변환
             exchange_code = ExchangeProvider[exchange_provider.upper()].value
@@ -127,9 +409,14 @@ class TradingHistoriesService:
                 else:
                     trade_type = 0  # 기본값
 
+                market_code = str(trading_history.get("market"))
+                coin = coin_catalog.get_by_market_code(market_code)
+                if coin is None:
+                    raise KeyError(market_code)
+
                 trading_histories = TradingHistories(
                     user_id=user_id,
-                    coin_id=coin_map[str(trading_history.get("market"))],
+                    coin_id=coin.id,
                     exchange_code=exchange_code,
                     trade_uuid=trading_history.get("uuid"),
                     trade_type=trade_type,  # 숫자로 변환된 값 사용
@@ -147,8 +434,8 @@ class TradingHistoriesService:
 
     def save_trading_histories(
         self, trading_histories: List[TradingHistories]
-    ) -> List[TradingHistories]:
-        """거래내역 목록 저장"""
+    ) -> List[int]:
+        """거래내역 목록 저장 후 새로 저장된 거래내역 id 목록 반환"""
         try:
             if not trading_histories:
                 return []
@@ -182,37 +469,7 @@ class TradingHistoriesService:
             formatted_histories = []
             for history in histories:
                 try:
-                    # Decimal을 안전하게 float로 변환
-                    def safe_float(value):
-                        if value is None:
-                            return 0.0
-                        try:
-                            return float(str(value))
-                        except (ValueError, TypeError):
-                            return 0.0
-
-                    formatted_history = {
-                        "id": history.id,
-                        "coin_id": history.coin_id,
-                        "exchange_code": history.exchange_code,
-                        "trade_uuid": str(history.trade_uuid),
-                        "trade_type": history.trade_type,
-                        "price": safe_float(history.price),
-                        "quantity": safe_float(history.quantity),
-                        "total_price": safe_float(history.total_price),
-                        "fee": safe_float(history.fee),
-                        "trade_time": (
-                            history.trade_time.isoformat()
-                            if history.trade_time is not None
-                            else None
-                        ),
-                        "created_at": (
-                            history.created_at.isoformat()
-                            if history.created_at is not None
-                            else None
-                        ),
-                    }
-                    formatted_histories.append(formatted_history)
+                    formatted_histories.append(format_trading_history(history))
                 except Exception as e:
                     self.logger.warning(
                         f"거래내역 포맷 중 오류 발생 (ID: {history.id}): {e}"
@@ -228,3 +485,126 @@ class TradingHistoriesService:
             }
         except Exception as e:
             raise e
+
+    def get_trading_histories_page(
+        self,
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        exchange_code: Optional[int] = None,
+        coin_id: Optional[int] = None,
+        trade_type: Optional[int] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> dict:
+        """
+        사용자 거래내역 페이지 조회 (최신순, trade_time/id 커서 기반)
+
+        Args:
+            user_id: 사용자 UUID
+            limit: 페이지 크기 (최대 MAX_PAGE_SIZE)
+            cursor: 이전 응답의 next_cursor
+            exchange_code, coin_id, trade_type, start_time, end_time: 필터
+
+        Returns:
+            {"trading_histories": [...], "next_cursor": str | None, "has_next": bool, "limit": int}
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        decoded_cursor = decode_cursor(cursor) if cursor else None
+
+        try:
+            # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+            histories = self.trading_repository.find_page_by_user(
+                user_id,
+                limit + 1,
+                cursor=decoded_cursor,
+                exchange_code=exchange_code,
+                coin_id=coin_id,
+                trade_type=trade_type,
+                start_time=start_time,
+                end_time=end_time,
+            )
+            has_next = len(histories) > limit
+            histories = histories[:limit]
+
+            return {
+                "trading_histories": [
+                    format_trading_history(history) for history in histories
+                ],
+                "next_cursor": (
+                    encode_cursor(histories[-1].trade_time, histories[-1].id)
+                    if has_next
+                    else None
+                ),
+                "has_next": has_next,
+                "limit": limit,
+            }
+        except Exception as e:
+            raise Exception(f"get_trading_histories_page: {e}") from e
+
+    def export_trading_histories(
+        self,
+        user_id: str,
+        export_format: str = "ndjson",
+        exchange_code: Optional[int] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        rows_per_chunk: int = EXPORT_ROWS_PER_CHUNK,
+    ) -> Iterator[str]:
+        """
+        사용자 거래내역 전체를 NDJSON 또는 CSV 문자열 조각으로 스트리밍
+
+        Args:
+            user_id: 사용자 UUID
+            export_format: "ndjson" 또는 "csv"
+            exchange_code, start_time, end_time: 필터
+            rows_per_chunk: 한 번에 내보낼 행 수
+
+        Returns:
+            응답 본문 조각 iterator (StreamingResponse용)
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"지원하지 않는 내보내기 형식입니다: {export_format}")
+
+        rows = self.trading_repository.stream_by_user(
+            user_id,
+            exchange_code=exchange_code,
+            start_time=start_time,
+            end_time=end_time,
+        )
+        if export_format == "csv":
+            return self._export_csv(rows, rows_per_chunk)
+        return self._export_ndjson(rows, rows_per_chunk)
+
+    @staticmethod
+    def _export_ndjson(rows: Iterator[Any], rows_per_chunk: int) -> Iterator[str]:
+        buffer = []
+        for row in rows:
+            buffer.append(
+                json.dumps(_export_record(row), ensure_ascii=False, default=str)
+            )
+            if len(buffer) >= rows_per_chunk:
+                yield "\n".join(buffer) + "\n"
+                buffer.clear()
+        if buffer:
+            yield "\n".join(buffer) + "\n"
+
+    @staticmethod
+    def _export_csv(rows: Iterator[Any], rows_per_chunk: int) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+
+        count = 0
+        for row in rows:
+            record = _export_record(row)
+            writer.writerow(
+                ["" if record[field] is None else record[field] for field in EXPORT_FIELDS]
+            )
+            count += 1
+            if count % rows_per_chunk == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
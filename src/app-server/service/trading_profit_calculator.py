@@ -1,15 +1,84 @@
 import logging
-from typing import List, Dict, Any, Optional
+import os
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Context, Decimal, ROUND_05UP, ROUND_HALF_EVEN, ROUND_HALF_UP, localcontext
 from model.TradingHistories import TradingHistories
+from utils.fixed_point import (
+    AVG_DECIMALS,
+    avg_from_cost,
+    avg_to_decimal,
+    avg_to_fixed,
+    avg_to_float,
+    buy_cost,
+    hundredths_to_float,
+    profit_loss_hundredths,
+    to_fixed,
+    value_to_decimal,
+)
+
+# 평단은 고정소수점/배치 모드와 같은 소수점 20자리로 반올림
+_AVG_QUANTUM = Decimal(1).scaleb(-AVG_DECIMALS)
+_RATE_QUANTUM = Decimal("0.01")
+
+# 원가 합계와 곱은 정확히 계산하고, 나눗셈은 ROUND_05UP으로 여유 자리까지 구한 뒤
+# 최종 자리수로 한 번 더 반올림 (ROUND_05UP은 이중 반올림 오차를 만들지 않음)
+_EXACT_CONTEXT = Context(prec=100, rounding=ROUND_05UP)
+
+
+def _decimal_avg(position: List) -> Decimal:
+    """
+    Decimal 모드 보유 상태 [평단 | None, 수량, 누적 원가]의 평단
+
+    직전 매도 이후 매수가 있었으면(평단 None) 누적 원가 / 수량을 소수점 20자리로 반올림합니다.
+    """
+    if position[0] is None:
+        position[0] = (position[2] / position[1]).quantize(
+            _AVG_QUANTUM, rounding=ROUND_HALF_EVEN
+        )
+    return position[0]
+
+
+def _decimal_profit_loss_rate(sell_price: Decimal, avg_buy_price: Decimal) -> Decimal:
+    """((매도가 - 평균 구매가) / 평균 구매가) * 100, 소수점 2째자리 반올림(ROUND_HALF_UP)"""
+    if avg_buy_price <= 0:
+        return Decimal("0.00")
+    return ((sell_price - avg_buy_price) * 100 / avg_buy_price).quantize(
+        _RATE_QUANTUM, rounding=ROUND_HALF_UP
+    )
+
+
+class _FixedPosition:
+    """
+    고정소수점 모드의 코인별 보유 상태
+    (평단: AVG_SCALE, 수량: VALUE_SCALE, 원가: AVG_SCALE × VALUE_SCALE 정수)
+
+    평단은 Decimal 모드와 같이 매도 시점에만 누적 원가에서 계산합니다 (그 전까지 None).
+    """
+
+    __slots__ = ("avg", "quantity", "cost")
+
+    def __init__(self, avg: Optional[int], quantity: int, cost: int):
+        self.avg = avg
+        self.quantity = quantity
+        self.cost = cost
 
 
 class TradingProfitCalculator:
     """거래 내역을 기반으로 수익률과 평균 구매 단가를 계산하는 클래스"""
 
-    def __init__(self):
+    def __init__(self, arithmetic: Optional[str] = None):
+        """
+        Args:
+            arithmetic: "decimal" (기본) 또는 "fixed" (고정소수점 정수 연산)
+                지정하지 않으면 PROFIT_CALCULATOR_ARITHMETIC 환경변수 사용
+        """
         self.logger = logging.getLogger(__name__)
+        self.arithmetic = (
+            arithmetic or os.getenv("PROFIT_CALCULATOR_ARITHMETIC", "decimal")
+        ).lower()
+        if self.arithmetic not in ("decimal", "fixed"):
+            raise ValueError(f"지원하지 않는 연산 모드입니다: {self.arithmetic}")
 
     def calculate_profit_loss(
         self, trading_histories: List[TradingHistories]
@@ -23,14 +92,80 @@ class TradingProfitCalculator:
         Returns:
             profit_loss_rate와 avg_buy_price가 계산된 거래 내역 리스트
         """
+        sorted_histories, _ = self.calculate_profit_loss_with_holdings(
+            trading_histories
+        )
+        return sorted_histories
+
+    def calculate_profit_loss_with_holdings(
+        self,
+        trading_histories: List[TradingHistories],
+        initial_holdings: Optional[Dict[int, Dict]] = None,
+        coin_symbols: Optional[Dict[int, str]] = None,
+    ) -> Tuple[List[TradingHistories], Dict[int, Dict]]:
+        """
+        거래 내역을 한 번만 정렬·순회하여 거래별 수익률과 최종 보유 종목 평단을 함께 계산합니다.
+
+        Args:
+            trading_histories: 거래 내역 리스트
+            initial_holdings: 이어서 계산할 기존 보유 종목 평단
+                {coin_id: {"avg_buy_price", "remaining_quantity", "symbol"}}
+            coin_symbols: {coin_id: symbol} 인덱스 (최종 보유 종목의 심볼 표기용)
+
+        Returns:
+            (수익률이 계산된 거래 내역 리스트,
+             {coin_id: {"symbol": str, "avg_buy_price": Decimal, "remaining_quantity": Decimal}})
+        """
         try:
             # trade_time 순으로 정렬 (과거부터 현재 순)
             sorted_histories = sorted(
                 trading_histories, key=lambda x: x.trade_time
             )
 
-            # 보유량 추적 딕셔너리: {coin_id: [avg_buy_price, quantity]}
-            holdings: Dict[int, List[Decimal]] = {}
+            symbols: Dict[int, str] = dict(coin_symbols or {})
+            for coin_id, data in (initial_holdings or {}).items():
+                if data.get("symbol"):
+                    symbols[coin_id] = data["symbol"]
+
+            if self.arithmetic == "fixed":
+                holdings = self._replay_fixed(sorted_histories, initial_holdings)
+            else:
+                holdings = self._replay_decimal(sorted_histories, initial_holdings)
+
+            # 최종 보유 종목 딕셔너리 생성 (보유 수량이 0보다 큰 경우만)
+            final_holdings = {
+                coin_id: {
+                    "symbol": symbols.get(coin_id, "UNKNOWN"),
+                    "avg_buy_price": avg_buy_price,
+                    "remaining_quantity": remaining_quantity,
+                }
+                for coin_id, (avg_buy_price, remaining_quantity) in holdings.items()
+                if remaining_quantity > 0
+            }
+
+            self.logger.info(
+                f"수익률 계산 완료: 총 {len(sorted_histories)}개 거래 내역 처리, "
+                f"보유 종목 {len(final_holdings)}개"
+            )
+            return sorted_histories, final_holdings
+
+        except Exception as e:
+            self.logger.error(f"수익률 계산 중 에러 발생: {e}")
+            raise e
+
+    def _replay_decimal(
+        self,
+        sorted_histories: List[TradingHistories],
+        initial_holdings: Optional[Dict[int, Dict]],
+    ) -> Dict[int, Tuple[Decimal, Decimal]]:
+        """Decimal 연산으로 거래 내역 순회 (기본 모드)"""
+        with localcontext(_EXACT_CONTEXT):
+            # 보유량 추적 딕셔너리: {coin_id: [avg_buy_price | None, quantity, cost]}
+            holdings: Dict[int, List] = {}
+            for coin_id, data in (initial_holdings or {}).items():
+                avg_buy_price = Decimal(str(data["avg_buy_price"]))
+                quantity = Decimal(str(data["remaining_quantity"]))
+                holdings[coin_id] = [avg_buy_price, quantity, avg_buy_price * quantity]
 
             for history in sorted_histories:
                 coin_id = history.coin_id
@@ -43,41 +178,103 @@ class TradingProfitCalculator:
                 elif trade_type == 1:  # 매도
                     self._process_sell(holdings, coin_id, price, quantity, history)
 
-            self.logger.info(
-                f"수익률 계산 완료: 총 {len(sorted_histories)}개 거래 내역 처리"
-            )
-            return sorted_histories
+            return {
+                coin_id: (_decimal_avg(position), position[1])
+                for coin_id, position in holdings.items()
+                if position[1] > 0
+            }
 
-        except Exception as e:
-            self.logger.error(f"수익률 계산 중 에러 발생: {e}")
-            raise e
+    def _replay_fixed(
+        self,
+        sorted_histories: List[TradingHistories],
+        initial_holdings: Optional[Dict[int, Dict]],
+    ) -> Dict[int, Tuple[Decimal, Decimal]]:
+        """
+        고정소수점 정수 연산으로 거래 내역 순회 (arithmetic="fixed")
+
+        가격/수량은 Numeric(20, 8)과 같은 소수점 8자리 정수, 평단은 소수점 20자리 정수로 계산하고
+        거래 내역에 기록할 때만 float으로 변환합니다. 반올림 위치가 Decimal 모드와 같으므로 결과도 같습니다.
+        """
+        positions: Dict[int, _FixedPosition] = {}
+        for coin_id, data in (initial_holdings or {}).items():
+            avg = avg_to_fixed(data["avg_buy_price"])
+            quantity = to_fixed(data["remaining_quantity"])
+            positions[coin_id] = _FixedPosition(avg, quantity, avg * quantity)
+
+        for history in sorted_histories:
+            coin_id = history.coin_id
+            trade_type = history.trade_type
+            price = to_fixed(history.price)
+            quantity = to_fixed(history.quantity)
+            position = positions.get(coin_id)
+
+            if trade_type == 0:  # 매수
+                if position is None:
+                    # 첫 매수
+                    positions[coin_id] = _FixedPosition(None, quantity, buy_cost(price, quantity))
+                else:
+                    # 기존 보유량이 있는 경우: 원가 누적 (평단은 매도 시점에 계산)
+                    position.avg = None
+                    position.quantity += quantity
+                    position.cost += buy_cost(price, quantity)
+
+                # 매수 시에는 profit_loss_rate와 avg_buy_price를 NULL로 설정
+                history.profit_loss_rate = None
+                history.avg_buy_price = None
+
+            elif trade_type == 1:  # 매도
+                if position is None or position.quantity <= 0 or position.quantity < quantity:
+                    # 보유량이 없거나 매도 수량보다 적은 경우
+                    history.profit_loss_rate = None
+                    history.avg_buy_price = None
+                    continue
+
+                if position.avg is None:
+                    position.avg = avg_from_cost(position.cost, position.quantity)
+                history.profit_loss_rate = hundredths_to_float(
+                    profit_loss_hundredths(price, position.avg)
+                )
+                history.avg_buy_price = avg_to_float(position.avg)
+
+                # 보유량 감소 (보유량이 0이 되면 제거, 평균 단가는 유지)
+                position.quantity -= quantity
+                if position.quantity <= 0:
+                    del positions[coin_id]
+                else:
+                    position.cost = position.avg * position.quantity
+
+        return {
+            coin_id: (
+                avg_to_decimal(
+                    position.avg
+                    if position.avg is not None
+                    else avg_from_cost(position.cost, position.quantity)
+                ),
+                value_to_decimal(position.quantity),
+            )
+            for coin_id, position in positions.items()
+            if position.quantity > 0
+        }
 
     def _process_buy(
         self,
-        holdings: Dict[int, List[Decimal]],
+        holdings: Dict[int, List],
         coin_id: int,
         buy_price: Decimal,
         buy_quantity: Decimal,
         history: TradingHistories,
     ):
-        """매수 처리: 평균 단가 계산 및 보유량 증가"""
+        """매수 처리: 원가 누적 및 보유량 증가"""
         if coin_id not in holdings:
             # 첫 매수
-            holdings[coin_id] = [buy_price, buy_quantity]
+            holdings[coin_id] = [None, buy_quantity, buy_price * buy_quantity]
         else:
-            # 기존 보유량이 있는 경우: 가중 평균 계산
-            old_avg_price, old_quantity = holdings[coin_id]
-
             # 새로운 평균 단가 = (기존 총액 + 신규 총액) / (기존 수량 + 신규 수량)
-            old_total = old_avg_price * old_quantity
-            new_total = buy_price * buy_quantity
-            total_quantity = old_quantity + buy_quantity
-
-            if total_quantity > 0:
-                new_avg_price = (old_total + new_total) / total_quantity
-                holdings[coin_id] = [new_avg_price, total_quantity]
-            else:
-                holdings[coin_id] = [buy_price, buy_quantity]
+            # 총액만 누적하고 평단은 매도 시점에 한 번 계산
+            position = holdings[coin_id]
+            position[0] = None
+            position[1] += buy_quantity
+            position[2] += buy_price * buy_quantity
 
         # 매수 시에는 profit_loss_rate와 avg_buy_price를 NULL로 설정
         history.profit_loss_rate = None
@@ -85,7 +282,7 @@ class TradingProfitCalculator:
 
     def _process_sell(
         self,
-        holdings: Dict[int, List[Decimal]],
+        holdings: Dict[int, List],
         coin_id: int,
         sell_price: Decimal,
         sell_quantity: Decimal,
@@ -98,7 +295,8 @@ class TradingProfitCalculator:
             history.avg_buy_price = None
             return
 
-        avg_buy_price, remaining_quantity = holdings[coin_id]
+        position = holdings[coin_id]
+        remaining_quantity = position[1]
 
         if remaining_quantity < sell_quantity:
             # 보유량이 매도 수량보다 적은 경우
@@ -108,14 +306,8 @@ class TradingProfitCalculator:
 
         # 수익률 계산: ((매도가 - 평균 구매가) / 평균 구매가) * 100
         # 소수점 2째자리까지 반올림
-        if avg_buy_price > 0:
-            profit_loss_rate = ((sell_price - avg_buy_price) / avg_buy_price) * 100
-            # 소수점 2째자리까지 반올림
-            profit_loss_rate = profit_loss_rate.quantize(
-                Decimal("0.01"), rounding=ROUND_HALF_UP
-            )
-        else:
-            profit_loss_rate = Decimal("0.00")
+        avg_buy_price = _decimal_avg(position)
+        profit_loss_rate = _decimal_profit_loss_rate(sell_price, avg_buy_price)
 
         # history에 값 설정
         history.profit_loss_rate = float(profit_loss_rate)
@@ -129,7 +321,7 @@ class TradingProfitCalculator:
             del holdings[coin_id]
         else:
             # 평균 단가는 유지 (FIFO가 아닌 평균 단가 방식)
-            holdings[coin_id] = [avg_buy_price, new_quantity]
+            holdings[coin_id] = [avg_buy_price, new_quantity, avg_buy_price * new_quantity]
 
     def calculate_from_json_data(
         self, json_data: Dict[str, Any]
@@ -156,19 +348,20 @@ class TradingProfitCalculator:
                 key=lambda x: datetime.fromisoformat(x["tradeTime"].replace("Z", "+00:00")),
             )
 
-            # 보유량 추적 딕셔너리: {coin_id: [avg_buy_price, quantity]}
-            holdings: Dict[int, List[Decimal]] = {}
+            # 보유량 추적 딕셔너리: {coin_id: [avg_buy_price | None, quantity, cost]}
+            holdings: Dict[int, List] = {}
 
-            for item in sorted_data:
-                coin_id = item["coinId"]
-                trade_type = item["tradeType"]
-                price = Decimal(str(item["price"]))
-                quantity = Decimal(str(item["quantity"]))
+            with localcontext(_EXACT_CONTEXT):
+                for item in sorted_data:
+                    coin_id = item["coinId"]
+                    trade_type = item["tradeType"]
+                    price = Decimal(str(item["price"]))
+                    quantity = Decimal(str(item["quantity"]))
 
-                if trade_type == 0:  # 매수
-                    self._process_buy_json(holdings, coin_id, price, quantity, item)
-                elif trade_type == 1:  # 매도
-                    self._process_sell_json(holdings, coin_id, price, quantity, item)
+                    if trade_type == 0:  # 매수
+                        self._process_buy_json(holdings, coin_id, price, quantity, item)
+                    elif trade_type == 1:  # 매도
+                        self._process_sell_json(holdings, coin_id, price, quantity, item)
 
             self.logger.info(
                 f"JSON 데이터 수익률 계산 완료: 총 {len(sorted_data)}개 거래 내역 처리"
@@ -181,7 +374,7 @@ class TradingProfitCalculator:
 
     def _process_buy_json(
         self,
-        holdings: Dict[int, List[Decimal]],
+        holdings: Dict[int, List],
         coin_id: int,
         buy_price: Decimal,
         buy_quantity: Decimal,
@@ -189,18 +382,12 @@ class TradingProfitCalculator:
     ):
         """매수 처리 (JSON 데이터용)"""
         if coin_id not in holdings:
-            holdings[coin_id] = [buy_price, buy_quantity]
+            holdings[coin_id] = [None, buy_quantity, buy_price * buy_quantity]
         else:
-            old_avg_price, old_quantity = holdings[coin_id]
-            old_total = old_avg_price * old_quantity
-            new_total = buy_price * buy_quantity
-            total_quantity = old_quantity + buy_quantity
-
-            if total_quantity > 0:
-                new_avg_price = (old_total + new_total) / total_quantity
-                holdings[coin_id] = [new_avg_price, total_quantity]
-            else:
-                holdings[coin_id] = [buy_price, buy_quantity]
+            position = holdings[coin_id]
+            position[0] = None
+            position[1] += buy_quantity
+            position[2] += buy_price * buy_quantity
 
         # 매수 시에는 NULL
         item["profitLossRate"] = None
@@ -208,7 +395,7 @@ class TradingProfitCalculator:
 
     def _process_sell_json(
         self,
-        holdings: Dict[int, List[Decimal]],
+        holdings: Dict[int, List],
         coin_id: int,
         sell_price: Decimal,
         sell_quantity: Decimal,
@@ -220,7 +407,8 @@ class TradingProfitCalculator:
             item["avgBuyPrice"] = None
             return
 
-        avg_buy_price, remaining_quantity = holdings[coin_id]
+        position = holdings[coin_id]
+        remaining_quantity = position[1]
 
         if remaining_quantity < sell_quantity:
             item["profitLossRate"] = None
@@ -228,13 +416,8 @@ class TradingProfitCalculator:
             return
 
         # 수익률 계산
-        if avg_buy_price > 0:
-            profit_loss_rate = ((sell_price - avg_buy_price) / avg_buy_price) * 100
-            profit_loss_rate = profit_loss_rate.quantize(
-                Decimal("0.01"), rounding=ROUND_HALF_UP
-            )
-        else:
-            profit_loss_rate = Decimal("0.00")
+        avg_buy_price = _decimal_avg(position)
+        profit_loss_rate = _decimal_profit_loss_rate(sell_price, avg_buy_price)
 
         # 결과 저장
         item["profitLossRate"] = float(profit_loss_rate)
@@ -246,5 +429,25 @@ class TradingProfitCalculator:
         if new_quantity <= 0:
             del holdings[coin_id]
         else:
-            holdings[coin_id] = [avg_buy_price, new_quantity]
-
+            holdings[coin_id] = [avg_buy_price, new_quantity, avg_buy_price * new_quantity]
+
+
+def create_profit_calculator(backend: Optional[str] = None):
+    """
+    수익률 계산기 백엔드 생성
+
+    Args:
+        backend: "decimal" (기본, TradingProfitCalculator), "fixed" (TradingProfitCalculator 고정소수점 모드)
+            또는 "batch" (BatchProfitCalculator)
+            지정하지 않으면 PROFIT_CALCULATOR_BACKEND 환경변수 사용
+    """
+    backend = (backend or os.getenv("PROFIT_CALCULATOR_BACKEND", "decimal")).lower()
+    if backend == "decimal":
+        return TradingProfitCalculator()
+    if backend == "fixed":
+        return TradingProfitCalculator(arithmetic="fixed")
+    if backend == "batch":
+        from service.batch_profit_calculator import BatchProfitCalculator
+
+        return BatchProfitCalculator()
+    raise ValueError(f"지원하지 않는 수익률 계산기 백엔드입니다: {backend}")
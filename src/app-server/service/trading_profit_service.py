@@ -1,14 +1,10 @@
 import logging
-import uuid
-from typing import List, Dict, Any, Optional
-from decimal import Decimal
-from model.TradingHistories import TradingHistories
-from model.CoinHoldingsPast import CoinHoldingsPast
-from service.trading_profit_calculator import TradingProfitCalculator
+import os
+from typing import Dict, Any
+from database.database_connection import db
+from service.trading_profit_calculator import create_profit_calculator
 from repository.trading_histories_repository import TradingHistoriesRepository
 from repository.coin_holdings_past_repository import CoinHoldingsPastRepository
-from repository.coin_repository import CoinRepository
-from dto.exchange_credentials_dto import ExchangeProvider
 
 
 class TradingProfitService:
@@ -19,12 +15,15 @@ class TradingProfitService:
         self._trading_profit_calculator = None
         self._trading_histories_repository = None
         self._coin_holdings_past_repository = None
-        self._coin_repository = None
+        self._coin_catalog = None
+        self.profit_update_batch_size = int(
+            os.getenv("PROFIT_UPDATE_BATCH_SIZE", "1000")
+        )
 
     @property
     def trading_profit_calculator(self):
         if self._trading_profit_calculator is None:
-            self._trading_profit_calculator = TradingProfitCalculator()
+            self._trading_profit_calculator = create_profit_calculator()
         return self._trading_profit_calculator
 
     @property
@@ -40,13 +39,20 @@ class TradingProfitService:
         return self._coin_holdings_past_repository
 
     @property
-    def coin_repository(self):
-        if self._coin_repository is None:
-            self._coin_repository = CoinRepository()
-        return self._coin_repository
+    def coin_catalog(self):
+        if self._coin_catalog is None:
+            from dependencies import get_coin_catalog
+
+            self._coin_catalog = get_coin_catalog()
+        return self._coin_catalog
 
     def calculate_and_update_profit_loss(
-        self, user_id: str, exchange_code: int, is_initial: bool = False
+        self,
+        user_id: str,
+        exchange_code: int,
+        is_initial: bool = False,
+        force_full: bool = False,
+        include_updated_ids: bool = False,
     ) -> Dict[str, Any]:
         """
         거래 내역 수익률 계산 및 업데이트, 보유 종목 평단 저장
@@ -54,215 +60,140 @@ class TradingProfitService:
         Args:
             user_id: 사용자 UUID
             exchange_code: 거래소 코드
-            is_initial: 최초 fetch 여부 (True: 최초, False: 이후 업데이트)
+            is_initial: 최초 fetch 여부 (저장된 기준점 유무로 다시 판단하므로 참고용)
+            force_full: True면 기준점을 무시하고 전체 거래 내역으로 재계산
+            include_updated_ids: True면 수익률이 바뀐 거래 내역 id 목록(updated_trade_ids)을 결과에 포함
         
         Returns:
             {
-                "updated_count": int,
+                "updated_count": int (실제로 값이 바뀐 거래 내역 수),
                 "holdings_count": int,
-                "deleted_holdings_count": int
+                "deleted_holdings_count": int,
+                "processed_count": int (계산에 사용한 거래 내역 수),
+                "mode": "full" | "incremental",
+                "updated_trade_ids": List[int] (include_updated_ids=True인 경우)
             }
         """
         try:
-            # 1. 사용자의 거래 내역 조회 (trade_time 순으로 정렬)
+            # 1. 기존 보유 종목 평단과 증분 계산 기준점 조회
+            holdings_dict = self.coin_holdings_past_repository.get_holdings_dict(
+                user_id, exchange_code
+            )
+            last_trade_id, last_trade_time = (
+                self.coin_holdings_past_repository.get_high_water_mark(user_id, exchange_code)
+            )
+            if force_full:
+                last_trade_id, last_trade_time = None, None
+
+            # 2. 기준점이 있으면 그 이후 거래만, 없으면 전체 거래 내역 조회
+            # coin_holdings_past에 데이터(기준점)가 없으면 최초로 판단
+            is_initial = last_trade_id is None
             trading_histories = (
-                self.trading_histories_repository.find_by_user_and_exchange(
-                    user_id, exchange_code
+                self.trading_histories_repository.find_for_profit_calculation(
+                    user_id, exchange_code, after_trade_id=last_trade_id
                 )
             )
 
-            if not trading_histories:
-                self.logger.warning(
-                    f"거래 내역이 없습니다: user_id={user_id}, exchange_code={exchange_code}"
+            # 3. 기준점보다 과거 시각의 거래가 새로 들어오면 평단 순서가 바뀌므로 전체 재계산
+            if not is_initial and any(
+                history.trade_time < last_trade_time for history in trading_histories
+            ):
+                self.logger.info(
+                    f"기준점 이전 시각의 거래가 추가되어 전체 재계산: user_id={user_id}, exchange_code={exchange_code}"
                 )
-                return {
+                is_initial = True
+                trading_histories = (
+                    self.trading_histories_repository.find_for_profit_calculation(
+                        user_id, exchange_code
+                    )
+                )
+
+            if not trading_histories:
+                if is_initial:
+                    self.logger.warning(
+                        f"거래 내역이 없습니다: user_id={user_id}, exchange_code={exchange_code}"
+                    )
+                result = {
                     "updated_count": 0,
-                    "holdings_count": 0,
+                    "holdings_count": len(holdings_dict),
                     "deleted_holdings_count": 0,
+                    "processed_count": 0,
+                    "mode": "full" if is_initial else "incremental",
                 }
-
-            # 2. 기존 보유 종목 평단 조회
-            holdings_dict = self.coin_holdings_past_repository.get_holdings_dict(
-                user_id, exchange_code
-            )
-
-            # 3. is_initial 재확인: coin_holdings_past에 데이터가 없으면 최초로 판단
-            # coin_holdings_past 테이블에 실제 데이터가 있는지 확인하는 것이 더 정확함
-            if not holdings_dict:
-                is_initial = True
-                self.logger.info(
-                    f"coin_holdings_past에 데이터가 없어 최초 계산으로 판단: user_id={user_id}, exchange_code={exchange_code}"
-                )
+                if include_updated_ids:
+                    result["updated_trade_ids"] = []
+                return result
+
+            # 4. 수익률 계산 (한 번의 정렬·순회로 거래별 수익률과 최종 보유 종목을 함께 계산)
+            if is_initial:
+                # 최초(또는 재계산)인 경우, 전체 거래 내역을 순회하며 계산
+                initial_holdings = None
             else:
-                is_initial = False
+                # 이후 업데이트인 경우, 기존 보유 종목 평단에 새 거래만 적용
                 self.logger.info(
-                    f"coin_holdings_past에 데이터가 있어 이후 업데이트로 판단: user_id={user_id}, exchange_code={exchange_code}, holdings_count={len(holdings_dict)}"
-                )
-
-            # 4. 수익률 계산
-            # 최초가 아닌 경우, 기존 보유 종목 평단을 사용하여 계산
-            if not is_initial and holdings_dict:
-                updated_histories = self._calculate_with_existing_holdings(
-                    trading_histories, holdings_dict
+                    f"증분 계산: user_id={user_id}, exchange_code={exchange_code}, "
+                    f"new_trades={len(trading_histories)}, holdings_count={len(holdings_dict)}"
                 )
-            else:
-                # 최초인 경우, 전체 거래 내역을 순회하며 계산
-                updated_histories = (
-                    self.trading_profit_calculator.calculate_profit_loss(
-                        trading_histories
-                    )
+                initial_holdings = holdings_dict
+
+            updated_histories, final_holdings = (
+                self.trading_profit_calculator.calculate_profit_loss_with_holdings(
+                    trading_histories,
+                    initial_holdings=initial_holdings,
+                    coin_symbols=self.coin_catalog.get_symbols(
+                        {history.coin_id for history in trading_histories}
+                    ),
                 )
-
-            # 5. 거래 내역 업데이트
-            updated_count = len(updated_histories)
-            self.trading_histories_repository.update_profit_loss(updated_histories)
-
-            # 6. 보유 종목 평단 계산 및 저장
-            final_holdings = self._calculate_final_holdings(updated_histories)
-            holdings_count = len(final_holdings)
-
-            # 7. 보유 종목 평단 저장/업데이트
-            self.coin_holdings_past_repository.save_or_update_holdings(
-                user_id, exchange_code, final_holdings
             )
 
-            # 8. 보유 수량이 0인 종목 삭제
-            coin_ids_with_holdings = {
-                coin_id
-                for coin_id, data in final_holdings.items()
-                if data["remaining_quantity"] > 0
-            }
-            deleted_count = (
-                self.coin_holdings_past_repository.delete_holdings_not_in_list(
-                    user_id, exchange_code, coin_ids_with_holdings
+            # 5. 거래 내역 수익률, 보유 종목 평단 스냅샷과 새 기준점을 한 트랜잭션으로 저장
+            #    (중간에 실패하면 기준점과 거래 내역이 어긋나지 않도록 모두 롤백)
+            #    거래 id는 trade_time 순서와 무관하게 저장 순서로 증가하므로 id 기준점과 시각 기준점을 따로 계산
+            last_trade_id = max(history.id for history in updated_histories)
+            last_trade_time = max(history.trade_time for history in updated_histories)
+            holdings_count = len(final_holdings)
+            session = db.get_session()
+            try:
+                updated_ids = self.trading_histories_repository.update_profit_loss(
+                    updated_histories,
+                    batch_size=self.profit_update_batch_size,
+                    session=session,
                 )
-            )
+                snapshot = self.coin_holdings_past_repository.replace_holdings(
+                    user_id,
+                    exchange_code,
+                    final_holdings,
+                    last_trade_id=last_trade_id,
+                    last_trade_time=last_trade_time,
+                    session=session,
+                )
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+
+            updated_count = len(updated_ids)
+            deleted_count = snapshot["deleted_count"]
 
             self.logger.info(
                 f"수익률 계산 및 업데이트 완료: user_id={user_id}, exchange_code={exchange_code}, "
+                f"mode={'full' if is_initial else 'incremental'}, processed={len(updated_histories)}, "
                 f"updated={updated_count}, holdings={holdings_count}, deleted={deleted_count}"
             )
 
-            return {
+            result = {
                 "updated_count": updated_count,
                 "holdings_count": holdings_count,
                 "deleted_holdings_count": deleted_count,
+                "processed_count": len(updated_histories),
+                "mode": "full" if is_initial else "incremental",
             }
+            if include_updated_ids:
+                result["updated_trade_ids"] = updated_ids
+            return result
 
         except Exception as e:
             self.logger.error(f"수익률 계산 및 업데이트 중 에러 발생: {e}")
             raise e
-
-    def _calculate_with_existing_holdings(
-        self,
-        trading_histories: List[TradingHistories],
-        existing_holdings: Dict[int, Dict],
-    ) -> List[TradingHistories]:
-        """
-        기존 보유 종목 평단을 사용하여 수익률 계산 (이후 업데이트인 경우)
-        
-        Args:
-            trading_histories: 거래 내역 목록
-            existing_holdings: 기존 보유 종목 평단 딕셔너리
-        
-        Returns:
-            수익률이 계산된 거래 내역 목록
-        """
-        try:
-            # trade_time 순으로 정렬 (과거부터 현재 순)
-            sorted_histories = sorted(
-                trading_histories, key=lambda x: x.trade_time
-            )
-
-            # 기존 보유 종목 평단을 holdings 딕셔너리로 변환
-            holdings: Dict[int, List[Decimal]] = {}
-            for coin_id, data in existing_holdings.items():
-                holdings[coin_id] = [
-                    Decimal(str(data["avg_buy_price"])),
-                    Decimal(str(data["remaining_quantity"])),
-                ]
-
-            # 새로운 거래 내역만 순회하며 계산
-            for history in sorted_histories:
-                coin_id = history.coin_id
-                trade_type = history.trade_type
-                price = Decimal(str(history.price))
-                quantity = Decimal(str(history.quantity))
-
-                if trade_type == 0:  # 매수
-                    self.trading_profit_calculator._process_buy(
-                        holdings, coin_id, price, quantity, history
-                    )
-                elif trade_type == 1:  # 매도
-                    self.trading_profit_calculator._process_sell(
-                        holdings, coin_id, price, quantity, history
-                    )
-
-            return sorted_histories
-
-        except Exception as e:
-            self.logger.error(f"기존 보유 종목 평단을 사용한 수익률 계산 중 에러 발생: {e}")
-            raise e
-
-    def _calculate_final_holdings(
-        self, trading_histories: List[TradingHistories]
-    ) -> Dict[int, Dict]:
-        """
-        최종 보유 종목 평단 계산
-        
-        Args:
-            trading_histories: 거래 내역 목록
-        
-        Returns:
-            {coin_id: {"symbol": str, "avg_buy_price": Decimal, "remaining_quantity": Decimal}}
-        """
-        try:
-            # trade_time 순으로 정렬 (과거부터 현재 순)
-            sorted_histories = sorted(
-                trading_histories, key=lambda x: x.trade_time
-            )
-
-            # 보유량 추적 딕셔너리: {coin_id: [avg_buy_price, quantity]}
-            holdings: Dict[int, List[Decimal]] = {}
-            # 코인 심볼 추적: {coin_id: symbol}
-            coin_symbols: Dict[int, str] = {}
-            
-            # 모든 코인 정보 조회
-            coins = self.coin_repository.get_all_coins()
-            coin_map = {coin.id: coin.symbol for coin in coins}
-
-            for history in sorted_histories:
-                coin_id = history.coin_id
-                trade_type = history.trade_type
-                price = Decimal(str(history.price))
-                quantity = Decimal(str(history.quantity))
-
-                # 코인 심볼 저장 (첫 거래에서)
-                if coin_id not in coin_symbols:
-                    coin_symbols[coin_id] = coin_map.get(coin_id, "UNKNOWN")
-
-                if trade_type == 0:  # 매수
-                    self.trading_profit_calculator._process_buy(
-                        holdings, coin_id, price, quantity, history
-                    )
-                elif trade_type == 1:  # 매도
-                    self.trading_profit_calculator._process_sell(
-                        holdings, coin_id, price, quantity, history
-                    )
-
-            # 최종 보유 종목 딕셔너리 생성
-            final_holdings = {}
-            for coin_id, (avg_buy_price, remaining_quantity) in holdings.items():
-                if remaining_quantity > 0:  # 보유 수량이 0보다 큰 경우만 저장
-                    final_holdings[coin_id] = {
-                        "symbol": coin_symbols.get(coin_id, "UNKNOWN"),
-                        "avg_buy_price": avg_buy_price,
-                        "remaining_quantity": remaining_quantity,
-                    }
-
-            return final_holdings
-
-        except Exception as e:
-            self.logger.error(f"최종 보유 종목 평단 계산 중 에러 발생: {e}")
-            raise e
-
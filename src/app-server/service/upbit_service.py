@@ -1,24 +1,106 @@
 from dotenv import load_dotenv
-from utils.upbit_http_client import UpbitHttpClient
+from utils.upbit_http_client import UpbitHttpClient, UpbitHttpClientError
 import logging
-from utils.time_utils import get_all_trading_time_ranges, get_current_korea_time
-from datetime import datetime
+from utils.time_utils import (
+    KOREA_TIMEZONE,
+    AdaptiveTimeWindowPlanner,
+    WindowPlanStats,
+    format_iso8601,
+    get_current_korea_time,
+    parse_iso8601,
+)
+from datetime import datetime, timedelta
 import pytz
 import time
+import os
 from utils.http_client import Http_client
-from typing import List, Dict, Any, Optional
+from utils.master_data_fetcher import CachedMasterDataFetcher, MasterDataResult
+from utils.concurrent_fetcher import fetch_concurrently
+from typing import List, Dict, Any, Optional, Callable, Tuple
 
 load_dotenv()
 
+# /v1/orders/closed 1회 조회 최대 개수
+CLOSED_ORDERS_PAGE_LIMIT = 1000
+
+# /v1/candles/days 1회 조회 최대 개수
+DAY_CANDLES_PAGE_LIMIT = 200
+
+CRIX_MASTER_URL = "https://crix-static.upbit.com/crix_master"
+CRIX_MASTER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+    "Origin": "https://upbit.com",
+    "Referer": "https://upbit.com/",
+    "Connection": "keep-alive",
+    "Sec-Fetch-Dest": "empty",
+    "Sec-Fetch-Mode": "cors",
+    "Sec-Fetch-Site": "cross-site",
+}
+
 
 class UpbitService:
-    def __init__(self):
-        self.upbit_http_client = UpbitHttpClient()
+    def __init__(
+        self,
+        upbit_http_client: Optional[UpbitHttpClient] = None,
+        async_upbit_http_client: Optional[Any] = None,
+    ):
+        self.order_fetch_workers = int(os.getenv("UPBIT_ORDER_FETCH_WORKERS", "8"))
+        self.order_fetch_max_retries = int(os.getenv("UPBIT_ORDER_FETCH_MAX_RETRIES", "3"))
+        self.upbit_http_client = upbit_http_client or UpbitHttpClient(
+            pool_maxsize=self.order_fetch_workers
+        )
+        self._async_upbit_http_client = async_upbit_http_client
+        self._coin_master_fetcher = None
         self.logger = logging.getLogger(__name__)
 
+    @property
+    def async_upbit_http_client(self):
+        if self._async_upbit_http_client is None:
+            from utils.async_upbit_http_client import AsyncUpbitHttpClient
+
+            # 동기/비동기 클라이언트가 같은 요청 수 제한 버킷을 공유
+            self._async_upbit_http_client = AsyncUpbitHttpClient(
+                rate_limiter=self.upbit_http_client.rate_limiter,
+                max_connections=self.order_fetch_workers * 2,
+                max_keepalive_connections=self.order_fetch_workers,
+            )
+        return self._async_upbit_http_client
+
     def fetch_all_trading_uuids(
         self, access_key: str, secret_key: str, start_time: Optional[datetime] = None
     ):
+        try:
+            closed_orders = self.fetch_all_closed_orders(
+                access_key, secret_key, start_time
+            )
+            return [order.get("uuid") for order in closed_orders]
+        except Exception as e:
+            raise e
+
+    def fetch_all_closed_orders(
+        self, access_key: str, secret_key: str, start_time: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """체결 수량이 있는 종료 주문(/v1/orders/closed) 목록 조회"""
+        try:
+            closed_orders, _ = self.scan_closed_orders(
+                access_key, secret_key, start_time
+            )
+            return closed_orders
+        except Exception as e:
+            raise e
+
+    def scan_closed_orders(
+        self, access_key: str, secret_key: str, start_time: Optional[datetime] = None
+    ) -> Tuple[List[Dict[str, Any]], WindowPlanStats]:
+        """
+        적응형 시간 구간으로 종료 주문 목록을 조회합니다.
+
+        Returns:
+            (체결 수량이 있는 종료 주문 목록, 구간 조회 통계)
+        """
         try:
             # start_time이 None이면 기본값 사용
             if start_time is None:
@@ -31,95 +113,240 @@ class UpbitService:
                     first_time = start_time
 
             current_time = get_current_korea_time()
-            time_ranges = get_all_trading_time_ranges(first_time, current_time)
 
-            all_uuids = []
+            # Upbit는 한 번에 최대 7일, 1000개까지만 조회 가능
+            planner = AdaptiveTimeWindowPlanner(
+                first_time,
+                current_time,
+                max_window=timedelta(days=7),
+                page_limit=CLOSED_ORDERS_PAGE_LIMIT,
+            )
+
+            closed_orders: Dict[str, Dict[str, Any]] = {}
 
-            for i, (range_start, range_end) in enumerate(time_ranges):
+            for range_start, range_end in planner:
                 params = {
                     "states[]": ["done", "cancel"],
-                    "start_time": range_start,
-                    "end_time": range_end,
-                    "limit": 1000,
+                    "start_time": format_iso8601(range_start),
+                    "end_time": format_iso8601(range_end),
+                    "limit": CLOSED_ORDERS_PAGE_LIMIT,
                 }
 
                 response = self.upbit_http_client.get(
                     "/v1/orders/closed", access_key, secret_key, params, True
                 )
 
-                if response is None:
+                if not response:
+                    planner.report(0)
                     continue
 
+                oldest_time = None
                 for r in response:
-                    if isinstance(r, dict) and r.get("executed_volume") == "0":
+                    if not isinstance(r, dict):
                         continue
 
-                    if isinstance(r, dict) and r.get("uuid"):
-                        all_uuids.append(r.get("uuid"))
+                    if r.get("created_at"):
+                        created_at = parse_iso8601(r["created_at"])
+                        if oldest_time is None or created_at < oldest_time:
+                            oldest_time = created_at
 
-                if (i + 1) % 25 == 0:
-                    time.sleep(1)
+                    if r.get("executed_volume") == "0":
+                        continue
+
+                    if r.get("uuid"):
+                        closed_orders.setdefault(r["uuid"], r)
 
-            return all_uuids
+                planner.report(len(response), oldest_time)
+
+            self.logger.info(
+                f"종료 주문 조회 완료: orders={len(closed_orders)}, stats={planner.stats}"
+            )
+            return list(closed_orders.values()), planner.stats
         except Exception as e:
             raise e
 
-    def fetch_all_trading_history(self, access_key: str, secret_key: str, uuids: list):
+    def probe_first_activity(
+        self, access_key: str, secret_key: str
+    ) -> Optional[datetime]:
+        """
+        계정의 첫 활동 시점 조회
+
+        거래하려면 먼저 입금이 있어야 하므로 가장 오래된 입금 시각을 첫 활동 시점으로 봅니다.
+        종료 주문 조회는 7일 단위로만 가능해 주문 목록으로는 과거 활동 유무를
+        한 번에 확인할 수 없기 때문입니다.
+
+        Returns:
+            첫 활동 일자의 0시 (KST), 확인할 수 없으면 None
+        """
         try:
-            trading_histories = []
+            params = {"order_by": "asc", "limit": 1}
+            response = self.upbit_http_client.get(
+                "/v1/deposits", access_key, secret_key, params, True
+            )
+        except UpbitHttpClientError as e:
+            # 입금 조회 권한이 없는 키 등은 기존 전체 기간 조회로 대체
+            self.logger.warning(f"첫 활동 시점 조회 실패: {e}")
+            return None
+
+        if not response or not isinstance(response, list):
+            return None
+
+        created_at = response[0].get("created_at") if isinstance(response[0], dict) else None
+        if not created_at:
+            return None
+
+        first_activity = parse_iso8601(created_at).astimezone(KOREA_TIMEZONE)
+        return first_activity.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def fetch_trading_histories_listing_first(
+        self,
+        access_key: str,
+        secret_key: str,
+        start_time: Optional[datetime] = None,
+        on_progress: Optional[Callable[[int, int], Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        종료 주문 목록만으로 체결 내역을 만들고, 평균 체결가를 알 수 없는 주문만 상세 조회합니다.
+
+        Args:
+            access_key: Upbit access key
+            secret_key: Upbit secret key
+            start_time: 조회 시작 시간 (None이면 전체 기간)
+            on_progress: 상세 조회 진행률 콜백 (완료 개수, 전체 개수)
+
+        Returns:
+            /v1/order 응답 형식(trades 포함)의 주문 목록
+        """
+        try:
+            closed_orders = self.fetch_all_closed_orders(
+                access_key, secret_key, start_time
+            )
 
-            time.sleep(1)
-            for i, uuid in enumerate(uuids):
-                if (i + 1) % 25 == 0:
-                    time.sleep(1)
+            orders: List[Optional[Dict[str, Any]]] = []
+            detail_uuids = []
+            detail_positions = []
+
+            for order in closed_orders:
+                listed_order = self._build_order_from_listing(order)
+                if listed_order is None:
+                    detail_positions.append(len(orders))
+                    detail_uuids.append(order.get("uuid"))
+                orders.append(listed_order)
+
+            if detail_uuids:
+                details = self.fetch_all_trading_history(
+                    access_key, secret_key, detail_uuids, on_progress
+                )
+                details_by_uuid = {detail.get("uuid"): detail for detail in details}
+                for position, uuid in zip(detail_positions, detail_uuids):
+                    orders[position] = details_by_uuid.get(uuid)
+
+            self.logger.info(
+                f"종료 주문 {len(closed_orders)}개 중 상세 조회 {len(detail_uuids)}개"
+            )
+            return [order for order in orders if order is not None]
 
+        except Exception as e:
+            raise Exception(f"fetch_trading_histories_listing_first: {e}") from e
+
+    def _build_order_from_listing(
+        self, order: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        종료 주문 목록 항목을 /v1/order 상세 응답 형식으로 변환합니다.
+        목록의 price는 주문 가격이라 실제 체결가와 다를 수 있으므로,
+        체결 총액(executed_funds)이 있는 경우에만 평균 체결가를 계산할 수 있습니다.
+        """
+        executed_volume = order.get("executed_volume")
+        executed_funds = order.get("executed_funds")
+
+        if executed_volume is None or executed_funds is None:
+            return None
+
+        try:
+            if float(executed_volume) <= 0 or float(executed_funds) <= 0:
+                return None
+        except (TypeError, ValueError):
+            return None
+
+        return {
+            **order,
+            "trades": [{"volume": executed_volume, "funds": executed_funds}],
+        }
+
+    def fetch_all_trading_history(
+        self,
+        access_key: str,
+        secret_key: str,
+        uuids: list,
+        on_progress: Optional[Callable[[int, int], Any]] = None,
+    ):
+        """
+        주문 UUID 목록의 상세 내역을 동시에 조회합니다.
+        요청 속도는 UpbitHttpClient의 rate limiter가 Remaining-Req 헤더를 따라 조절합니다.
+
+        Args:
+            access_key: Upbit access key
+            secret_key: Upbit secret key
+            uuids: 조회할 주문 UUID 목록
+            on_progress: (완료 개수, 전체 개수)를 받는 진행률 콜백
+
+        Returns:
+            uuids 순서대로 정렬된 주문 상세 목록
+        """
+        try:
+
+            def fetch_order(uuid: str):
                 params = {"uuid": uuid}
-                response = self.upbit_http_client.get(
+                return self.upbit_http_client.get(
                     "/v1/order", access_key, secret_key, params, True
                 )
 
-                if response is None:
-                    continue
-
-                trading_histories.append(response)
+            responses = fetch_concurrently(
+                uuids,
+                fetch_order,
+                max_workers=self.order_fetch_workers,
+                max_retries=self.order_fetch_max_retries,
+                on_progress=on_progress,
+            )
 
-            return trading_histories
+            return [response for response in responses if response is not None]
 
         except Exception as e:
-            raise e
+            raise Exception(f"fetch_all_trading_history: {e}") from e
+
+    @property
+    def coin_master_fetcher(self) -> CachedMasterDataFetcher:
+        if self._coin_master_fetcher is None:
+            self._coin_master_fetcher = CachedMasterDataFetcher(
+                CRIX_MASTER_URL,
+                cache_path=os.getenv(
+                    "COIN_MASTER_CACHE_PATH", "data/cache/crix_master.json"
+                ),
+                headers=CRIX_MASTER_HEADERS,
+            )
+        return self._coin_master_fetcher
 
-    def fetch_all_coin_list(self) -> Any:
-        try:
-            base_url = "https://crix-static.upbit.com/crix_master"
-
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36",
-                "Accept": "application/json, text/plain, */*",
-                "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
-                "Accept-Encoding": "gzip, deflate, br",
-                "Origin": "https://upbit.com",
-                "Referer": "https://upbit.com/",
-                "Connection": "keep-alive",
-                "Sec-Fetch-Dest": "empty",
-                "Sec-Fetch-Mode": "cors",
-                "Sec-Fetch-Site": "cross-site",
-            }
-
-            client = Http_client(base_url, headers)
-            response = client.get_with_nonce()
-
-            if response:
-                # self.download_image(response, "https://static.upbit.com/logos/", "data/image/")
-
-                return response
-            else:
-                self.logger.error("코인 목록 가져오기 실패")
-                return None
+    def fetch_coin_master(self, force: bool = False) -> MasterDataResult:
+        """
+        crix_master 코인 목록 조회 (조건부 요청 + 디스크 캐시)
 
+        Args:
+            force: True면 캐시를 무시하고 다시 받고 changed=True로 반환
+        """
+        try:
+            return self.coin_master_fetcher.fetch(force=force)
         except Exception as e:
             self.logger.error(f"코인 목록 가져오기 중 에러 발생: {e}")
             raise e
 
+    def mark_coin_master_applied(self, content_hash: str):
+        """조회한 코인 목록을 DB에 반영했음을 기록"""
+        self.coin_master_fetcher.mark_applied(content_hash)
+
+    def fetch_all_coin_list(self) -> Any:
+        return self.fetch_coin_master().data
+
     def download_image(self, coin_list: List[Dict[Any, Any]], url: str, save_path: str):
         try:
             client = Http_client(url)
@@ -134,6 +361,24 @@ class UpbitService:
         except Exception as e:
             raise e
 
+    def fetch_day_candles(
+        self, market: str, to: Optional[datetime] = None, count: int = DAY_CANDLES_PAGE_LIMIT
+    ) -> List[Dict[str, Any]]:
+        """
+        일봉 캔들 조회 (최신순)
+
+        Args:
+            market: 마켓 코드 (KRW-BTC)
+            to: 이 시각(UTC, 미포함) 이전 캔들 조회, None이면 최신 캔들부터
+            count: 조회할 캔들 수 (최대 200)
+        """
+        params: Dict[str, Any] = {"market": market, "count": count}
+        if to is not None:
+            params["to"] = to.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        response = self.upbit_http_client.get("/v1/candles/days", "", "", params, False)
+        return response or []
+
     def fetch_accounts(self, access_key: str, secret_key: str) -> List[Dict[str, Any]]:
         """Upbit 계정 잔고 조회"""
         try:
@@ -150,3 +395,22 @@ class UpbitService:
         except Exception as e:
             self.logger.error(f"계정 잔고 조회 중 에러 발생: {e}")
             raise e
+
+    async def fetch_accounts_async(
+        self, access_key: str, secret_key: str
+    ) -> List[Dict[str, Any]]:
+        """Upbit 계정 잔고 조회 (async)"""
+        try:
+            response = await self.async_upbit_http_client.get(
+                "/v1/accounts", access_key, secret_key, None, True
+            )
+
+            if response is None:
+                self.logger.warning("계정 잔고 조회 결과가 None입니다")
+                return []
+
+            return response if isinstance(response, list) else [response]
+
+        except Exception as e:
+            self.logger.error(f"계정 잔고 조회 중 에러 발생: {e}")
+            raise e
@@ -101,3 +101,20 @@ class UserService:
         except Exception as e:
             self.logger.error(f"사용자 거래내역 업데이트 시간 갱신 실패: user_id={user_id}, error={e}")
             raise e
+
+    def update_user_first_trading_activity_at(
+        self, user_id: str, first_trading_activity_at: datetime
+    ):
+        try:
+            user = self.user_repository.find_by_id(user_id)
+            if user:
+                user.first_trading_activity_at = first_trading_activity_at
+                self.user_repository.save_user(user)
+                self.logger.info(
+                    f"사용자 첫 거래 활동 시점 저장: user_id={user_id}, first_trading_activity_at={first_trading_activity_at}"
+                )
+            else:
+                self.logger.warning(f"사용자를 찾을 수 없습니다: user_id={user_id}")
+        except Exception as e:
+            self.logger.error(f"사용자 첫 거래 활동 시점 저장 실패: user_id={user_id}, error={e}")
+            raise e
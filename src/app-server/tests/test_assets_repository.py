@@ -0,0 +1,72 @@
+from decimal import Decimal
+from unittest.mock import Mock, patch
+from sqlalchemy.dialects import postgresql
+import model.Users  # noqa: F401  (relationship 대상 모델 등록)
+import model.ExchangeCredentials  # noqa: F401
+import model.Coins  # noqa: F401
+import model.TradingHistories  # noqa: F401
+import model.CoinHoldingsPast  # noqa: F401
+import model.CoinPricesDay  # noqa: F401
+from model.Assets import Assets
+from repository.assets_repository import AssetsRepository
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def _asset(symbol: str, quantity: str) -> Assets:
+    return Assets(
+        coin_id=1,
+        symbol=symbol,
+        trade_by_symbol="KRW",
+        quantity=Decimal(quantity),
+        locked_quantity=Decimal("0"),
+        avg_buy_price=Decimal("100"),
+        avg_buy_price_modified=False,
+    )
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestAssetsRepository:
+    """AssetsRepository 테스트"""
+
+    @patch("repository.assets_repository.db")
+    def test_sync_assets_upserts_and_deletes_in_one_transaction(self, mock_db):
+        """UPSERT 한 번 + DELETE 한 번으로 동기화하고 변경/변경 없음/삭제 수 반환"""
+        mock_session = Mock()
+        mock_db.get_session.return_value = mock_session
+        upsert_result = Mock()
+        upsert_result.scalars.return_value.all.return_value = [10]
+        delete_result = Mock(rowcount=2)
+        mock_session.execute.side_effect = [upsert_result, delete_result]
+
+        result = AssetsRepository().sync_assets(
+            USER_ID, 1, [_asset("BTC", "1"), _asset("ETH", "2")]
+        )
+
+        assert result["changed_count"] == 1
+        assert result["unchanged_count"] == 1
+        assert result["deleted_count"] == 2
+        assert mock_session.execute.call_count == 2
+        mock_session.commit.assert_called_once()
+
+        upsert_sql = _compile(mock_session.execute.call_args_list[0][0][0])
+        delete_sql = _compile(mock_session.execute.call_args_list[1][0][0])
+        assert "ON CONFLICT ON CONSTRAINT uk_assets_user_exchange_symbol DO UPDATE" in upsert_sql
+        assert "IS DISTINCT FROM excluded.quantity" in upsert_sql
+        assert "NOT IN" in delete_sql
+
+    @patch("repository.assets_repository.db")
+    def test_sync_empty_balance_deletes_all(self, mock_db):
+        """잔고가 비어 있으면 UPSERT 없이 해당 거래소 자산 전체 삭제"""
+        mock_session = Mock()
+        mock_db.get_session.return_value = mock_session
+        mock_session.execute.return_value = Mock(rowcount=3)
+
+        result = AssetsRepository().sync_assets(USER_ID, 1, [])
+
+        assert result["deleted_count"] == 3
+        assert mock_session.execute.call_count == 1
+        assert "NOT IN" not in _compile(mock_session.execute.call_args[0][0])
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+from unittest.mock import Mock
+import pytest
+from service.assets_service import accounts_payload_hash
+from service.balance_sync_scheduler import BalanceSyncScheduler, percentile
+
+
+def _credentials(user_id):
+    return SimpleNamespace(user_id=user_id, access_key=f"access-{user_id}", secret_key="secret")
+
+
+def _account(currency, balance):
+    return {"currency": currency, "unit_currency": "KRW", "balance": balance}
+
+
+@pytest.fixture
+def scheduler():
+    """서비스를 Mock으로 교체한 BalanceSyncScheduler"""
+    scheduler = BalanceSyncScheduler(interval_seconds=60, max_workers=2)
+    scheduler._exchange_credentials_service = Mock()
+    scheduler._exchange_credentials_service.get_all_decrypted_credentials.return_value = [
+        _credentials("user-1"),
+        _credentials("user-2"),
+    ]
+    scheduler._upbit_service = Mock()
+    scheduler._upbit_service.fetch_accounts.side_effect = lambda access_key, secret_key: [
+        _account("BTC", "1")
+    ]
+    scheduler._assets_service = Mock()
+    return scheduler
+
+
+class TestBalanceSyncScheduler:
+    """전체 사용자 잔고 동기화 테스트"""
+
+    def test_payload_hash_ignores_account_order(self):
+        """잔고 응답 순서가 달라도 같은 해시"""
+        accounts = [_account("BTC", "1"), _account("ETH", "2")]
+
+        assert accounts_payload_hash(accounts) == accounts_payload_hash(accounts[::-1])
+        assert accounts_payload_hash(accounts) != accounts_payload_hash(accounts[:1])
+
+    def test_unchanged_balances_skip_db_write(self, scheduler):
+        """두 번째 주기에서 잔고가 같은 사용자는 DB 쓰기를 건너뜀"""
+        first = scheduler.run_cycle()
+        second = scheduler.run_cycle()
+
+        assert first["synced_count"] == 2
+        assert second["unchanged_count"] == 2
+        assert scheduler._assets_service.apply_upbit_accounts.call_count == 2
+        # 자격증명은 주기마다 한 번씩만 복호화
+        assert scheduler._exchange_credentials_service.get_all_decrypted_credentials.call_count == 2
+
+    def test_failed_user_does_not_stop_cycle(self, scheduler):
+        """한 사용자 실패는 기록만 하고 나머지는 계속 동기화, 다음 주기에 다시 시도"""
+
+        def fetch_accounts(access_key, secret_key):
+            if access_key == "access-user-1":
+                raise RuntimeError("timeout")
+            return [_account("BTC", "1")]
+
+        scheduler._upbit_service.fetch_accounts.side_effect = fetch_accounts
+
+        summary = scheduler.run_cycle()
+
+        assert summary["failed_count"] == 1
+        assert summary["failed"] == [{"user_id": "user-1", "error": "timeout"}]
+        assert summary["synced_count"] == 1
+        assert summary["latency_ms"]["p50"] is not None
+        assert "user-1" not in scheduler._payload_hashes
+
+    def test_percentile(self):
+        """nearest-rank 백분위수"""
+        values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+        assert percentile(values, 50) == 5
+        assert percentile(values, 95) == 10
+        assert percentile([], 50) is None
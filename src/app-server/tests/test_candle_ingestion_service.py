@@ -0,0 +1,150 @@
+import json
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import Mock
+from urllib.parse import parse_qs, urlparse
+import pytest
+from service.candle_ingestion_service import CandleIngestionService
+from service.upbit_service import UpbitService
+from utils.upbit_http_client import UpbitHttpClient
+
+# 스텁 서버가 제공하는 마켓별 일봉 기간 (상장일 ~ 마지막 캔들)
+LAST_DAY = datetime(2025, 1, 31)
+LISTED_DAYS = {"KRW-BTC": 25, "KRW-ETH": 7}
+
+
+def _candle(market, day):
+    return {
+        "market": market,
+        "candle_date_time_utc": day.strftime("%Y-%m-%dT%H:%M:%S"),
+        "candle_date_time_kst": (day + timedelta(hours=9)).strftime("%Y-%m-%dT%H:%M:%S"),
+        "opening_price": 100.0,
+        "high_price": 110.0,
+        "low_price": 90.0,
+        "trade_price": 105.0,
+        "timestamp": int(day.timestamp() * 1000),
+        "candle_acc_trade_price": 1000.0,
+        "candle_acc_trade_volume": 10.0,
+        "prev_closing_price": 100.0,
+        "change_price": 5.0,
+        "change_rate": 0.05,
+    }
+
+
+class _CandleStubHandler(BaseHTTPRequestHandler):
+    """/v1/candles/days 스텁 (최신순, to 미포함, count개)"""
+
+    requests = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        _CandleStubHandler.requests.append(query)
+
+        market = query["market"]
+        count = int(query.get("count", 200))
+        to = (
+            datetime.strptime(query["to"], "%Y-%m-%dT%H:%M:%SZ")
+            if "to" in query
+            else LAST_DAY + timedelta(days=1)
+        )
+        first_day = LAST_DAY - timedelta(days=LISTED_DAYS[market] - 1)
+        days = []
+        day = to - timedelta(days=1)
+        while day >= first_day and len(days) < count:
+            days.append(day)
+            day -= timedelta(days=1)
+
+        body = json.dumps([_candle(market, day) for day in days]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Remaining-Req", "group=candles; min=600; sec=9")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    _CandleStubHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CandleStubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def ingestion_service(stub_server):
+    """스텁 서버를 보는 UpbitService와 Mock 저장소를 사용하는 CandleIngestionService"""
+    service = CandleIngestionService(max_workers=2, page_size=10)
+    service._upbit_service = UpbitService(upbit_http_client=UpbitHttpClient(base_url=stub_server))
+    service._coin_catalog = Mock()
+    service._coin_catalog.all.return_value = [
+        SimpleNamespace(id=1, market_code="KRW-BTC", is_active=True),
+        SimpleNamespace(id=2, market_code="KRW-ETH", is_active=True),
+        SimpleNamespace(id=3, market_code="KRW-OLD", is_active=False),
+    ]
+    service._coin_prices_day_repository = Mock()
+    service._coin_prices_day_repository.upsert_candles.side_effect = lambda rows: len(rows)
+    service._price_history_store = Mock()
+    return service
+
+
+class TestCandleIngestionService:
+    """일봉 수집 테스트 (로컬 스텁 서버)"""
+
+    def test_backfill_pages_back_to_listing(self, ingestion_service):
+        """저장된 캔들이 없으면 상장일까지 과거로 페이지 조회"""
+        ingestion_service._coin_prices_day_repository.find_latest_candle_times.return_value = {}
+
+        summary = ingestion_service.ingest_daily_candles()
+
+        assert summary["market_count"] == 2
+        assert summary["backfill_count"] == 2
+        assert summary["written_count"] == 25 + 7
+        # BTC: 10 + 10 + 5, ETH: 7
+        assert summary["request_count"] == 4
+        assert summary["failed"] == []
+        ingestion_service._price_history_store.sync_from_db.assert_called_once()
+
+        saved = {
+            call.args[0][0]["market_code"]: call.args[0]
+            for call in ingestion_service._coin_prices_day_repository.upsert_candles.call_args_list
+        }
+        btc_days = [row["candle_date_time_utc"] for row in saved["KRW-BTC"]]
+        assert len(set(btc_days)) == 25
+        assert max(btc_days) == LAST_DAY
+        assert min(btc_days) == LAST_DAY - timedelta(days=24)
+
+    def test_incremental_fetches_only_after_latest(self, ingestion_service):
+        """저장된 마지막 캔들부터 다시 받고 그 이전은 조회하지 않음"""
+        ingestion_service._coin_prices_day_repository.find_latest_candle_times.return_value = {
+            1: LAST_DAY - timedelta(days=2),
+            2: LAST_DAY,
+        }
+
+        summary = ingestion_service.ingest_daily_candles()
+
+        assert summary["backfill_count"] == 0
+        assert summary["request_count"] == 2
+        assert summary["written_count"] == 3 + 1
+        assert all("to" not in query for query in _CandleStubHandler.requests)
+
+    def test_failed_market_is_reported(self, ingestion_service):
+        """한 마켓 실패는 요약에 기록하고 다른 마켓은 계속 수집"""
+        ingestion_service._coin_prices_day_repository.find_latest_candle_times.return_value = {}
+        ingestion_service._coin_catalog.all.return_value.append(
+            SimpleNamespace(id=4, market_code="KRW-NONE", is_active=True)
+        )
+        ingestion_service.max_retries = 0
+
+        summary = ingestion_service.ingest_daily_candles()
+
+        assert [failed["market_code"] for failed in summary["failed"]] == ["KRW-NONE"]
+        assert summary["written_count"] == 25 + 7
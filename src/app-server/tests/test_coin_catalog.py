@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+from unittest.mock import Mock
+from service.coin_catalog import CoinCatalog
+
+
+def _coin(id, symbol, quote_currency="KRW"):
+    return SimpleNamespace(
+        id=id,
+        symbol=symbol,
+        quote_currency=quote_currency,
+        market_code=f"{quote_currency}-{symbol}",
+        korean_name=None,
+        english_name=None,
+        img_url=None,
+        exchange="UPBIT",
+        is_active=True,
+    )
+
+
+def _catalog(coins, **kwargs):
+    coin_repository = Mock()
+    coin_repository.get_all_coins.return_value = coins
+    return CoinCatalog(coin_repository, **kwargs), coin_repository
+
+
+class TestCoinCatalog:
+    """코인 카탈로그 캐시 테스트"""
+
+    def test_lookups_use_single_load(self):
+        """id, market_code, (symbol, quote_currency) 조회는 한 번만 DB를 읽음"""
+        catalog, coin_repository = _catalog(
+            [_coin(1, "BTC"), _coin(2, "ETH"), _coin(3, "ETH", "BTC")]
+        )
+
+        assert catalog.get_by_id(2).symbol == "ETH"
+        assert catalog.get_by_market_code("BTC-ETH").id == 3
+        assert catalog.get_by_symbol("BTC", "KRW").id == 1
+        assert catalog.get_symbols({1, 2}) == {1: "BTC", 2: "ETH"}
+        assert coin_repository.get_all_coins.call_count == 1
+
+    def test_ttl_expiry_reloads(self):
+        """TTL이 지나면 다음 조회 시 다시 읽음"""
+        catalog, coin_repository = _catalog([_coin(1, "BTC")], ttl_seconds=0)
+
+        catalog.get_by_id(1)
+        catalog.get_by_id(1)
+
+        assert coin_repository.get_all_coins.call_count == 2
+
+    def test_miss_reloads_once_within_interval(self):
+        """없는 코인 조회 시 최소 간격 안에서는 한 번만 다시 읽음"""
+        catalog, coin_repository = _catalog(
+            [_coin(1, "BTC")], miss_refresh_interval=0
+        )
+        catalog.load()
+        coin_repository.get_all_coins.return_value = [_coin(1, "BTC"), _coin(2, "SOL")]
+
+        assert catalog.get_by_market_code("KRW-SOL").id == 2
+
+        catalog.miss_refresh_interval = 3600
+        assert catalog.get_by_market_code("KRW-DOGE") is None
+        assert catalog.get_by_market_code("KRW-DOGE") is None
+        assert coin_repository.get_all_coins.call_count == 2
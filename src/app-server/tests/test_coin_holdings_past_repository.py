@@ -0,0 +1,83 @@
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import Mock, patch
+from sqlalchemy.dialects import postgresql
+import model.Users  # noqa: F401  (relationship 대상 모델 등록)
+import model.ExchangeCredentials  # noqa: F401
+import model.Coins  # noqa: F401
+import model.TradingHistories  # noqa: F401
+import model.Assets  # noqa: F401
+import model.CoinPricesDay  # noqa: F401
+from repository.coin_holdings_past_repository import CoinHoldingsPastRepository
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def _holding(symbol: str, quantity: str):
+    return {
+        "symbol": symbol,
+        "avg_buy_price": Decimal("100"),
+        "remaining_quantity": Decimal(quantity),
+    }
+
+
+class TestCoinHoldingsPastRepository:
+    """CoinHoldingsPastRepository 테스트"""
+
+    def test_replace_holdings_uses_caller_session(self):
+        """호출 측 세션에서 UPSERT 한 번 + DELETE 한 번 실행하고 commit하지 않음"""
+        session = Mock()
+        session.execute.side_effect = [Mock(), Mock(rowcount=1), Mock()]
+
+        result = CoinHoldingsPastRepository().replace_holdings(
+            USER_ID,
+            1,
+            {1: _holding("BTC", "1"), 2: _holding("ETH", "0")},
+            last_trade_id=5,
+            last_trade_time=datetime(2025, 1, 1),
+            session=session,
+        )
+
+        assert result == {"saved_count": 1, "deleted_count": 1}
+        assert session.execute.call_count == 3
+        session.commit.assert_not_called()
+        session.close.assert_not_called()
+
+        upsert_sql = str(
+            session.execute.call_args_list[0][0][0].compile(dialect=postgresql.dialect())
+        )
+        assert "ON CONFLICT ON CONSTRAINT uk_coin_holdings_past_user_coin_exchange" in upsert_sql
+        mark_sql = str(
+            session.execute.call_args_list[2][0][0].compile(dialect=postgresql.dialect())
+        )
+        assert "ON CONFLICT ON CONSTRAINT uk_profit_calculation_marks_user_exchange" in mark_sql
+
+    @patch("repository.coin_holdings_past_repository.db")
+    def test_mark_kept_when_no_holdings_remain(self, mock_db):
+        """보유 종목이 모두 삭제되어도 기준점은 profit_calculation_marks에 저장"""
+        mock_session = Mock()
+        mock_db.get_session.return_value = mock_session
+        mock_session.execute.side_effect = [Mock(rowcount=2), Mock()]
+
+        result = CoinHoldingsPastRepository().replace_holdings(
+            USER_ID, 1, {}, last_trade_id=7, last_trade_time=datetime(2025, 1, 1)
+        )
+
+        assert result == {"saved_count": 0, "deleted_count": 2}
+        mark_stmt = mock_session.execute.call_args_list[1][0][0]
+        assert mark_stmt.table.name == "profit_calculation_marks"
+        mock_session.commit.assert_called_once()
+
+    @patch("repository.coin_holdings_past_repository.db")
+    def test_replace_with_empty_holdings_deletes_all(self, mock_db):
+        """보유 종목이 없으면 전체 삭제 후 자체 세션 commit"""
+        mock_session = Mock()
+        mock_db.get_session.return_value = mock_session
+        mock_session.execute.return_value = Mock(rowcount=2)
+
+        result = CoinHoldingsPastRepository().replace_holdings(USER_ID, 1, {})
+
+        assert result == {"saved_count": 0, "deleted_count": 2}
+        mock_session.execute.assert_called_once()
+        mock_session.commit.assert_called_once()
+        mock_session.close.assert_called_once()
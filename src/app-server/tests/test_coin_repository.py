@@ -0,0 +1,61 @@
+from unittest.mock import Mock, patch
+from sqlalchemy.dialects import postgresql
+import model.Users  # noqa: F401  (relationship 대상 모델 등록)
+import model.ExchangeCredentials  # noqa: F401
+import model.TradingHistories  # noqa: F401
+import model.Assets  # noqa: F401
+import model.CoinHoldingsPast  # noqa: F401
+import model.CoinPricesDay  # noqa: F401
+from model.Coins import Coins
+from repository.coin_repository import CoinRepository
+
+
+def _coin(symbol: str, korean_name: str = None) -> Coins:
+    return Coins(
+        symbol=symbol,
+        quote_currency="KRW",
+        market_code=f"KRW-{symbol}",
+        korean_name=korean_name or symbol,
+        exchange="UPBIT",
+    )
+
+
+class TestCoinRepository:
+    """CoinRepository 테스트"""
+
+    @patch("repository.coin_repository.db")
+    def test_save_coin_list_bulk_upsert(self, mock_db):
+        """ON CONFLICT DO UPDATE 일괄 저장 후 추가/변경/비활성화/변경 없음 개수 반환"""
+        mock_session = Mock()
+        mock_db.get_session.return_value = mock_session
+        # BTC 추가, ETH 변경, XRP는 값이 같아 반환되지 않음
+        mock_session.execute.return_value.scalars.return_value = [True, False]
+        mock_session.query.return_value.filter.return_value.update.return_value = 1
+
+        result = CoinRepository().save_coin_list(
+            [_coin("BTC"), _coin("ETH"), _coin("XRP"), _coin("XRP")]
+        )
+
+        assert result == {"new": 1, "updated": 1, "deactivated": 1, "unchanged": 1}
+        mock_session.execute.assert_called_once()
+        mock_session.add.assert_not_called()
+        mock_session.commit.assert_called_once()
+
+        sql = str(
+            mock_session.execute.call_args[0][0].compile(dialect=postgresql.dialect())
+        )
+        assert "ON CONFLICT (market_code) DO UPDATE" in sql
+        assert "IS DISTINCT FROM excluded.korean_name" in sql
+        assert "RETURNING xmax = 0" in sql
+
+    @patch("repository.coin_repository.db")
+    def test_save_empty_coin_list_does_not_deactivate(self, mock_db):
+        """빈 목록이면 기존 종목을 비활성화하지 않음"""
+        mock_session = Mock()
+        mock_db.get_session.return_value = mock_session
+
+        result = CoinRepository().save_coin_list([])
+
+        assert result == {"new": 0, "updated": 0, "deactivated": 0, "unchanged": 0}
+        mock_session.execute.assert_not_called()
+        mock_session.query.assert_not_called()
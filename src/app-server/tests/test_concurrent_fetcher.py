@@ -0,0 +1,148 @@
+import time
+import pytest
+from utils.concurrent_fetcher import fetch_concurrently, call_with_retry
+from utils.rate_limiter import TokenBucket, UpbitRateLimiter, parse_remaining_req
+from utils.upbit_http_client import UpbitHttpClientError
+
+
+class TestRateLimiter:
+    """Upbit rate limiter 테스트"""
+
+    def test_parse_remaining_req(self):
+        """Remaining-Req 헤더 파싱"""
+        result = parse_remaining_req("group=default; min=1800; sec=29")
+
+        assert result == {"group": "default", "min": "1800", "sec": "29"}
+        assert parse_remaining_req(None) == {}
+
+    def test_token_bucket_reserve_delay(self):
+        """버킷이 비면 대기 시간 반환"""
+        bucket = TokenBucket(rate_per_sec=10, capacity=2)
+
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+
+    def test_observe_remaining_req_drains_bucket(self):
+        """서버 잔여 요청 수가 적으면 버킷 잔량 보정"""
+        limiter = UpbitRateLimiter({"default": 10})
+
+        limiter.observe("key", "group=default; min=500; sec=0")
+
+        assert limiter.reserve("key", "default") > 0
+
+    def test_buckets_are_separated_by_key(self):
+        """access key별로 버킷 분리"""
+        limiter = UpbitRateLimiter({"default": 1})
+
+        assert limiter.reserve("key-1", "default") == 0.0
+        assert limiter.reserve("key-2", "default") == 0.0
+
+
+class TestConcurrentFetcher:
+    """동시 조회 엔진 테스트"""
+
+    def test_results_keep_input_order(self):
+        """완료 순서와 관계없이 입력 순서대로 결과 반환"""
+
+        def fetch(item):
+            time.sleep(0.01 * (5 - item))
+            return item * 10
+
+        result = fetch_concurrently([1, 2, 3, 4], fetch, max_workers=4)
+
+        assert result == [10, 20, 30, 40]
+
+    def test_retryable_error_is_retried(self):
+        """429/5xx 에러는 백오프 후 재시도"""
+        calls = {"count": 0}
+
+        def fetch():
+            calls["count"] += 1
+            if calls["count"] < 3:
+                raise UpbitHttpClientError("rate limited", status_code=429)
+            return "ok"
+
+        assert call_with_retry(fetch, max_retries=3, backoff_base=0) == "ok"
+        assert calls["count"] == 3
+
+    def test_non_retryable_error_is_raised(self):
+        """4xx 에러는 재시도 없이 전파"""
+        calls = {"count": 0}
+
+        def fetch(item):
+            calls["count"] += 1
+            raise UpbitHttpClientError("not found", status_code=404)
+
+        with pytest.raises(UpbitHttpClientError):
+            fetch_concurrently(["a"], fetch, backoff_base=0)
+
+        assert calls["count"] == 1
+
+    def test_progress_callback(self):
+        """진행률 콜백 호출"""
+        progress = []
+
+        fetch_concurrently(
+            [1, 2, 3],
+            lambda item: item,
+            max_workers=1,
+            on_progress=lambda done, total: progress.append((done, total)),
+        )
+
+        assert progress == [(1, 3), (2, 3), (3, 3)]
+
+
+class TestUpbitJwtSigner:
+    """캐시된 JWT 서명기 테스트"""
+
+    def test_signed_token_is_valid_hs256_jwt(self):
+        """PyJWT로 검증 가능한 토큰 생성"""
+        import jwt
+        from utils.upbit_http_client import create_query_hash, get_jwt_signer
+
+        params = {"states[]": ["done", "cancel"], "limit": 1000}
+
+        token = get_jwt_signer("access", "secret").sign(params)
+        payload = jwt.decode(token, "secret", algorithms=["HS256"])
+
+        assert payload["access_key"] == "access"
+        assert payload["query_hash"] == create_query_hash(params)
+        assert payload["query_hash_alg"] == "SHA512"
+
+    def test_signer_is_cached_per_credential_pair(self):
+        """같은 자격증명 쌍은 서명기를 재사용하고 nonce는 매번 다름"""
+        from utils.upbit_http_client import get_jwt_signer
+
+        signer = get_jwt_signer("access", "secret")
+
+        assert get_jwt_signer("access", "secret") is signer
+        assert get_jwt_signer("access", "other") is not signer
+        assert signer.sign() != signer.sign()
+
+    def test_cache_does_not_keep_plaintext_secret(self):
+        """캐시 키에는 secret key 해시만 보관"""
+        import utils.upbit_http_client as client_module
+
+        client_module.get_jwt_signer("access", "plain-secret")
+
+        for access_key, secret_hash in client_module._jwt_signers:
+            assert secret_hash != "plain-secret"
+
+    def test_signer_expires_and_cache_is_bounded(self, monkeypatch):
+        """TTL이 지나면 새로 만들고, 크기를 넘으면 오래된 서명기부터 버림"""
+        import utils.upbit_http_client as client_module
+
+        now = [1000.0]
+        monkeypatch.setattr(client_module.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(client_module, "JWT_SIGNER_TTL_SECONDS", 60)
+        monkeypatch.setattr(client_module, "JWT_SIGNER_CACHE_SIZE", 2)
+        monkeypatch.setattr(client_module, "_jwt_signers", client_module.OrderedDict())
+
+        signer = client_module.get_jwt_signer("a1", "s1")
+        now[0] += 61
+        assert client_module.get_jwt_signer("a1", "s1") is not signer
+
+        client_module.get_jwt_signer("a2", "s2")
+        client_module.get_jwt_signer("a3", "s3")
+        assert [key[0] for key in client_module._jwt_signers] == ["a2", "a3"]
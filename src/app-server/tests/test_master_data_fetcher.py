@@ -0,0 +1,67 @@
+import json
+from unittest.mock import Mock
+from utils.master_data_fetcher import CachedMasterDataFetcher
+
+
+def _response(status_code, body=b"", headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.content = body
+    response.headers = headers or {}
+    return response
+
+
+class TestCachedMasterDataFetcher:
+    """조건부 요청 마스터 데이터 조회기 테스트"""
+
+    def test_conditional_request_uses_disk_cache(self, tmp_path):
+        """두 번째 요청은 ETag를 보내고 304면 디스크 캐시 반환"""
+        body = json.dumps([{"pair": "BTC/KRW"}]).encode()
+        session = Mock()
+        session.get.side_effect = [
+            _response(200, body, {"ETag": '"v1"'}),
+            _response(304),
+        ]
+        fetcher = CachedMasterDataFetcher(
+            "https://example.com/master", str(tmp_path / "master.json"), session=session
+        )
+
+        first = fetcher.fetch()
+        fetcher.mark_applied(first.content_hash)
+        second = fetcher.fetch()
+
+        assert first.changed is True
+        assert second.not_modified is True
+        assert second.changed is False
+        assert second.data == [{"pair": "BTC/KRW"}]
+        assert session.get.call_args_list[1][1]["headers"]["If-None-Match"] == '"v1"'
+
+    def test_same_content_without_etag_is_unchanged(self, tmp_path):
+        """ETag가 없어도 내용 해시가 같으면 changed=False"""
+        body = b'[{"pair": "ETH/KRW"}]'
+        session = Mock()
+        session.get.side_effect = [_response(200, body), _response(200, body)]
+        fetcher = CachedMasterDataFetcher(
+            "https://example.com/master", str(tmp_path / "master.json"), session=session
+        )
+
+        fetcher.mark_applied(fetcher.fetch().content_hash)
+        result = fetcher.fetch()
+
+        assert result.changed is False
+        assert result.not_modified is False
+
+    def test_unapplied_content_stays_changed(self, tmp_path):
+        """DB 반영 전에는 304를 받아도 changed=True"""
+        session = Mock()
+        session.get.side_effect = [
+            _response(200, b"[]", {"ETag": '"v1"'}),
+            _response(304),
+        ]
+        fetcher = CachedMasterDataFetcher(
+            "https://example.com/master", str(tmp_path / "master.json"), session=session
+        )
+
+        fetcher.fetch()
+
+        assert fetcher.fetch().changed is True
@@ -0,0 +1,199 @@
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import Mock
+import numpy as np
+import pytest
+from service.portfolio_series_service import (
+    PortfolioSeriesService,
+    build_position_steps,
+    trade_day_ordinal,
+)
+from service.price_history_store import PriceHistoryStore
+
+USER_ID = "bd70f700-5399-46e5-837d-2fc978b3c3b7"
+
+
+def _trade(trade_id, coin_id, trade_type, price, quantity, trade_time):
+    return SimpleNamespace(
+        id=trade_id,
+        coin_id=coin_id,
+        trade_type=trade_type,
+        price=Decimal(str(price)),
+        quantity=Decimal(str(quantity)),
+        trade_time=trade_time,
+    )
+
+
+# trade_time은 KST naive (KST 10시 = 같은 날 UTC 1시)
+TRADES = [
+    _trade(1, 1, 0, 100, 2, datetime(2025, 1, 1, 10)),
+    _trade(2, 1, 0, 130, 1, datetime(2025, 1, 1, 15)),
+    _trade(3, 2, 0, 10, 5, datetime(2025, 1, 2, 10)),
+    _trade(4, 1, 1, 150, 1, datetime(2025, 1, 3, 10)),
+    _trade(5, 2, 1, 12, 9, datetime(2025, 1, 3, 11)),  # 보유량보다 많은 매도는 무시
+    _trade(6, 2, 1, 12, 5, datetime(2025, 1, 4, 10)),
+]
+
+
+class TestBuildPositionSteps:
+    """거래내역 → 일별 보유 수량/원가 step function"""
+
+    def test_trade_day_uses_utc_candle_day(self):
+        """KST 9시 이전 체결은 전날 UTC 일봉에 속함"""
+        assert trade_day_ordinal(datetime(2025, 1, 2, 8, 59)) == date(2025, 1, 1).toordinal()
+        assert trade_day_ordinal(datetime(2025, 1, 2, 9, 0)) == date(2025, 1, 2).toordinal()
+
+    def test_quantity_and_cost_basis(self):
+        steps = build_position_steps(TRADES)
+
+        assert steps.first_day == date(2025, 1, 1).toordinal()
+        assert steps.last_day == date(2025, 1, 4).toordinal()
+        assert steps.coin_ids.tolist() == [1, 2]
+        # coin 1: 2@100 + 1@130 → 평단 110, 1개 매도 후 2개 (원가 220)
+        assert steps.quantity[0].tolist() == [3, 3, 2, 2]
+        assert steps.cost_basis[0].tolist() == [330, 330, 220, 220]
+        # coin 2: 1/2 매수, 1/3 초과 매도 무시, 1/4 전량 매도
+        assert steps.quantity[1].tolist() == [0, 5, 5, 0]
+        assert steps.cost_basis[1].tolist() == [0, 50, 50, 0]
+
+    def test_window_pads_before_and_after(self):
+        steps = build_position_steps(TRADES)
+
+        quantity, cost_basis = steps.window(
+            date(2024, 12, 31).toordinal(), date(2025, 1, 6).toordinal()
+        )
+
+        assert quantity[0].tolist() == [0, 3, 3, 2, 2, 2, 2]
+        assert cost_basis[0].tolist() == [0, 330, 330, 220, 220, 220, 220]
+
+    def test_no_trades(self):
+        assert build_position_steps([]) is None
+
+
+@pytest.fixture
+def series_service(tmp_path):
+    store = PriceHistoryStore(directory=str(tmp_path))
+    days = [date(2025, 1, day) for day in range(1, 5)]
+    store.append([1] * 4, days, {"close": [100.0, 120.0, 150.0, 140.0]})
+    # coin 2는 1/2 종가만 있음 (1/3은 직전 종가 사용)
+    store.append([2], [days[1]], {"close": [11.0]})
+
+    service = PortfolioSeriesService()
+    service._price_history_store = store
+    service._coin_catalog = Mock()
+    quotes = {1: "KRW", 2: "KRW", 3: "BTC"}
+    service._coin_catalog.get_by_id.side_effect = lambda coin_id: SimpleNamespace(
+        quote_currency=quotes[coin_id]
+    )
+    service._trading_histories_repository = Mock()
+    service._trading_histories_repository.find_last_trade_id.return_value = 6
+    service._trading_histories_repository.find_position_columns.return_value = TRADES
+    return service
+
+
+class TestPortfolioSeriesService:
+    """포트폴리오 시계열 계산과 캐시"""
+
+    def test_series_values(self, series_service):
+        result = series_service.get_series(USER_ID, 1, end=date(2025, 1, 5))
+
+        krw = result["currencies"]["KRW"]
+        assert result["dates"] == [f"2025-01-0{day}" for day in range(1, 6)]
+        assert list(result["currencies"]) == ["KRW"]
+        assert krw["value"] == [300.0, 360.0 + 55.0, 300.0 + 55.0, 280.0, 280.0]
+        assert krw["cost_basis"] == [330.0, 380.0, 270.0, 220.0, 220.0]
+        assert krw["unrealized_profit_loss"] == [-30.0, 35.0, 85.0, 60.0, 60.0]
+        assert result["unpriced_coin_ids"] == []
+        assert result["cached"] is False
+
+    def test_mixed_quote_currencies_are_not_summed(self, series_service):
+        """BTC 마켓 보유분은 BTC 단위로 따로 합산"""
+        repository = series_service._trading_histories_repository
+        repository.find_last_trade_id.return_value = 8
+        repository.find_position_columns.return_value = TRADES + [
+            _trade(8, 3, 0, "0.001", 10, datetime(2025, 1, 2, 10))
+        ]
+        series_service._price_history_store.append(
+            [3, 3], [date(2025, 1, 2), date(2025, 1, 3)], {"close": [0.0012, 0.0015]}
+        )
+
+        result = series_service.get_series(
+            USER_ID, 1, start=date(2025, 1, 2), end=date(2025, 1, 3)
+        )
+
+        assert sorted(result["currencies"]) == ["BTC", "KRW"]
+        krw, btc = result["currencies"]["KRW"], result["currencies"]["BTC"]
+        assert krw["value"] == [415.0, 355.0]
+        assert btc["value"] == pytest.approx([0.012, 0.015])
+        assert btc["cost_basis"] == pytest.approx([0.01, 0.01])
+        assert btc["unrealized_profit_loss"] == pytest.approx([0.002, 0.005])
+
+    def test_unpriced_holding_is_reported(self, series_service, tmp_path):
+        series_service._price_history_store = PriceHistoryStore(
+            directory=str(tmp_path / "empty")
+        )
+
+        result = series_service.get_series(
+            USER_ID, 1, start=date(2025, 1, 2), end=date(2025, 1, 2)
+        )
+
+        krw = result["currencies"]["KRW"]
+        assert krw["value"] == [0.0]
+        assert krw["cost_basis"] == [380.0]
+        assert krw["unrealized_profit_loss"] == [0.0]
+        assert result["unpriced_coin_ids"] == [1, 2]
+
+    def test_cache_by_last_trade_id(self, series_service):
+        """같은 last_trade_id면 거래내역을 다시 읽지 않고, 새 거래가 저장되면 다시 계산"""
+        repository = series_service._trading_histories_repository
+
+        series_service.get_series(USER_ID, 1, end=date(2025, 1, 4))
+        second = series_service.get_series(USER_ID, 1, end=date(2025, 1, 4))
+        assert second["cached"] is True
+        assert repository.find_position_columns.call_count == 1
+
+        repository.find_last_trade_id.return_value = 7
+        repository.find_position_columns.return_value = TRADES + [
+            _trade(7, 1, 1, 150, 2, datetime(2025, 1, 4, 10))
+        ]
+        third = series_service.get_series(USER_ID, 1, end=date(2025, 1, 4))
+
+        assert third["cached"] is False
+        assert third["currencies"]["KRW"]["value"][-1] == 0.0
+        assert repository.find_position_columns.call_count == 2
+        assert list(series_service._cache) == [(USER_ID, 1, 7)]
+
+    def test_no_trades_returns_empty_series(self, series_service):
+        series_service._trading_histories_repository.find_last_trade_id.return_value = None
+
+        result = series_service.get_series(USER_ID, 1)
+
+        assert result["dates"] == [] and result["currencies"] == {}
+        series_service._trading_histories_repository.find_position_columns.assert_not_called()
+
+    def test_invalid_range(self, series_service):
+        with pytest.raises(ValueError):
+            series_service.get_series(USER_ID, 1, start=date(2025, 1, 3), end=date(2025, 1, 1))
+
+    def test_matches_sequential_replay(self, series_service):
+        """벡터화 결과가 날짜별 순차 재계산 결과와 같음"""
+        result = series_service.get_series(USER_ID, 1, end=date(2025, 1, 4))
+        closes = {1: [100.0, 120.0, 150.0, 140.0], 2: [np.nan, 11.0, 11.0, 11.0]}
+
+        for index, day in enumerate(range(1, 5)):
+            holdings = {}
+            for trade in TRADES:
+                if trade_day_ordinal(trade.trade_time) > date(2025, 1, day).toordinal():
+                    break
+                held = holdings.get(trade.coin_id, 0)
+                if trade.trade_type == 0:
+                    holdings[trade.coin_id] = held + float(trade.quantity)
+                elif float(trade.quantity) <= held:
+                    holdings[trade.coin_id] = held - float(trade.quantity)
+            expected = sum(
+                quantity * closes[coin_id][index]
+                for coin_id, quantity in holdings.items()
+                if quantity > 0
+            )
+            assert result["currencies"]["KRW"]["value"][index] == pytest.approx(expected)
@@ -0,0 +1,182 @@
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import Mock
+import numpy as np
+import pytest
+from service.price_history_store import BASE_DATE, COIN_CAPACITY_STEP, PriceHistoryStore
+
+DAY = date(2025, 1, 1)
+
+
+def _days(count):
+    return [DAY + timedelta(days=offset) for offset in range(count)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceHistoryStore(directory=str(tmp_path))
+
+
+class TestPriceHistoryStore:
+    """열 단위 가격 저장소 테스트"""
+
+    def test_append_and_price_on(self, store):
+        """기록한 날짜는 값, 기록하지 않은 날짜와 코인은 None"""
+        written = store.append([1, 1, 2], [DAY, DAY + timedelta(days=1), DAY], {"close": [10.0, 11.0, 20.0]})
+
+        assert written == 3
+        assert store.price_on(1, DAY) == 10.0
+        assert store.price_on(1, datetime(2025, 1, 2, 0, 0)) == 11.0
+        assert store.price_on(2, DAY) == 20.0
+        assert store.price_on(2, DAY + timedelta(days=1)) is None
+        assert store.price_on(3, DAY) is None
+        assert store.price_on(1, DAY, field="volume") is None
+
+    def test_range_returns_dates_and_view(self, store):
+        """기간 조회는 [start, end) 날짜와 값을 반환"""
+        days = _days(5)
+        store.append([1] * 5, days, {"close": [1.0, 2.0, 3.0, 4.0, 5.0]})
+
+        dates, values = store.range(1, days[1], days[4])
+
+        assert list(dates) == [np.datetime64(day) for day in days[1:4]]
+        assert values.tolist() == [2.0, 3.0, 4.0]
+
+    def test_range_outside_stored_days_is_nan(self, store):
+        """BASE_DATE 이전이나 미등록 코인은 NaN"""
+        start = BASE_DATE - timedelta(days=2)
+        store.append([1], [BASE_DATE], {"close": [7.0]})
+
+        _, values = store.range(1, start, BASE_DATE + timedelta(days=1))
+        _, unknown = store.range(99, DAY, DAY + timedelta(days=3))
+
+        assert np.isnan(values[:2]).all()
+        assert values[2] == 7.0
+        assert np.isnan(unknown).all() and len(unknown) == 3
+
+    def test_matrix(self, store):
+        """여러 코인 기간 행렬, 미등록 코인은 NaN 행"""
+        days = _days(3)
+        store.append([1] * 3 + [2] * 3, days * 2, {"close": [1.0, 2.0, 3.0, 10.0, 20.0, 30.0]})
+
+        _, matrix = store.matrix([2, 99, 1], days[0], days[-1] + timedelta(days=1))
+
+        assert matrix.shape == (3, 3)
+        assert matrix[0].tolist() == [10.0, 20.0, 30.0]
+        assert np.isnan(matrix[1]).all()
+        assert matrix[2].tolist() == [1.0, 2.0, 3.0]
+
+    def test_grows_coins_and_days(self, store):
+        """용량을 넘는 코인/날짜는 배열을 키우고 기존 값은 유지"""
+        store.append([1], [DAY], {"close": [1.0]})
+        capacity_days = store._meta["day_capacity"]
+        far_day = BASE_DATE + timedelta(days=capacity_days + 10)
+        coin_ids = list(range(2, COIN_CAPACITY_STEP + 3))
+
+        store.append(coin_ids + [1], [DAY] * len(coin_ids) + [far_day], {"close": [2.0] * len(coin_ids) + [3.0]})
+
+        assert store._meta["version"] == 2
+        assert store._meta["coin_capacity"] > COIN_CAPACITY_STEP
+        assert store.price_on(1, DAY) == 1.0
+        assert store.price_on(1, far_day) == 3.0
+        assert store.price_on(coin_ids[-1], DAY) == 2.0
+
+    def test_readonly_reader_sees_flushed_data(self, store, tmp_path):
+        """readonly 저장소는 writer 변경과 용량 확장 후 meta.json을 보고 다시 엶"""
+        store.append([1], [DAY], {"close": [1.0]})
+        store.flush()
+        reader = PriceHistoryStore(directory=str(tmp_path), readonly=True)
+        assert reader.price_on(1, DAY) == 1.0
+
+        coin_ids = list(range(2, COIN_CAPACITY_STEP + 3))
+        store.append(coin_ids, [DAY] * len(coin_ids), {"close": [5.0] * len(coin_ids)})
+        store.flush()
+
+        assert reader.price_on(coin_ids[-1], DAY) == 5.0
+        with pytest.raises(ValueError):
+            reader.append([1], [DAY], {"close": [1.0]})
+
+    def test_readonly_without_files_is_empty(self, tmp_path):
+        reader = PriceHistoryStore(directory=str(tmp_path / "missing"), readonly=True)
+
+        assert reader.price_on(1, DAY) is None
+        assert np.isnan(reader.matrix([1], DAY, DAY + timedelta(days=1))[1]).all()
+
+    def test_sync_from_db_is_incremental(self, store, tmp_path):
+        """마지막 updated_at 이후 행만 요청하고 기준점을 meta에 저장"""
+        updated_at = datetime(2025, 1, 2, 9, 0)
+        rows = [
+            SimpleNamespace(
+                coin_id=1,
+                candle_date_time_utc=datetime(2025, 1, 1),
+                close=100.0,
+                high=110.0,
+                low=90.0,
+                volume=None,
+                updated_at=updated_at,
+            )
+        ]
+        store._coin_prices_day_repository = Mock()
+        store._coin_prices_day_repository.stream_price_columns.return_value = iter([rows])
+
+        result = store.sync_from_db()
+
+        assert result["row_count"] == 1
+        assert store._coin_prices_day_repository.stream_price_columns.call_args.kwargs["updated_after"] is None
+        assert store.price_on(1, DAY) == 100.0
+        assert store.price_on(1, DAY, field="high") == 110.0
+        assert store.price_on(1, DAY, field="volume") is None
+
+        reopened = PriceHistoryStore(directory=str(tmp_path))
+        reopened._coin_prices_day_repository = Mock()
+        reopened._coin_prices_day_repository.stream_price_columns.return_value = iter([])
+        reopened.sync_from_db()
+
+        assert reopened._coin_prices_day_repository.stream_price_columns.call_args.kwargs["updated_after"] == updated_at
+        assert reopened.price_on(1, DAY) == 100.0
+
+    def test_two_writers_share_directory(self, tmp_path):
+        """writer가 둘이어도 코인 행 배정과 용량 확장을 서로 반영"""
+        cli = PriceHistoryStore(directory=str(tmp_path))
+        server = PriceHistoryStore(directory=str(tmp_path))
+
+        cli.append([7], [DAY], {"close": [7.0]})
+        server.append([9], [DAY], {"close": [9.0]})
+        assert server.price_on(7, DAY) == 7.0
+        assert server._coin_rows[7] != server._coin_rows[9]
+
+        # cli가 용량을 늘려 v1 파일을 지운 뒤에도 server가 쓰고 다시 열 수 있음
+        coin_ids = list(range(100, 100 + COIN_CAPACITY_STEP))
+        cli.append(coin_ids, [DAY] * len(coin_ids), {"close": [1.0] * len(coin_ids)})
+        server.flush(synced_until=None)
+        server.append([9], [DAY + timedelta(days=1)], {"close": [10.0]})
+
+        reopened = PriceHistoryStore(directory=str(tmp_path), readonly=True)
+        assert reopened._meta["version"] == 2
+        assert reopened.price_on(7, DAY) == 7.0
+        assert reopened.price_on(9, DAY) == 9.0
+        assert reopened.price_on(9, DAY + timedelta(days=1)) == 10.0
+        assert reopened.price_on(coin_ids[-1], DAY) == 1.0
+
+    def test_sync_if_empty(self, store):
+        """한 번도 동기화하지 않은 저장소만 전체 동기화"""
+        store._coin_prices_day_repository = Mock()
+        store._coin_prices_day_repository.stream_price_columns.return_value = iter(
+            [
+                [
+                    SimpleNamespace(
+                        coin_id=1,
+                        candle_date_time_utc=datetime(2025, 1, 1),
+                        close=1.0,
+                        high=1.0,
+                        low=1.0,
+                        volume=1.0,
+                        updated_at=datetime(2025, 1, 2),
+                    )
+                ]
+            ]
+        )
+
+        assert store.sync_if_empty()["row_count"] == 1
+        assert store.sync_if_empty() is None
+        assert store._coin_prices_day_repository.stream_price_columns.call_count == 1
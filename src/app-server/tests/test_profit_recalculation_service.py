@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+import pytest
+import service.profit_recalculation_service as recalculation_module
+from service.profit_recalculation_service import ProfitRecalculationService
+
+
+@pytest.fixture
+def recalculation_service(monkeypatch):
+    """process pool 대신 thread pool로 실행하는 ProfitRecalculationService"""
+    calls = []
+
+    def recalculate_pair(user_id, exchange_code):
+        calls.append((user_id, exchange_code))
+        if user_id == "broken":
+            raise Exception("boom")
+        return {"pid": 1, "processed_count": 10, "updated_count": 3, "elapsed": 0.5}
+
+    def thread_pool(max_workers, mp_context, initializer):
+        assert mp_context.get_start_method() == "spawn"
+        return ThreadPoolExecutor(max_workers=max_workers, initializer=initializer)
+
+    monkeypatch.setattr(recalculation_module, "ProcessPoolExecutor", thread_pool)
+    monkeypatch.setattr(recalculation_module, "_init_worker", lambda: None)
+    monkeypatch.setattr(recalculation_module, "_recalculate_pair", recalculate_pair)
+
+    service = ProfitRecalculationService()
+    service._trading_histories_repository = Mock()
+    service.calls = calls
+    return service
+
+
+class TestProfitRecalculationService:
+    """전체 사용자 수익률 재계산 테스트"""
+
+    def test_reports_worker_throughput_and_failures(self, recalculation_service, tmp_path):
+        """worker별 처리량과 실패 항목 보고"""
+        recalculation_service.trading_histories_repository.find_user_exchange_pairs.return_value = [
+            ("u1", 1),
+            ("u2", 1),
+            ("broken", 1),
+        ]
+
+        summary = recalculation_service.recalculate_all(
+            workers=2, checkpoint_path=str(tmp_path / "checkpoint")
+        )
+
+        assert summary["completed_count"] == 2
+        assert summary["failed"][0]["user_id"] == "broken"
+        # 실패가 남으면 checkpoint 유지
+        assert sorted((tmp_path / "checkpoint").read_text().splitlines()) == ["u1:1", "u2:1"]
+        assert summary["workers"]["1"] == {
+            "pairs": 2,
+            "trades": 20,
+            "busy_seconds": 1.0,
+            "trades_per_second": 20.0,
+        }
+
+    def test_resume_skips_completed_pairs(self, recalculation_service, tmp_path):
+        """checkpoint에 기록된 항목은 다시 계산하지 않음"""
+        checkpoint_path = tmp_path / "checkpoint"
+        checkpoint_path.write_text("u1:1\n")
+        recalculation_service.trading_histories_repository.find_user_exchange_pairs.return_value = [
+            ("u1", 1),
+            ("u2", 1),
+        ]
+
+        summary = recalculation_service.recalculate_all(
+            workers=1, checkpoint_path=str(checkpoint_path)
+        )
+
+        assert recalculation_service.calls == [("u2", 1)]
+        assert summary["skipped_count"] == 1
+
+    def test_successful_run_clears_checkpoint(self, recalculation_service, tmp_path):
+        """실패 없이 끝나면 checkpoint를 지워 다음 실행(resume 기본값)은 전체를 다시 계산"""
+        checkpoint_path = tmp_path / "checkpoint"
+        recalculation_service.trading_histories_repository.find_user_exchange_pairs.return_value = [
+            ("u1", 1),
+            ("u2", 1),
+        ]
+
+        recalculation_service.recalculate_all(workers=1, checkpoint_path=str(checkpoint_path))
+        assert not checkpoint_path.exists()
+
+        summary = recalculation_service.recalculate_all(
+            workers=1, checkpoint_path=str(checkpoint_path)
+        )
+        assert summary["skipped_count"] == 0
+        assert recalculation_service.calls[2:] == [("u1", 1), ("u2", 1)]
+
+    def test_resume_false_starts_over(self, recalculation_service, tmp_path):
+        checkpoint_path = tmp_path / "checkpoint"
+        checkpoint_path.write_text("u1:1\n")
+        recalculation_service.trading_histories_repository.find_user_exchange_pairs.return_value = [
+            ("u1", 1),
+            ("u2", 1),
+        ]
+
+        recalculation_service.recalculate_all(
+            workers=1, checkpoint_path=str(checkpoint_path), resume=False
+        )
+        assert recalculation_service.calls == [("u1", 1), ("u2", 1)]
@@ -0,0 +1,75 @@
+import threading
+from unittest.mock import Mock
+from service.sync_job_service import SyncJobService, SUCCEEDED, FAILED
+
+
+def _wait(job, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        if job.done:
+            return
+        threading.Event().wait(0.01)
+
+
+class TestSyncJobService:
+    """거래내역 동기화 작업 큐 테스트"""
+
+    def test_job_runs_in_background_and_reports_result(self):
+        """작업 완료 후 결과와 진행 상황 기록"""
+        service = SyncJobService(max_workers=1)
+
+        def sync(user_id, exchange_provider, progress=None):
+            progress.update(phase="saving", orders_fetched=3, rows_saved=2)
+            return {"saved_count": 2}
+
+        service._trading_histories_service = Mock()
+        service._trading_histories_service.sync_trading_histories.side_effect = sync
+
+        job, created = service.submit_sync("user-1", "upbit")
+        _wait(job)
+
+        assert created
+        assert job.state == SUCCEEDED
+        assert job.exchange_provider == "UPBIT"
+        assert job.to_dict()["rows_saved"] == 2
+        assert service.get_job(job.job_id).result == {"saved_count": 2}
+
+    def test_concurrent_sync_for_same_user_is_deduped(self):
+        """같은 사용자/거래소의 진행 중인 작업은 재사용"""
+        service = SyncJobService(max_workers=2)
+        release = threading.Event()
+
+        service._trading_histories_service = Mock()
+        service._trading_histories_service.sync_trading_histories.side_effect = (
+            lambda *args, **kwargs: release.wait(2) and {}
+        )
+
+        first, _ = service.submit_sync("user-1", "UPBIT")
+        second, created = service.submit_sync("user-1", "UPBIT")
+        other, other_created = service.submit_sync("user-2", "UPBIT")
+        release.set()
+        _wait(first)
+        _wait(other)
+
+        assert second is first
+        assert not created
+        assert other_created
+        assert service._trading_histories_service.sync_trading_histories.call_count == 2
+
+        # 완료 후에는 새 작업 생성
+        third, created = service.submit_sync("user-1", "UPBIT")
+        _wait(third)
+        assert created and third is not first
+
+    def test_failed_job_records_error(self):
+        """동기화 실패 시 FAILED 상태와 에러 기록"""
+        service = SyncJobService(max_workers=1)
+        service._trading_histories_service = Mock()
+        service._trading_histories_service.sync_trading_histories.side_effect = (
+            Exception("boom")
+        )
+
+        job, _ = service.submit_sync("user-1", "UPBIT")
+        _wait(job)
+
+        assert job.state == FAILED
+        assert "boom" in job.error
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+from utils.time_utils import AdaptiveTimeWindowPlanner, KOREA_TIMEZONE
+
+
+def _kst(*args) -> datetime:
+    return KOREA_TIMEZONE.localize(datetime(*args))
+
+
+class TestAdaptiveTimeWindowPlanner:
+    """적응형 시간 구간 계획기 테스트"""
+
+    def test_empty_windows_widen_up_to_max(self):
+        """빈 구간이 이어지면 max_window까지 넓어짐"""
+        planner = AdaptiveTimeWindowPlanner(
+            _kst(2025, 1, 1),
+            _kst(2025, 3, 1),
+            initial_window=timedelta(days=1),
+            max_window=timedelta(days=7),
+        )
+
+        widths = []
+        for start, end in planner:
+            widths.append(end - start)
+            planner.report(0)
+
+        assert widths[:4] == [
+            timedelta(days=1),
+            timedelta(days=2),
+            timedelta(days=4),
+            timedelta(days=7),
+        ]
+        assert planner.stats.empty_windows == planner.stats.windows_issued
+
+    def test_full_page_splits_window(self):
+        """결과가 page_limit만큼 꽉 차면 구간을 반으로 나눠 다시 조회"""
+        start = _kst(2025, 1, 1)
+        planner = AdaptiveTimeWindowPlanner(
+            start, start + timedelta(days=7), page_limit=10
+        )
+
+        first = next(planner)
+        planner.report(10)
+        second = next(planner)
+        planner.report(3)
+        third = next(planner)
+        planner.report(3)
+
+        assert first == (start, start + timedelta(days=7))
+        assert second == (start, start + timedelta(days=3, hours=12))
+        assert third == (start + timedelta(days=3, hours=12), start + timedelta(days=7))
+        assert planner.stats.splits == 1
+        assert list(planner) == []
+
+    def test_full_page_at_min_window_follows_cursor(self):
+        """더 나눌 수 없는 구간은 가장 오래된 결과 시각부터 이어서 조회"""
+        start = _kst(2025, 1, 1)
+        end = start + timedelta(minutes=1)
+        planner = AdaptiveTimeWindowPlanner(
+            start, end, min_window=timedelta(minutes=1), page_limit=10
+        )
+
+        next(planner)
+        oldest = start + timedelta(seconds=30)
+        planner.report(10, oldest)
+
+        assert next(planner) == (start, oldest)
+        assert planner.stats.cursor_follows == 1
+
+    def test_covers_whole_range(self):
+        """구간들이 전체 기간을 빈틈없이 덮음"""
+        start = _kst(2025, 1, 1)
+        end = _kst(2025, 2, 3, 12)
+        planner = AdaptiveTimeWindowPlanner(start, end)
+
+        cursor = start
+        for window_start, window_end in planner:
+            assert window_start == cursor
+            cursor = window_end
+            planner.report(1)
+
+        assert cursor == end
+
+    def test_window_grows_back_after_burst(self):
+        """짧은 구간에 거래가 몰린 뒤 거래가 뜸해지면 구간이 다시 max_window까지 넓어짐"""
+        start = _kst(2024, 1, 1)
+        end = start + timedelta(days=365)
+        # 처음 2시간에 3000건, 이후 하루 5건
+        trades = [start + timedelta(seconds=2.4 * i) for i in range(3000)]
+        day = start + timedelta(days=1)
+        while day < end:
+            trades.extend(day + timedelta(hours=hour) for hour in range(0, 10, 2))
+            day += timedelta(days=1)
+
+        planner = AdaptiveTimeWindowPlanner(start, end, page_limit=1000)
+        for window_start, window_end in planner:
+            # 최신순으로 page_limit개까지 반환
+            found = sorted(
+                (t for t in trades if window_start <= t < window_end), reverse=True
+            )[: planner.page_limit]
+            planner.report(len(found), found[-1] if found else None)
+
+        assert planner._window == planner.max_window
+        assert planner.stats.windows_issued < 100
@@ -0,0 +1,95 @@
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import Mock, patch
+from sqlalchemy.dialects import postgresql
+import model.Users  # noqa: F401  (relationship 대상 모델 등록)
+import model.ExchangeCredentials  # noqa: F401
+import model.Coins  # noqa: F401
+import model.Assets  # noqa: F401
+import model.CoinHoldingsPast  # noqa: F401
+import model.CoinPricesDay  # noqa: F401
+from model.TradingHistories import TradingHistories
+from repository.trading_histories_repository import TradingHistoriesRepository
+
+
+def _history(trade_uuid: str) -> TradingHistories:
+    return TradingHistories(
+        user_id="00000000-0000-0000-0000-000000000001",
+        coin_id=1,
+        exchange_code=1,
+        trade_uuid=trade_uuid,
+        trade_type=0,
+        price=Decimal("100"),
+        quantity=Decimal("1"),
+        total_price=Decimal("100"),
+        fee=Decimal("0.05"),
+        trade_time=datetime(2025, 1, 1),
+    )
+
+
+class TestTradingHistoriesRepository:
+    """TradingHistoriesRepository 테스트"""
+
+    @patch("repository.trading_histories_repository.db")
+    def test_save_trading_histories_bulk_insert_in_batches(self, mock_db):
+        """ON CONFLICT DO NOTHING 일괄 INSERT를 배치 단위로 실행하고 새 id 반환"""
+        mock_session = Mock()
+        mock_db.get_session.return_value = mock_session
+        mock_session.execute.return_value.scalars.return_value.all.side_effect = [
+            [1, 2],
+            [3],
+        ]
+
+        result = TradingHistoriesRepository().save_trading_histories(
+            [_history(f"uuid-{i}") for i in range(3)], batch_size=2
+        )
+
+        assert result == [1, 2, 3]
+        assert mock_session.execute.call_count == 2
+        mock_session.commit.assert_called_once()
+        mock_session.query.assert_not_called()
+        mock_session.refresh.assert_not_called()
+
+        sql = str(
+            mock_session.execute.call_args_list[0][0][0].compile(
+                dialect=postgresql.dialect()
+            )
+        )
+        assert "ON CONFLICT ON CONSTRAINT uq_user_exchange_trade_uuid DO NOTHING" in sql
+        assert "RETURNING trading_histories.id" in sql
+
+    @patch("repository.trading_histories_repository.db")
+    def test_save_trading_histories_empty(self, mock_db):
+        """저장할 거래내역이 없으면 INSERT 하지 않음"""
+        mock_session = Mock()
+        mock_db.get_session.return_value = mock_session
+
+        assert TradingHistoriesRepository().save_trading_histories([]) == []
+        mock_session.execute.assert_not_called()
+
+    @patch("repository.trading_histories_repository.execute_values")
+    @patch("repository.trading_histories_repository.db")
+    def test_update_profit_loss_uses_set_based_update(
+        self, mock_db, mock_execute_values
+    ):
+        """VALUES 목록 일괄 UPDATE 후 실제로 바뀐 행 id 반환"""
+        mock_session = Mock()
+        mock_db.get_session.return_value = mock_session
+        mock_execute_values.return_value = [(1,)]
+
+        first = _history("uuid-1")
+        first.id, first.profit_loss_rate, first.avg_buy_price = 1, Decimal("0.10"), None
+        second = _history("uuid-2")
+        second.id = 2
+
+        result = TradingHistoriesRepository().update_profit_loss(
+            [first, second], batch_size=500
+        )
+
+        assert result == [1]
+        args, kwargs = mock_execute_values.call_args
+        assert "IS DISTINCT FROM" in args[1]
+        assert args[2] == [(1, Decimal("0.10"), None), (2, None, None)]
+        assert kwargs["page_size"] == 500
+        mock_session.query.assert_not_called()
+        mock_session.commit.assert_called_once()
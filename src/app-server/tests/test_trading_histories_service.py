@@ -0,0 +1,187 @@
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import Mock
+import pytest
+from service.trading_histories_service import (
+    MAX_PAGE_SIZE,
+    TradingHistoriesService,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def _history(id, day):
+    return SimpleNamespace(
+        id=id,
+        coin_id=1,
+        exchange_code=1,
+        trade_uuid=f"uuid-{id}",
+        trade_type=1,
+        price=Decimal("100"),
+        quantity=Decimal("1"),
+        total_price=Decimal("100"),
+        fee=None,
+        trade_time=datetime(2025, 1, day),
+        created_at=None,
+        profit_loss_rate=None,
+        avg_buy_price=Decimal("90.5"),
+    )
+
+
+@pytest.fixture
+def trading_histories_service():
+    """저장소를 Mock으로 교체한 TradingHistoriesService"""
+    service = TradingHistoriesService()
+    service._trading_repository = Mock()
+    return service
+
+
+class TestTradingHistoriesPage:
+    """거래내역 페이지 조회 테스트"""
+
+    def test_cursor_round_trip(self):
+        """커서 인코딩/디코딩"""
+        cursor = encode_cursor(datetime(2025, 1, 2, 3, 4, 5), 42)
+
+        assert decode_cursor(cursor) == (datetime(2025, 1, 2, 3, 4, 5), 42)
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_page_returns_next_cursor_from_last_row(self, trading_histories_service):
+        """limit보다 많이 조회되면 마지막 행 기준 next_cursor 반환"""
+        repository = trading_histories_service.trading_repository
+        repository.find_page_by_user.return_value = [
+            _history(3, 3),
+            _history(2, 2),
+            _history(1, 1),
+        ]
+
+        page = trading_histories_service.get_trading_histories_page("user-1", limit=2)
+
+        assert repository.find_page_by_user.call_args.args == ("user-1", 3)
+        assert [h["id"] for h in page["trading_histories"]] == [3, 2]
+        assert page["has_next"] is True
+        assert decode_cursor(page["next_cursor"]) == (datetime(2025, 1, 2), 2)
+        assert page["trading_histories"][0]["fee"] == 0.0
+        assert page["trading_histories"][0]["profit_loss_rate"] is None
+        assert page["trading_histories"][0]["avg_buy_price"] == 90.5
+
+    def test_page_size_is_capped(self, trading_histories_service):
+        """페이지 크기는 MAX_PAGE_SIZE로 제한하고 커서/필터 전달"""
+        repository = trading_histories_service.trading_repository
+        repository.find_page_by_user.return_value = []
+        cursor = encode_cursor(datetime(2025, 1, 1), 7)
+
+        page = trading_histories_service.get_trading_histories_page(
+            "user-1", limit=10_000, cursor=cursor, coin_id=5
+        )
+
+        args, kwargs = repository.find_page_by_user.call_args
+        assert args[1] == MAX_PAGE_SIZE + 1
+        assert kwargs["cursor"] == (datetime(2025, 1, 1), 7)
+        assert kwargs["coin_id"] == 5
+        assert page == {
+            "trading_histories": [],
+            "next_cursor": None,
+            "has_next": False,
+            "limit": MAX_PAGE_SIZE,
+        }
+
+
+class TestTradingHistoriesExport:
+    """거래내역 스트리밍 내보내기 테스트"""
+
+    @staticmethod
+    def _rows(count):
+        from repository.trading_histories_repository import EXPORT_COLUMNS
+
+        keys = [column.key for column in EXPORT_COLUMNS]
+        for index in range(count):
+            values = dict.fromkeys(keys)
+            values.update(
+                id=index,
+                symbol="BTC",
+                trade_type=1,
+                price=Decimal("100.12345678"),
+                trade_time=datetime(2025, 1, 1),
+                profit_loss_rate=Decimal("1.50"),
+            )
+            yield SimpleNamespace(_mapping=values)
+
+    def test_ndjson_export_is_chunked(self, trading_histories_service):
+        """rows_per_chunk개씩 NDJSON 조각으로 출력"""
+        import json
+
+        trading_histories_service.trading_repository.stream_by_user.return_value = self._rows(5)
+
+        chunks = list(
+            trading_histories_service.export_trading_histories("user-1", rows_per_chunk=2)
+        )
+
+        assert len(chunks) == 3
+        records = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+        assert [record["id"] for record in records] == [0, 1, 2, 3, 4]
+        assert records[0]["price"] == "100.12345678"
+        assert records[0]["profit_loss_rate"] == "1.50"
+        assert records[0]["avg_buy_price"] is None
+
+    def test_csv_export_has_header_and_all_rows(self, trading_histories_service):
+        """CSV 헤더와 모든 행 출력"""
+        import csv
+
+        trading_histories_service.trading_repository.stream_by_user.return_value = self._rows(3)
+
+        body = "".join(
+            trading_histories_service.export_trading_histories(
+                "user-1", export_format="csv", rows_per_chunk=2
+            )
+        )
+        rows = list(csv.reader(body.splitlines()))
+
+        assert rows[0][-2:] == ["profit_loss_rate", "avg_buy_price"]
+        assert len(rows) == 4
+        assert rows[1][rows[0].index("trade_time")] == "2025-01-01T00:00:00"
+
+    def test_invalid_export_format(self, trading_histories_service):
+        """지원하지 않는 형식은 ValueError"""
+        with pytest.raises(ValueError):
+            trading_histories_service.export_trading_histories("user-1", export_format="xml")
+
+
+class TestSyncDelta:
+    """동기화 응답 delta 테스트"""
+
+    def test_delta_excludes_new_trades_from_updated_list(self, trading_histories_service):
+        """새로 저장된 거래는 수익률 변경 목록에서 제외하고 전체 수는 COUNT로 조회"""
+        repository = trading_histories_service._trading_repository
+        repository.find_by_ids.side_effect = lambda ids: [
+            _history(history_id, history_id) for history_id in ids
+        ]
+        repository.count_by_user.return_value = 10
+
+        result = trading_histories_service._build_sync_delta("user-1", [3, 4], [1, 3, 4])
+
+        assert result["saved_count"] == 2
+        assert result["profit_updated_count"] == 1
+        assert result["total_count"] == 10
+        assert [row["id"] for row in result["new_trading_histories"]] == [3, 4]
+        assert [row["id"] for row in result["updated_trading_histories"]] == [1]
+        assert result["delta_truncated"] is False
+        repository.find_by_user_id.assert_not_called()
+
+    def test_delta_is_truncated(self, trading_histories_service):
+        """limit을 넘는 거래는 응답에서 잘라내고 표시"""
+        repository = trading_histories_service._trading_repository
+        repository.find_by_ids.side_effect = lambda ids: [
+            _history(history_id, history_id) for history_id in ids
+        ]
+        repository.count_by_user.return_value = 3
+
+        result = trading_histories_service._build_sync_delta(
+            "user-1", [1, 2, 3], [], limit=2
+        )
+
+        assert len(result["new_trading_histories"]) == 2
+        assert result["saved_count"] == 3
+        assert result["delta_truncated"] is True
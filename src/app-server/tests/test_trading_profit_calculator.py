@@ -0,0 +1,194 @@
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from service.trading_profit_calculator import TradingProfitCalculator
+
+
+def _trade(trade_type, price, quantity, day, coin_id=1):
+    return SimpleNamespace(
+        coin_id=coin_id,
+        trade_type=trade_type,
+        price=Decimal(price),
+        quantity=Decimal(quantity),
+        trade_time=datetime(2025, 1, day),
+        profit_loss_rate=None,
+        avg_buy_price=None,
+    )
+
+
+def _random_trades(seed, count):
+    """
+    코인별 가격 단위가 다른 무작위 거래 내역 (BTC 마켓의 1e-8 ~ 1e-2 가격과 KRW 마켓 가격)
+    매수 2 : 매도 1 비율이고 trade_time은 1초씩 증가합니다.
+    """
+    import random
+    from datetime import timedelta
+
+    rng = random.Random(seed)
+    price_scales = {1: 1e-7, 2: 1e-5, 3: 1e-3, 4: 1e-2, 5: 1e5, 6: 150}
+    trades = []
+    for index in range(count):
+        coin_id = rng.choice(list(price_scales))
+        price = max(round(rng.uniform(0.5, 3) * price_scales[coin_id], 8), 1e-8)
+        trade = _trade(
+            rng.choice([0, 0, 1]),
+            f"{price:.8f}",
+            f"{rng.uniform(0.00000001, 100):.8f}",
+            1,
+            coin_id=coin_id,
+        )
+        trade.trade_time += timedelta(seconds=index)
+        trades.append(trade)
+    return trades
+
+
+class TestTradingProfitCalculator:
+    """TradingProfitCalculator 테스트"""
+
+    def test_single_pass_returns_trades_and_holdings(self):
+        """한 번의 순회로 거래별 수익률과 최종 보유 종목을 함께 반환"""
+        trades = [
+            _trade(1, "120", "1", 3),
+            _trade(0, "100", "1", 1),
+            _trade(0, "80", "1", 2),
+            _trade(0, "10", "5", 1, coin_id=2),
+        ]
+
+        histories, holdings = TradingProfitCalculator().calculate_profit_loss_with_holdings(
+            trades, coin_symbols={1: "BTC", 2: "ETH"}
+        )
+
+        assert [h.trade_time.day for h in histories] == [1, 1, 2, 3]
+        assert histories[-1].profit_loss_rate == 33.33
+        assert histories[-1].avg_buy_price == 90.0
+        assert holdings == {
+            1: {"symbol": "BTC", "avg_buy_price": Decimal("90"), "remaining_quantity": Decimal("1")},
+            2: {"symbol": "ETH", "avg_buy_price": Decimal("10"), "remaining_quantity": Decimal("5")},
+        }
+
+    def test_continues_from_initial_holdings(self):
+        """기존 보유 종목 평단에 이어서 계산하고 전량 매도한 종목은 제외"""
+        initial = {
+            1: {"symbol": "BTC", "avg_buy_price": Decimal("50"), "remaining_quantity": Decimal("2")}
+        }
+
+        histories, holdings = TradingProfitCalculator().calculate_profit_loss_with_holdings(
+            [_trade(1, "100", "2", 1)], initial_holdings=initial
+        )
+
+        assert histories[0].profit_loss_rate == 100.0
+        assert holdings == {}
+
+
+class TestFixedPointArithmetic:
+    """고정소수점 연산 모드 테스트"""
+
+    def test_fixed_mode_matches_decimal_mode(self):
+        """무작위 거래 내역(BTC 마켓 단위의 1 미만 가격 포함)에서 Decimal 모드와 같은 수익률/평단"""
+        import copy
+
+        trades = _random_trades(seed=7, count=3000)
+
+        decimal_trades = copy.deepcopy(trades)
+        fixed_trades = copy.deepcopy(trades)
+        _, decimal_holdings = TradingProfitCalculator(
+            "decimal"
+        ).calculate_profit_loss_with_holdings(decimal_trades)
+        _, fixed_holdings = TradingProfitCalculator(
+            "fixed"
+        ).calculate_profit_loss_with_holdings(fixed_trades)
+
+        assert sum(t.avg_buy_price is not None for t in decimal_trades) > 500
+        assert [(t.profit_loss_rate, t.avg_buy_price) for t in fixed_trades] == [
+            (t.profit_loss_rate, t.avg_buy_price) for t in decimal_trades
+        ]
+        assert fixed_holdings == decimal_holdings
+
+    def test_arithmetic_mode_from_env(self, monkeypatch):
+        """PROFIT_CALCULATOR_ARITHMETIC 환경변수로 모드 선택"""
+        monkeypatch.setenv("PROFIT_CALCULATOR_ARITHMETIC", "fixed")
+
+        assert TradingProfitCalculator().arithmetic == "fixed"
+
+
+class TestBatchProfitCalculator:
+    """NumPy 배치 수익률 계산기 테스트"""
+
+    def test_parity_with_decimal_calculator_on_test_data(self):
+        """testData/response_for_test.json에서 기존 계산기와 같은 결과"""
+        import copy
+        import json
+        from pathlib import Path
+        from service.batch_profit_calculator import BatchProfitCalculator
+
+        test_data_path = Path(__file__).parents[3] / "testData" / "response_for_test.json"
+        with open(test_data_path, "r", encoding="utf-8") as f:
+            json_data = json.load(f)
+
+        expected = TradingProfitCalculator().calculate_from_json_data(
+            copy.deepcopy(json_data)
+        )
+        actual = BatchProfitCalculator().calculate_from_json_data(copy.deepcopy(json_data))
+
+        expected_by_id = {
+            item["id"]: (item["profitLossRate"], item["avgBuyPrice"]) for item in expected
+        }
+        actual_by_id = {
+            item["id"]: (item["profitLossRate"], item["avgBuyPrice"]) for item in actual
+        }
+        assert actual_by_id == expected_by_id
+        assert any(rate is not None for rate, _ in actual_by_id.values())
+
+    def test_parity_with_decimal_calculator_on_random_trades(self):
+        """BTC 마켓 단위 가격이 섞인 무작위 거래 내역에서도 기존 계산기와 같은 결과"""
+        import copy
+        from service.batch_profit_calculator import BatchProfitCalculator
+
+        trades = _random_trades(seed=11, count=3000)
+        initial = {
+            1: {"avg_buy_price": Decimal("0.00000123"), "remaining_quantity": Decimal("3.5")},
+            5: {"avg_buy_price": Decimal("101234.12345678"), "remaining_quantity": Decimal("0.1")},
+        }
+
+        decimal_trades = copy.deepcopy(trades)
+        batch_trades = copy.deepcopy(trades)
+        _, expected_holdings = TradingProfitCalculator().calculate_profit_loss_with_holdings(
+            decimal_trades, initial_holdings=copy.deepcopy(initial)
+        )
+        _, actual_holdings = BatchProfitCalculator().calculate_profit_loss_with_holdings(
+            batch_trades, initial_holdings=copy.deepcopy(initial)
+        )
+
+        assert sum(t.avg_buy_price is not None for t in decimal_trades) > 500
+        assert [(t.profit_loss_rate, t.avg_buy_price) for t in batch_trades] == [
+            (t.profit_loss_rate, t.avg_buy_price) for t in decimal_trades
+        ]
+        assert actual_holdings == expected_holdings
+
+    def test_groups_users_and_coins_independently(self):
+        """여러 사용자의 거래를 한 번에 계산해도 사용자/코인별로 분리"""
+        from service.batch_profit_calculator import BatchProfitCalculator
+
+        result = BatchProfitCalculator().calculate(
+            user_ids=["u1", "u2", "u1", "u2", "u1"],
+            coin_ids=[1, 1, 1, 1, 2],
+            trade_times=[datetime(2025, 1, d) for d in (1, 1, 2, 2, 3)],
+            trade_types=[0, 0, 1, 1, 1],
+            prices=["100", "200", "150", "100", "10"],
+            quantities=["2", "1", "1", "2", "1"],
+        )
+
+        assert result.profit_loss_rate == [None, None, 50.0, None, None]
+        assert result.avg_buy_price[2] == 100.0
+        assert result.holdings == {
+            ("u1", 1): {"avg_buy_price": Decimal("100"), "remaining_quantity": Decimal("1")},
+            ("u2", 1): {"avg_buy_price": Decimal("200"), "remaining_quantity": Decimal("1")},
+        }
+
+    def test_create_profit_calculator_backend(self):
+        """설정한 백엔드의 계산기 생성"""
+        from service.batch_profit_calculator import BatchProfitCalculator
+        from service.trading_profit_calculator import create_profit_calculator
+
+        assert isinstance(create_profit_calculator("batch"), BatchProfitCalculator)
+        assert isinstance(create_profit_calculator("decimal"), TradingProfitCalculator)
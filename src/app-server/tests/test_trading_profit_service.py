@@ -0,0 +1,194 @@
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+import pytest
+from service.trading_profit_service import TradingProfitService
+
+
+def _trade(id, trade_type, price, quantity, day, coin_id=1):
+    return SimpleNamespace(
+        id=id,
+        coin_id=coin_id,
+        trade_type=trade_type,
+        price=Decimal(price),
+        quantity=Decimal(quantity),
+        trade_time=datetime(2025, 1, day),
+        profit_loss_rate=None,
+        avg_buy_price=None,
+    )
+
+
+@pytest.fixture
+def profit_service():
+    """저장소와 DB 세션을 Mock으로 교체한 TradingProfitService"""
+    with patch("service.trading_profit_service.db"):
+        yield _profit_service()
+
+
+def _profit_service():
+    service = TradingProfitService()
+    service._trading_histories_repository = Mock()
+    service._coin_holdings_past_repository = Mock()
+    service._coin_catalog = Mock()
+    service._coin_catalog.get_symbols.return_value = {1: "BTC", 2: "ETH"}
+    service._coin_holdings_past_repository.get_high_water_mark.return_value = (None, None)
+    service._trading_histories_repository.update_profit_loss.side_effect = (
+        lambda histories, batch_size, session: [history.id for history in histories]
+    )
+    service._coin_holdings_past_repository.replace_holdings.return_value = {
+        "saved_count": 0,
+        "deleted_count": 0,
+    }
+    return service
+
+
+class TestIncrementalProfitCalculation:
+    """기준점 이후 거래만 처리하는 증분 수익률 계산 테스트"""
+
+    def test_incremental_applies_only_new_trades(self, profit_service):
+        """기준점이 있으면 이후 거래만 조회해 저장된 평단에 적용"""
+        profit_service._coin_holdings_past_repository.get_holdings_dict.return_value = {
+            1: {
+                "symbol": "BTC",
+                "avg_buy_price": Decimal("100"),
+                "remaining_quantity": Decimal("2"),
+            }
+        }
+        profit_service._coin_holdings_past_repository.get_high_water_mark.return_value = (
+            10,
+            datetime(2025, 1, 5),
+        )
+        sell = _trade(11, 1, "150", "1", 6)
+        profit_service._trading_histories_repository.find_for_profit_calculation.return_value = [
+            sell
+        ]
+
+        result = profit_service.calculate_and_update_profit_loss("user-1", 1)
+
+        profit_service._trading_histories_repository.find_for_profit_calculation.assert_called_once_with(
+            "user-1", 1, after_trade_id=10
+        )
+        assert result["mode"] == "incremental"
+        assert result["processed_count"] == 1
+        assert sell.profit_loss_rate == 50.0
+        args, kwargs = profit_service._coin_holdings_past_repository.replace_holdings.call_args
+        assert args[2][1]["remaining_quantity"] == Decimal("1")
+        assert kwargs["last_trade_id"] == 11
+        assert kwargs["last_trade_time"] == datetime(2025, 1, 6)
+
+    def test_out_of_order_trade_falls_back_to_full_recalculation(self, profit_service):
+        """기준점보다 과거 시각의 거래가 추가되면 전체 재계산"""
+        profit_service._coin_holdings_past_repository.get_holdings_dict.return_value = {
+            1: {
+                "symbol": "BTC",
+                "avg_buy_price": Decimal("100"),
+                "remaining_quantity": Decimal("1"),
+            }
+        }
+        profit_service._coin_holdings_past_repository.get_high_water_mark.return_value = (
+            10,
+            datetime(2025, 1, 5),
+        )
+        late = _trade(11, 0, "80", "1", 3)
+        repository = profit_service._trading_histories_repository
+        repository.find_for_profit_calculation.side_effect = [
+            [late],
+            [late, _trade(10, 0, "100", "1", 5)],
+        ]
+
+        result = profit_service.calculate_and_update_profit_loss("user-1", 1)
+
+        assert result["mode"] == "full"
+        assert repository.find_for_profit_calculation.call_args_list[1].args == (
+            "user-1",
+            1,
+        )
+        kwargs = profit_service._coin_holdings_past_repository.replace_holdings.call_args.kwargs
+        # id 기준점은 가장 큰 id, 시각 기준점은 가장 늦은 trade_time (서로 다른 거래일 수 있음)
+        assert kwargs["last_trade_id"] == 11
+        assert kwargs["last_trade_time"] == datetime(2025, 1, 5)
+
+    def test_id_mark_covers_older_trades_with_higher_ids(self, profit_service):
+        """최신 시각 거래보다 id가 큰 과거 거래가 있어도 다음 동기화에서 다시 조회되지 않음"""
+        # 한 조회 구간의 주문은 최신순으로 저장되어 id 12(1/3)가 id 11(1/4)보다 과거 시각
+        repository = profit_service._trading_histories_repository
+        repository.find_for_profit_calculation.return_value = [
+            _trade(12, 0, "100", "1", 3),
+            _trade(11, 0, "120", "1", 4),
+        ]
+
+        profit_service.calculate_and_update_profit_loss("user-1", 1)
+
+        kwargs = profit_service._coin_holdings_past_repository.replace_holdings.call_args.kwargs
+        assert kwargs["last_trade_id"] == 12
+        assert kwargs["last_trade_time"] == datetime(2025, 1, 4)
+
+    def test_mark_saved_without_open_positions(self, profit_service):
+        """전량 매도로 보유 종목이 없어도 기준점을 저장"""
+        profit_service._trading_histories_repository.find_for_profit_calculation.return_value = [
+            _trade(1, 0, "100", "1", 1),
+            _trade(2, 1, "110", "1", 2),
+        ]
+
+        profit_service.calculate_and_update_profit_loss("user-1", 1)
+
+        args, kwargs = profit_service._coin_holdings_past_repository.replace_holdings.call_args
+        assert args[2] == {}
+        assert kwargs["last_trade_id"] == 2
+
+    def test_without_holdings_runs_full_calculation(self, profit_service):
+        """저장된 보유 종목이 없으면 전체 거래 내역으로 계산"""
+        profit_service._coin_holdings_past_repository.get_holdings_dict.return_value = {}
+        profit_service._trading_histories_repository.find_for_profit_calculation.return_value = [
+            _trade(1, 0, "100", "1", 1),
+            _trade(2, 1, "110", "1", 2),
+        ]
+
+        result = profit_service.calculate_and_update_profit_loss("user-1", 1)
+
+        profit_service._trading_histories_repository.find_for_profit_calculation.assert_called_once_with(
+            "user-1", 1, after_trade_id=None
+        )
+        assert result["mode"] == "full"
+        assert result["holdings_count"] == 0
+
+
+class TestProfitWriteTransaction:
+    """수익률/보유 종목 저장 트랜잭션 테스트"""
+
+    def test_writes_share_one_session_and_commit(self):
+        """거래 내역 업데이트와 보유 종목 스냅샷 교체가 같은 세션에서 한 번 commit"""
+        with patch("service.trading_profit_service.db") as mock_db:
+            service = _profit_service()
+            service._coin_holdings_past_repository.get_holdings_dict.return_value = {}
+            service._trading_histories_repository.find_for_profit_calculation.return_value = [
+                _trade(1, 0, "100", "1", 1)
+            ]
+
+            service.calculate_and_update_profit_loss("user-1", 1)
+
+        session = mock_db.get_session.return_value
+        assert (
+            service._trading_histories_repository.update_profit_loss.call_args.kwargs["session"]
+            is session
+        )
+        assert service._coin_holdings_past_repository.replace_holdings.call_args.kwargs["session"] is session
+        session.commit.assert_called_once()
+
+    def test_snapshot_failure_rolls_back_profit_update(self):
+        """보유 종목 스냅샷 교체가 실패하면 거래 내역 업데이트도 롤백"""
+        with patch("service.trading_profit_service.db") as mock_db:
+            service = _profit_service()
+            service._coin_holdings_past_repository.get_holdings_dict.return_value = {}
+            service._trading_histories_repository.find_for_profit_calculation.return_value = [
+                _trade(1, 0, "100", "1", 1)
+            ]
+            service._coin_holdings_past_repository.replace_holdings.side_effect = RuntimeError("boom")
+
+            with pytest.raises(RuntimeError):
+                service.calculate_and_update_profit_loss("user-1", 1)
+
+        session = mock_db.get_session.return_value
+        session.commit.assert_not_called()
+        session.rollback.assert_called_once()
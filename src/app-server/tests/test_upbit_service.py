@@ -0,0 +1,82 @@
+import pytest
+from unittest.mock import Mock
+from service.upbit_service import UpbitService
+
+
+@pytest.fixture
+def upbit_service():
+    """HTTP 클라이언트를 Mock으로 교체한 UpbitService"""
+    service = UpbitService()
+    service.upbit_http_client = Mock()
+    return service
+
+
+class TestListingFirstIngestion:
+    """종료 주문 목록 기반 거래내역 조회 테스트"""
+
+    def test_build_order_from_listing_with_executed_funds(self, upbit_service):
+        """executed_funds가 있으면 목록만으로 trades 생성"""
+        order = {
+            "uuid": "order-1",
+            "side": "bid",
+            "market": "KRW-BTC",
+            "executed_volume": "0.5",
+            "executed_funds": "50000",
+            "paid_fee": "25",
+            "created_at": "2025-01-01T00:00:00+09:00",
+        }
+
+        result = upbit_service._build_order_from_listing(order)
+
+        assert result["trades"] == [{"volume": "0.5", "funds": "50000"}]
+        assert result["paid_fee"] == "25"
+
+    def test_build_order_from_listing_without_executed_funds(self, upbit_service):
+        """체결 총액이 없으면 상세 조회 대상"""
+        order = {"uuid": "order-1", "executed_volume": "0.5", "price": "100000"}
+
+        assert upbit_service._build_order_from_listing(order) is None
+
+    def test_listing_first_fetches_only_underivable_orders(self, upbit_service):
+        """평균 체결가를 알 수 없는 주문만 /v1/order 조회하고 순서 유지"""
+        listed = {
+            "uuid": "listed",
+            "executed_volume": "1",
+            "executed_funds": "1000",
+        }
+        missing = {"uuid": "missing", "executed_volume": "1", "price": "1000"}
+        upbit_service.fetch_all_closed_orders = Mock(return_value=[missing, listed])
+        upbit_service.fetch_all_trading_history = Mock(
+            return_value=[{"uuid": "missing", "trades": [{"volume": "1", "funds": "990"}]}]
+        )
+
+        result = upbit_service.fetch_trading_histories_listing_first("a", "s")
+
+        upbit_service.fetch_all_trading_history.assert_called_once_with(
+            "a", "s", ["missing"], None
+        )
+        assert [order["uuid"] for order in result] == ["missing", "listed"]
+
+
+class TestFirstActivityProbe:
+    """첫 활동 시점 조회 테스트"""
+
+    def test_probe_returns_start_of_first_deposit_day(self, upbit_service):
+        """가장 오래된 입금일의 0시(KST) 반환"""
+        upbit_service.upbit_http_client.get.return_value = [
+            {"created_at": "2024-03-05T14:20:00+09:00"}
+        ]
+
+        result = upbit_service.probe_first_activity("a", "s")
+
+        assert result.isoformat() == "2024-03-05T00:00:00+09:00"
+
+    def test_probe_returns_none_on_client_error(self, upbit_service):
+        """입금 조회 권한이 없으면 None"""
+        from utils.upbit_http_client import UpbitHttpClientError
+
+        upbit_service.upbit_http_client.get.side_effect = UpbitHttpClientError(
+            "unauthorized", status_code=401
+        )
+
+        assert upbit_service.probe_first_activity("a", "s") is None
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import httpx
+from typing import Dict, Any, Optional
+from utils.rate_limiter import UpbitRateLimiter
+from utils.upbit_http_client import (
+    UpbitHttpClientError,
+    UpbitRateLimitError,
+    get_jwt_signer,
+    get_rate_limit_key,
+)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class AsyncUpbitHttpClient:
+    """
+    UpbitHttpClient의 async 버전
+
+    프로세스 전체에서 하나의 httpx.AsyncClient 커넥션 풀(keep-alive, 선택적 HTTP/2)을 공유하며
+    UpbitHttpClient와 같은 get(endpoint, access_key, secret_key, params, require_auth) 형태를 제공합니다.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://api.upbit.com",
+        rate_limiter: Optional[UpbitRateLimiter] = None,
+        http2: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        connect_timeout: Optional[float] = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+    ):
+        self.base_url = base_url
+        self.rate_limiter = rate_limiter or UpbitRateLimiter()
+
+        if http2 is None:
+            http2 = os.getenv("UPBIT_HTTP2", "true").lower() == "true"
+        # h2 패키지가 없으면 HTTP/1.1 keep-alive로 동작
+        self.http2 = http2 and _http2_available()
+
+        if timeout is None:
+            timeout = float(os.getenv("UPBIT_HTTP_TIMEOUT", "10"))
+        if connect_timeout is None:
+            connect_timeout = float(os.getenv("UPBIT_HTTP_CONNECT_TIMEOUT", "5"))
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=self.http2,
+                timeout=self.timeout,
+                limits=self.limits,
+                headers={
+                    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+                },
+            )
+        return self._client
+
+    async def get(
+        self,
+        endpoint: str,
+        access_key: str,
+        secret_key: str,
+        params: Optional[Dict[str, Any]] = None,
+        require_auth: bool = False,  # 인증 헤더가 필요한지 체크
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            headers = (
+                {
+                    "Authorization": f"Bearer {get_jwt_signer(access_key, secret_key).sign(params)}"
+                }
+                if require_auth
+                else None
+            )
+
+            limit_key, group = get_rate_limit_key(endpoint, access_key, require_auth)
+            delay = self.rate_limiter.reserve(limit_key, group)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            response = await self.client.get(endpoint, params=params, headers=headers)
+            self.rate_limiter.observe(limit_key, response.headers.get("Remaining-Req"))
+
+            if response.status_code == 429:
+                self.rate_limiter.pause(limit_key, group)
+                raise UpbitRateLimitError(
+                    f"AsyncUpbitHttpClient GET request rate limited for endpoint {endpoint}",
+                    status_code=429,
+                )
+
+            response.raise_for_status()
+
+            return response.json()
+
+        except UpbitHttpClientError:
+            raise
+        except httpx.HTTPStatusError as e:
+            raise UpbitHttpClientError(
+                f"AsyncUpbitHttpClient GET request failed for endpoint {endpoint}: {e}",
+                status_code=e.response.status_code,
+            )
+        except httpx.HTTPError as e:
+            raise UpbitHttpClientError(
+                f"AsyncUpbitHttpClient GET request failed for endpoint {endpoint}: {e}"
+            )
+        except Exception as e:
+            raise UpbitHttpClientError(
+                f"AsyncUpbitHttpClient unexpected error in GET method for endpoint {endpoint}: {e}",
+                status_code=0,
+            )
+
+    async def aclose(self):
+        """커넥션 풀 종료"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,95 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _is_retryable(error: Exception) -> bool:
+    return bool(getattr(error, "retryable", False))
+
+
+def call_with_retry(
+    fn: Callable[[], R],
+    max_retries: int = 3,
+    backoff_base: float = 0.5,
+    backoff_max: float = 8.0,
+    is_retryable: Callable[[Exception], bool] = _is_retryable,
+) -> R:
+    """
+    재시도 가능한 에러에 대해 지수 백오프로 재시도
+
+    Args:
+        fn: 실행할 함수
+        max_retries: 최대 재시도 횟수 (최초 호출 제외)
+        backoff_base: 첫 재시도 대기 시간(초), 재시도마다 2배 증가
+        backoff_max: 최대 대기 시간(초)
+        is_retryable: 에러가 재시도 가능한지 판단하는 함수
+    """
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            time.sleep(min(backoff_max, backoff_base * (2**attempt)))
+            attempt += 1
+
+
+def fetch_concurrently(
+    items: Sequence[T],
+    fetch_fn: Callable[[T], R],
+    max_workers: int = 8,
+    max_retries: int = 3,
+    backoff_base: float = 0.5,
+    is_retryable: Callable[[Exception], bool] = _is_retryable,
+    on_progress: Optional[Callable[[int, int], Any]] = None,
+) -> List[Optional[R]]:
+    """
+    items를 bounded worker pool로 동시에 조회하고 입력 순서대로 결과를 반환합니다.
+    요청 속도 제한은 fetch_fn 내부(HTTP 클라이언트의 rate limiter)에서 처리합니다.
+
+    Args:
+        items: 조회할 항목 목록
+        fetch_fn: 항목 1개를 조회하는 함수
+        max_workers: 동시 실행 worker 수
+        max_retries: 항목별 최대 재시도 횟수
+        backoff_base: 첫 재시도 대기 시간(초)
+        is_retryable: 에러가 재시도 가능한지 판단하는 함수
+        on_progress: (완료 개수, 전체 개수)를 받는 진행률 콜백
+
+    Returns:
+        items와 같은 순서의 결과 리스트
+    """
+    total = len(items)
+    results: List[Optional[R]] = [None] * total
+    if total == 0:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total))) as executor:
+        futures = {
+            executor.submit(
+                call_with_retry,
+                lambda item=item: fetch_fn(item),
+                max_retries,
+                backoff_base,
+                is_retryable=is_retryable,
+            ): index
+            for index, item in enumerate(items)
+        }
+
+        try:
+            completed = 0
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                completed += 1
+                if on_progress is not None:
+                    on_progress(completed, total)
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+    return results
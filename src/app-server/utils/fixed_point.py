@@ -0,0 +1,109 @@
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Any, Optional
+
+# DB의 Numeric(20, 8)과 같은 소수점 8자리 고정소수점
+VALUE_DECIMALS = 8
+VALUE_SCALE = 10**VALUE_DECIMALS
+
+# 평균 단가는 나눗셈 결과이므로 소수점 20자리로 반올림해 보관 (출력 시에만 Decimal/float로 변환)
+# Decimal 모드도 같은 자리수로 반올림하므로 모든 계산기 백엔드의 결과가 같음
+AVG_DECIMALS = 20
+AVG_SCALE = 10**AVG_DECIMALS
+
+# 가격(VALUE_SCALE)을 평균 단가 단위(AVG_SCALE)로 올리는 배수
+PRICE_TO_AVG = AVG_SCALE // VALUE_SCALE
+
+_VALUE_QUANTUM = Decimal(1).scaleb(-VALUE_DECIMALS)
+
+
+def to_fixed(value: Any) -> int:
+    """
+    가격/수량을 소수점 8자리 정수로 변환 (1.5 → 150000000)
+    float은 Decimal(str(value))와 같은 값이 되도록 문자열을 거쳐 변환합니다.
+    """
+    if isinstance(value, int):
+        return value * VALUE_SCALE
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    scaled = value * VALUE_SCALE
+    fixed = int(scaled)
+    if fixed == scaled:
+        # Numeric(20, 8) 값은 항상 여기서 끝남
+        return fixed
+    return int(value.quantize(_VALUE_QUANTUM, rounding=ROUND_HALF_EVEN).scaleb(VALUE_DECIMALS))
+
+
+def avg_to_fixed(value: Any) -> int:
+    """저장된 평균 단가를 AVG_SCALE 정수로 변환"""
+    return to_fixed(value) * PRICE_TO_AVG
+
+
+def div_half_even(numerator: int, denominator: int) -> int:
+    """정수 나눗셈 (ROUND_HALF_EVEN)"""
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient % 2 == 1):
+        quotient += 1
+    return quotient
+
+
+def div_half_up(numerator: int, denominator: int) -> int:
+    """정수 나눗셈 (ROUND_HALF_UP: 0.5는 0에서 먼 쪽으로)"""
+    sign = -1 if (numerator < 0) != (denominator < 0) else 1
+    quotient, remainder = divmod(abs(numerator), abs(denominator))
+    if 2 * remainder >= abs(denominator):
+        quotient += 1
+    return sign * quotient
+
+
+def buy_cost(price: int, quantity: int) -> int:
+    """
+    매수 총액을 원가 단위(AVG_SCALE × VALUE_SCALE)로 변환
+
+    원가는 평단(AVG_SCALE) × 보유량(VALUE_SCALE)과 같은 단위로 누적합니다.
+    """
+    return price * quantity * PRICE_TO_AVG
+
+
+def avg_from_cost(cost: int, quantity: int) -> int:
+    """
+    누적 원가 / 보유량을 AVG_SCALE 평단으로 한 번만 반올림 (ROUND_HALF_EVEN)
+
+    평단은 매수할 때마다가 아니라 매도 시점에만 반올림하므로
+    Decimal 모드와 배치 계산기(매수 구간 누적합)가 같은 값을 얻습니다.
+    """
+    return div_half_even(cost, quantity)
+
+
+def profit_loss_hundredths(sell_price: int, avg: int) -> int:
+    """
+    ((매도가 - 평단) / 평단) * 100을 소수점 2자리(ROUND_HALF_UP)로 반올림한 값의 100배
+
+    sell_price는 VALUE_SCALE, avg는 AVG_SCALE 정수입니다. 평단이 0 이하면 0을 반환합니다.
+    """
+    if avg <= 0:
+        return 0
+    return div_half_up((sell_price * PRICE_TO_AVG - avg) * 100 * 100, avg)
+
+
+def hundredths_to_float(value: Optional[int]) -> Optional[float]:
+    """
+    수익률 정수(100배)를 float로 변환
+    int 나눗셈은 정확히 반올림되므로 float(Decimal('12.34'))와 같은 값입니다.
+    """
+    if value is None:
+        return None
+    return value / 100
+
+
+def avg_to_float(avg: int) -> float:
+    """평단 정수를 float로 변환 (float(avg_to_decimal(avg))와 같은 값)"""
+    return avg / AVG_SCALE
+
+
+def avg_to_decimal(avg: int) -> Decimal:
+    return Decimal(avg).scaleb(-AVG_DECIMALS)
+
+
+def value_to_decimal(value: int) -> Decimal:
+    return Decimal(value).scaleb(-VALUE_DECIMALS)
@@ -1,5 +1,4 @@
 import requests
-import time
 import os
 from typing import Optional, Dict, Any
 import logging
@@ -53,14 +52,6 @@ class Http_client:
             self.logger.error(f"예상치 못한 에러: {e}")
             return None
 
-    def get_with_nonce(self) -> Optional[Dict[str, Any]]:
-        """
-        nonce 파라미터를 포함하여 요청을 보냅니다.
-        """
-        nonce = int(time.time() * 1000)  # 현재 시간을 밀리초로
-        params = {"nonce": nonce}
-        return self.get(params)
-
     def download_image(self, url: str, save_path: str) -> bool:
         try:
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+
+@dataclass
+class MasterDataResult:
+    """
+    마스터 데이터 조회 결과
+
+    changed: 마지막으로 반영(mark_applied)한 내용과 다르면 True
+    not_modified: 서버가 304를 반환해 디스크 캐시를 사용했으면 True
+    """
+
+    data: Any
+    content_hash: str
+    changed: bool
+    not_modified: bool
+
+
+class CachedMasterDataFetcher:
+    """
+    조건부 요청과 디스크 캐시를 사용하는 정적 마스터 데이터 조회기
+
+    응답 본문과 ETag/Last-Modified, 내용 해시를 디스크에 저장하고
+    다음 요청에 If-None-Match/If-Modified-Since를 보내 내용이 같으면 304만 받습니다.
+    200을 받아도 내용 해시가 마지막으로 반영한 해시와 같으면 changed=False를 반환합니다.
+    반영 여부는 호출 측이 DB 저장까지 끝낸 뒤 mark_applied로 기록합니다.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        cache_path: str,
+        headers: Optional[Dict[str, str]] = None,
+        session: Optional[requests.Session] = None,
+        connect_timeout: float = 5,
+        read_timeout: float = 30,
+    ):
+        self.url = url
+        self.cache_path = cache_path
+        self.meta_path = f"{cache_path}.meta.json"
+        self.headers = headers or {}
+        self.timeout = (connect_timeout, read_timeout)
+        self.logger = logging.getLogger(__name__)
+        if session is None:
+            # 같은 호스트에 주기적으로 요청하므로 keep-alive 커넥션 재사용
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self.session = session
+
+    def fetch(self, force: bool = False) -> MasterDataResult:
+        """
+        마스터 데이터 조회
+
+        Args:
+            force: True면 조건부 헤더 없이 다시 받고 반영 여부와 관계없이 changed=True
+
+        Returns:
+            MasterDataResult
+        """
+        meta = self._load_meta()
+        has_cached_body = os.path.exists(self.cache_path)
+
+        headers = dict(self.headers)
+        if has_cached_body and not force:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = self.session.get(self.url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and has_cached_body:
+            self.logger.info(f"마스터 데이터 변경 없음 (304): {self.url}")
+            content_hash = meta.get("content_hash")
+            with open(self.cache_path, "rb") as f:
+                data = json.loads(f.read())
+            return MasterDataResult(
+                data=data,
+                content_hash=content_hash,
+                changed=force or content_hash != meta.get("applied_hash"),
+                not_modified=True,
+            )
+
+        response.raise_for_status()
+
+        body = response.content
+        data = json.loads(body)
+        content_hash = hashlib.sha256(body).hexdigest()
+
+        if content_hash != meta.get("content_hash") or not has_cached_body:
+            self._write_atomic(self.cache_path, body)
+        meta.update(
+            {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content_hash": content_hash,
+                "fetched_at": time.time(),
+            }
+        )
+        self._save_meta(meta)
+
+        changed = force or content_hash != meta.get("applied_hash")
+        self.logger.info(
+            f"마스터 데이터 조회 완료: {self.url}, {len(body)} bytes, changed={changed}"
+        )
+        return MasterDataResult(
+            data=data, content_hash=content_hash, changed=changed, not_modified=False
+        )
+
+    def mark_applied(self, content_hash: str):
+        """content_hash 내용을 DB에 반영했음을 기록 (이후 같은 내용이면 changed=False)"""
+        meta = self._load_meta()
+        meta["applied_hash"] = content_hash
+        self._save_meta(meta)
+
+    def _load_meta(self) -> Dict[str, Any]:
+        if not os.path.exists(self.meta_path):
+            return {}
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"마스터 데이터 캐시 메타 파일 읽기 실패: {e}")
+            return {}
+
+    def _save_meta(self, meta: Dict[str, Any]):
+        self._write_atomic(self.meta_path, json.dumps(meta).encode("utf-8"))
+
+    @staticmethod
+    def _write_atomic(path: str, content: bytes):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, path)
@@ -0,0 +1,134 @@
+import threading
+import time
+from typing import Dict, Hashable, Optional
+
+
+# Upbit 요청 수 제한 그룹별 초당 허용 요청 수
+# https://docs.upbit.com/kr/reference/rate-limits
+UPBIT_GROUP_RATE_PER_SEC: Dict[str, float] = {
+    "default": 30,  # 주문 외 Exchange API (계정 단위)
+    "order": 8,  # 주문 생성/취소 (계정 단위)
+    "market": 10,  # 시세 API (IP 단위)
+    "candle": 10,
+    "ticker": 10,
+    "orderbook": 10,
+    "trade": 10,
+}
+
+
+def parse_remaining_req(header_value: Optional[str]) -> Dict[str, str]:
+    """
+    Upbit Remaining-Req 헤더 파싱
+
+    Args:
+        header_value: "group=default; min=1800; sec=29" 형식의 헤더 값
+
+    Returns:
+        {"group": "default", "min": "1800", "sec": "29"}
+    """
+    result: Dict[str, str] = {}
+    if not header_value:
+        return result
+
+    for part in header_value.split(";"):
+        if "=" not in part:
+            continue
+        key, value = part.split("=", 1)
+        result[key.strip()] = value.strip()
+
+    return result
+
+
+class TokenBucket:
+    """초당 rate 만큼 토큰이 채워지는 토큰 버킷 (thread-safe)"""
+
+    def __init__(self, rate_per_sec: float, capacity: Optional[float] = None):
+        self.rate_per_sec = float(rate_per_sec)
+        self.capacity = float(capacity if capacity is not None else rate_per_sec)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_sec)
+            self._updated_at = now
+
+    def reserve(self) -> float:
+        """
+        토큰 1개를 예약하고, 요청 전에 기다려야 하는 시간(초)을 반환합니다.
+        토큰이 부족하면 음수 잔고로 예약하여 호출자 간 순서를 보장합니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_sec
+
+    def sync_remaining(self, remaining: float):
+        """서버가 알려준 남은 요청 수보다 많은 토큰을 갖고 있지 않도록 보정"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if remaining < self._tokens:
+                self._tokens = float(remaining)
+
+    def pause(self, seconds: float):
+        """429 응답 등으로 일정 시간 요청을 멈춰야 할 때 토큰을 비움"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate_per_sec
+
+
+class UpbitRateLimiter:
+    """
+    Upbit 요청 수 제한 그룹별 토큰 버킷 관리자
+
+    Exchange API 제한은 계정(access key) 단위, 시세 API 제한은 IP 단위이므로
+    호출자가 넘겨주는 key 단위로 버킷을 분리합니다.
+    """
+
+    def __init__(self, group_rates: Optional[Dict[str, float]] = None):
+        self.group_rates = dict(group_rates or UPBIT_GROUP_RATE_PER_SEC)
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, key: Hashable, group: str) -> TokenBucket:
+        bucket_key = (key, group)
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(bucket_key)
+                if bucket is None:
+                    rate = self.group_rates.get(group, self.group_rates["default"])
+                    bucket = TokenBucket(rate)
+                    self._buckets[bucket_key] = bucket
+        return bucket
+
+    def reserve(self, key: Hashable, group: str) -> float:
+        """토큰 예약 후 대기해야 하는 시간(초) 반환 (async 호출자용)"""
+        return self._bucket(key, group).reserve()
+
+    def acquire(self, key: Hashable, group: str):
+        """토큰을 얻을 때까지 블로킹"""
+        delay = self.reserve(key, group)
+        if delay > 0:
+            time.sleep(delay)
+
+    def observe(self, key: Hashable, header_value: Optional[str]):
+        """응답의 Remaining-Req 헤더로 버킷 잔량 보정"""
+        remaining = parse_remaining_req(header_value)
+        group = remaining.get("group")
+        sec = remaining.get("sec")
+        if not group or sec is None:
+            return
+
+        try:
+            self._bucket(key, group).sync_remaining(float(sec))
+        except ValueError:
+            return
+
+    def pause(self, key: Hashable, group: str, seconds: float = 1.0):
+        self._bucket(key, group).pause(seconds)
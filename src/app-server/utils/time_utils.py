@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Tuple, List, Optional
 import pytz
@@ -107,3 +108,117 @@ def get_date_range_strings(
     time_ranges = split_time_range(start_dt, end_dt, max_days=7)
 
     return [(format_iso8601(start), format_iso8601(end)) for start, end in time_ranges]
+
+
+@dataclass
+class WindowPlanStats:
+    """AdaptiveTimeWindowPlanner 실행 통계"""
+
+    windows_issued: int = 0
+    empty_windows: int = 0
+    splits: int = 0
+    cursor_follows: int = 0
+
+
+class AdaptiveTimeWindowPlanner:
+    """
+    페이지 크기 제한이 있는 기간 조회 API용 적응형 시간 구간 계획기
+
+    - 결과가 page_limit의 절반보다 적으면 (빈 구간 포함) 다음 구간을 max_window까지 2배씩 넓힙니다.
+      몰린 구간에서 줄어든 구간도 거래가 뜸해지면 다시 넓어집니다.
+    - 결과가 page_limit만큼 꽉 차면 구간을 절반으로 나눠 다시 조회합니다.
+    - 구간이 min_window보다 작아 더 나눌 수 없으면 받은 결과 중 가장 오래된 시각을
+      커서로 삼아 나머지 구간을 이어서 조회합니다.
+
+    구간 경계가 겹칠 수 있으므로 호출자는 결과를 고유 키로 중복 제거해야 합니다.
+
+    사용 예:
+        planner = AdaptiveTimeWindowPlanner(start, end)
+        for window_start, window_end in planner:
+            rows = fetch(window_start, window_end)
+            planner.report(len(rows), oldest_time)
+    """
+
+    def __init__(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        initial_window: timedelta = timedelta(days=7),
+        max_window: timedelta = timedelta(days=7),
+        min_window: timedelta = timedelta(minutes=1),
+        page_limit: int = 1000,
+    ):
+        if start_time.tzinfo is None:
+            start_time = start_time.replace(tzinfo=KOREA_TIMEZONE)
+        if end_time.tzinfo is None:
+            end_time = end_time.replace(tzinfo=KOREA_TIMEZONE)
+
+        self.max_window = max_window
+        self.min_window = min_window
+        self.page_limit = page_limit
+        self.stats = WindowPlanStats()
+
+        self._cursor = start_time
+        self._end_time = end_time
+        self._window = min(initial_window, max_window)
+        self._pending: List[Tuple[datetime, datetime]] = []
+        self._current: Optional[Tuple[datetime, datetime]] = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Tuple[datetime, datetime]:
+        if self._pending:
+            window = self._pending.pop()
+        elif self._cursor < self._end_time:
+            window_end = min(self._cursor + self._window, self._end_time)
+            window = (self._cursor, window_end)
+            self._cursor = window_end
+        else:
+            raise StopIteration
+
+        self._current = window
+        self.stats.windows_issued += 1
+        return window
+
+    def report(self, result_count: int, oldest_time: Optional[datetime] = None):
+        """
+        직전에 발급한 구간의 조회 결과를 알려 다음 구간 크기를 조정합니다.
+
+        Args:
+            result_count: 조회된 결과 수
+            oldest_time: 결과 중 가장 오래된 시각 (커서 이어받기에 사용)
+        """
+        if self._current is None:
+            return
+
+        window_start, window_end = self._current
+        self._current = None
+
+        if result_count == 0:
+            self.stats.empty_windows += 1
+
+        if result_count < self.page_limit // 2:
+            self._window = min(self._window * 2, self.max_window)
+            return
+
+        if result_count < self.page_limit:
+            # 절반 이상 찼으면 넓히면 다음 구간이 꽉 찰 수 있으므로 크기 유지
+            return
+
+        width = window_end - window_start
+        if width > self.min_window:
+            middle = window_start + width / 2
+            # 스택이므로 앞 구간이 먼저 발급되도록 뒤 구간부터 추가
+            self._pending.append((middle, window_end))
+            self._pending.append((window_start, middle))
+            self._window = max(width / 2, self.min_window)
+            self.stats.splits += 1
+            return
+
+        if oldest_time is not None:
+            if oldest_time.tzinfo is None:
+                oldest_time = oldest_time.replace(tzinfo=KOREA_TIMEZONE)
+            if window_start < oldest_time < window_end:
+                self._pending.append((window_start, oldest_time))
+                self.stats.cursor_follows += 1
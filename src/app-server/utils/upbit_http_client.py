@@ -1,14 +1,130 @@
 import requests
+import base64
 import hashlib
-import jwt
+import hmac
+import json
+import os
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from urllib.parse import urlencode, unquote
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+from requests.adapters import HTTPAdapter
+from utils.rate_limiter import UpbitRateLimiter
+
+
+# 시세 API 엔드포인트별 요청 수 제한 그룹
+QUOTATION_ENDPOINT_GROUPS = {
+    "/v1/market": "market",
+    "/v1/candles": "candle",
+    "/v1/ticker": "ticker",
+    "/v1/orderbook": "orderbook",
+    "/v1/trades": "trade",
+}
+
+
+def _base64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def create_query_hash(params: Dict[str, Any]) -> str:
+    """Upbit 인증용 query_hash (SHA512) 생성"""
+    query_string = unquote(urlencode(params, doseq=True)).encode("utf-8")
+    return hashlib.sha512(query_string).hexdigest()
+
+
+def get_rate_limit_key(
+    endpoint: str, access_key: str, require_auth: bool
+) -> Tuple[Optional[str], str]:
+    """요청 수 제한 버킷 키 (Exchange API: 계정 단위, 시세 API: IP 단위)"""
+    if require_auth:
+        return access_key, "default"
+
+    for prefix, group in QUOTATION_ENDPOINT_GROUPS.items():
+        if endpoint.startswith(prefix):
+            return None, group
+    return None, "market"
+
+
+class UpbitJwtSigner:
+    """
+    자격증명 쌍별 HS256 JWT 서명기
+
+    요청마다 바뀌지 않는 JWT 헤더 세그먼트, payload 앞부분, HMAC 키 상태를 미리 계산해 두고
+    요청마다 nonce와 query_hash만 채워 서명합니다.
+    """
+
+    _HEADER_SEGMENT = _base64url(b'{"alg":"HS256","typ":"JWT"}')
+
+    def __init__(self, access_key: str, secret_key: str):
+        self._payload_prefix = '{"access_key":%s,"nonce":"' % json.dumps(access_key)
+        self._hmac = hmac.new(secret_key.encode("utf-8"), digestmod=hashlib.sha256)
+
+    def sign(self, params: Optional[Dict[str, Any]] = None) -> str:
+        payload = self._payload_prefix + str(uuid.uuid4()) + '"'
+        if params:
+            payload += ',"query_hash":"%s","query_hash_alg":"SHA512"' % create_query_hash(
+                params
+            )
+        payload += "}"
+
+        signing_input = self._HEADER_SEGMENT + "." + _base64url(payload.encode("utf-8"))
+        mac = self._hmac.copy()
+        mac.update(signing_input.encode("ascii"))
+        return signing_input + "." + _base64url(mac.digest())
+
+
+# 서명기 캐시 크기와 유효 시간 (복호화된 secret key에서 만든 HMAC 상태를 오래 보관하지 않도록 제한)
+JWT_SIGNER_CACHE_SIZE = int(os.getenv("UPBIT_JWT_SIGNER_CACHE_SIZE", "64"))
+JWT_SIGNER_TTL_SECONDS = float(os.getenv("UPBIT_JWT_SIGNER_TTL_SECONDS", "300"))
+
+_jwt_signers: "OrderedDict[Tuple[str, str], Tuple[UpbitJwtSigner, float]]" = OrderedDict()
+_jwt_signers_lock = threading.Lock()
+
+
+def get_jwt_signer(access_key: str, secret_key: str) -> UpbitJwtSigner:
+    """
+    자격증명 쌍별 JWT 서명기 (캐시)
+
+    캐시 키에는 secret key 평문 대신 SHA256 해시를 사용하고,
+    JWT_SIGNER_TTL_SECONDS가 지나거나 JWT_SIGNER_CACHE_SIZE를 넘으면 오래된 서명기부터 버립니다.
+    """
+    key = (access_key, hashlib.sha256(secret_key.encode("utf-8")).hexdigest())
+    now = time.monotonic()
+    with _jwt_signers_lock:
+        cached = _jwt_signers.get(key)
+        if cached is not None and cached[1] > now:
+            _jwt_signers.move_to_end(key)
+            return cached[0]
+
+        signer = UpbitJwtSigner(access_key, secret_key)
+        _jwt_signers[key] = (signer, now + JWT_SIGNER_TTL_SECONDS)
+        _jwt_signers.move_to_end(key)
+
+        for stale_key in [k for k, (_, expires_at) in _jwt_signers.items() if expires_at <= now]:
+            del _jwt_signers[stale_key]
+        while len(_jwt_signers) > JWT_SIGNER_CACHE_SIZE:
+            _jwt_signers.popitem(last=False)
+        return signer
 
 
 class UpbitHttpClientError(Exception):
     """Upbit HTTP Client 관련 에러"""
 
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        self.status_code = status_code
+        super().__init__(message)
+
+    @property
+    def retryable(self) -> bool:
+        """연결 오류, 429, 5xx 응답은 재시도 가능"""
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+
+class UpbitRateLimitError(UpbitHttpClientError):
+    """Upbit 요청 수 제한 초과 (429)"""
+
     pass
 
 
@@ -16,33 +132,23 @@ class UpbitHttpClient:
     def __init__(
         self,
         base_url: str = "https://api.upbit.com",
+        rate_limiter: Optional[UpbitRateLimiter] = None,
+        pool_maxsize: int = 16,
     ):
         self.base_url = base_url
+        self.rate_limiter = rate_limiter or UpbitRateLimiter()
         self.session = requests.Session()
 
+        # 동시 요청 수만큼 커넥션을 재사용할 수 있도록 풀 크기 설정
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
     def _create_jwt_token(
         self, access_key: str, secret_key: str, params: Optional[Dict[str, Any]] = None
     ) -> str:
         """JWT 토큰 생성"""
-        payload = {
-            "access_key": access_key,
-            "nonce": str(uuid.uuid4()),
-        }
-
-        if params:
-            query_string = unquote(urlencode(params, doseq=True)).encode("utf-8")
-            sha512 = hashlib.sha512()
-            sha512.update(query_string)
-            query_hash = sha512.hexdigest()
-
-            payload.update(
-                {
-                    "query_hash": query_hash,
-                    "query_hash_alg": "SHA512",
-                }
-            )
-
-        return jwt.encode(payload, secret_key)
+        return get_jwt_signer(access_key, secret_key).sign(params)
 
     def _get_headers(
         self, access_key: str, secret_key: str, params: Optional[Dict[str, Any]] = None
@@ -72,16 +178,35 @@ class UpbitHttpClient:
                 else None
             )
 
+            limit_key, group = get_rate_limit_key(endpoint, access_key, require_auth)
+            self.rate_limiter.acquire(limit_key, group)
+
             response = self.session.get(url, params=params, headers=headers)
+            self.rate_limiter.observe(limit_key, response.headers.get("Remaining-Req"))
+
+            if response.status_code == 429:
+                self.rate_limiter.pause(limit_key, group)
+                raise UpbitRateLimitError(
+                    f"UpbitHttpClient GET request rate limited for endpoint {endpoint}",
+                    status_code=429,
+                )
+
             response.raise_for_status()
 
             return response.json()
 
+        except UpbitHttpClientError:
+            raise
         except requests.exceptions.RequestException as e:
             error_msg = (
                 f"UpbitHttpClient GET request failed for endpoint {endpoint}: {e}"
             )
-            raise UpbitHttpClientError(error_msg)
+            status_code = (
+                e.response.status_code
+                if getattr(e, "response", None) is not None
+                else None
+            )
+            raise UpbitHttpClientError(error_msg, status_code=status_code)
         except Exception as e:
             error_msg = f"UpbitHttpClient unexpected error in GET method for endpoint {endpoint}: {e}"
-            raise UpbitHttpClientError(error_msg)
+            raise UpbitHttpClientError(error_msg, status_code=0)